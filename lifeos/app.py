@@ -1,9 +1,8 @@
 import streamlit as st
 from datetime import datetime, timedelta
-from src.core.planner import create_or_update_plan, get_daily_plan
-from src.core.execution import log_execution, get_execution, calculate_day_score
-from src.analytics.dashboard import get_dashboard_metrics
-from src.utils.date_utils import get_today_str
+
+# Page modules (and pandas, through src.data) are imported inside the page
+# that needs them, so a cold start only pays for the page being shown.
 
 # UI IMPORTS
 from src.ui.styles import apply_custom_styles
@@ -20,6 +19,14 @@ st.set_page_config(
 # Apply CSS
 apply_custom_styles()
 
+@st.cache_resource
+def init_once():
+    # Data dir + seed tables, once per server process rather than every rerun
+    from src.core.bootstrap import init_app
+    return init_app()
+
+init_once()
+
 # Navigation
 page = render_sidebar()
 
@@ -38,7 +45,8 @@ with st.sidebar:
 # Quick Log (Sidebar) - Collapsed by default as Command Bar is faster
 with st.sidebar:
     with st.expander("⚡ Quick Log", expanded=False):
-        ql_type = st.selectbox("Type", ["Expense", "Note", "Gym Set"])
+        # Nothing picked by default, so a rerun doesn't load the finance module
+        ql_type = st.selectbox("Type", ["Expense", "Note", "Gym Set"], index=None, placeholder="Choose...")
         if ql_type == "Expense":
             from src.finance.manager import add_transaction, get_categories
             q_amt = st.number_input("Amount", key="ql_amt")
@@ -87,6 +95,7 @@ if page == "Dashboard":
     </div>
     """, unsafe_allow_html=True)
 
+    from src.analytics.dashboard import get_dashboard_metrics
     metrics = get_dashboard_metrics()
     from src.core.sleep import calculate_sleep_debt_days
     from src.core.execution import calculate_day_score
@@ -109,6 +118,8 @@ if page == "Dashboard":
     st.bar_chart({"Study": [3, 4, 3, 5, 2, 0, 0], "Gym": [1, 0, 1, 0, 1, 0, 0]})
 
 elif page == "Planner":
+    from src.core.planner import create_or_update_plan, get_daily_plan
+    
     # Load existing
     plan = get_daily_plan(date_str) or {}
     
@@ -139,6 +150,8 @@ elif page == "Planner":
                 st.success("Plan Saved!")
 
 elif page == "Execution":
+    from src.core.execution import log_execution, get_execution, calculate_day_score
+    
     existing = get_execution(date_str) or {}
     
     with st.form("execution_form"):
@@ -168,7 +181,7 @@ elif page == "Gym":
     from src.gym.workouts import log_set, get_exercise_history
     from src.gym.analytics import check_progressive_overload
     
-    tab1, tab2 = st.tabs(["Log Workout", "History"])
+    tab1, tab2, tab3 = st.tabs(["Log Workout", "History", "Records"])
     
     with tab1:
         exercises = get_exercises()
@@ -191,8 +204,16 @@ elif page == "Gym":
             
             if st.form_submit_button("Log Set"):
                 status = check_progressive_overload(selected_ex, weight, reps)
-                log_set(date_str, selected_ex, weight, reps, rpe)
-                st.success(f"Set Logged! {status}")
+                set_no = log_set(date_str, selected_ex, weight, reps, rpe)
+                st.success(f"Set {set_no} Logged! {status}")
+
+        from src.gym.sessions import get_session
+        session = get_session(date_str)
+        if session:
+            s1, s2, s3 = st.columns(3)
+            with s1: render_card("Sets Today", session["sets"])
+            with s2: render_card("Volume", f"{session['tonnage']:g}kg")
+            with s3: render_card("Duration", f"{session['duration_min']:g} min")
                 
     with tab2:
         ex_view = st.selectbox("View Exercise", ex_names, key="hist_select")
@@ -203,6 +224,32 @@ elif page == "Gym":
         else:
             st.info("No history yet.")
 
+        st.subheader("Weekly Volume")
+        from src.gym.analytics import calculate_weekly_volume
+        volume = calculate_weekly_volume()
+        if not volume.empty:
+            recent = volume[volume["week_start"] >= volume["week_start"].max() - timedelta(weeks=11)]
+            st.caption("Tonnage (kg x reps) per muscle group, 4-week average")
+            st.line_chart(recent.pivot(index="week", columns="muscle", values="tonnage_avg"))
+
+    with tab3:
+        from src.gym.records import get_leaderboard, get_personal_records
+        st.subheader("Estimated 1RM Leaderboard")
+        board = get_leaderboard()
+        if not board.empty:
+            st.dataframe(board)
+        else:
+            st.info("No sets logged yet.")
+
+        ex_pr = st.selectbox("Exercise", ex_names, key="pr_select")
+        prs = get_personal_records(ex_pr)
+        if prs["weight"]:
+            c1, c2 = st.columns(2)
+            with c1: render_card("Heaviest", f"{prs['weight']['weight_kg']}kg x {prs['weight']['reps']}")
+            with c2: render_card("Best e1RM", f"{prs['e1rm']['e1rm']}kg")
+            st.caption("Most reps at each weight")
+            st.dataframe(prs["reps"])
+
 elif page == "Finance":
     from src.finance.manager import add_transaction, get_monthly_summary, get_category_breakdown, get_categories, add_category
     
@@ -245,20 +292,32 @@ elif page == "Finance":
             st.info("No expenses this month.")
             
         st.divider()
-        st.subheader("Cashflow Trend (Coming Soon)")
-        st.info("Trend chart will be implemented in Phase 12 (Insights).")
+        st.subheader("Cashflow Trend")
+        from src.finance.cashflow import get_cashflow
+        freq = st.radio("Per", ["D", "W", "M"], index=2, horizontal=True,
+                        format_func={"D": "Day", "W": "Week", "M": "Month"}.get)
+        lookback = {"D": timedelta(days=90), "W": timedelta(weeks=52), "M": timedelta(days=3 * 365)}[freq]
+        cashflow = get_cashflow(freq, start=(datetime.now() - lookback).strftime("%Y-%m-%d"))
+        if not cashflow.empty:
+            st.line_chart(cashflow[["income_avg", "expense_avg", "net_avg"]])
+            st.caption("Rolling averages. Running balance (all-time net):")
+            st.area_chart(cashflow["balance"])
+        else:
+            st.info("No transactions in this period.")
 
     with tab3:
         st.subheader("Budget Tracking")
-        from src.finance.manager import get_budget_status, set_budget
+        from src.finance.manager import get_budget_status, set_budget, get_budget_grid
+        from src.finance.budgets import shift_month
         
         with st.expander("Set Budget"):
             with st.form("budget_form"):
                 cats = get_categories()
                 b_cat = st.selectbox("Category", cats)
                 b_lim = st.number_input("Monthly Limit ($)", min_value=0.0)
+                b_from = st.text_input("Effective From (YYYY-MM)", current_month)
                 if st.form_submit_button("Set Limit"):
-                    set_budget(b_cat, b_lim)
+                    set_budget(b_cat, b_lim, b_from)
                     st.success("Budget Updated")
         
         status = get_budget_status(current_month)
@@ -269,6 +328,12 @@ elif page == "Finance":
                 st.caption(f"${row['spent']} / ${row['limit']} (Left: ${row['remaining']})")
         else:
             st.info("No budgets set.")
+        
+        with st.expander("Year at a Glance"):
+            grid = get_budget_grid(shift_month(current_month, -11), current_month)
+            if not grid.empty:
+                st.caption("% of limit used")
+                st.dataframe((grid.pivot(index="month", columns="category", values="percent") * 100).round(0))
             
     with tab4:
         st.subheader("Manage Categories")
@@ -280,14 +345,25 @@ elif page == "Finance":
                     st.success(f"Added {new_cat}!")
                     st.experimental_rerun()
 
+        st.subheader("Import Bank Statement")
+        statement = st.file_uploader("CSV export from your bank", type=["csv"])
+        if statement is not None and st.button("Import"):
+            from src.finance.importer import import_statement
+            try:
+                res = import_statement(statement)
+                st.success(f"Imported {res['imported']} transactions ({res['duplicates']} already logged, {res['skipped']} unreadable).")
+            except ValueError as e:
+                st.error(str(e))
+
 elif page == "Knowledge":
     from src.knowledge.notes import add_note, get_notes
+    from src.knowledge.review import GRADES, count_due, get_due_notes, grade_note
     
-    tab1, tab2 = st.tabs(["Library", "Capture"])
+    tab1, tab2, tab3 = st.tabs(["Library", "Review", "Capture"])
     
     with tab1:
-        search = st.text_input("Search Notes", "")
-        notes = get_notes(search)
+        search = st.text_input("Search Notes", "", help="Best matches first; the last word can be unfinished")
+        notes = get_notes(search, limit=50)
         
         if not notes:
             st.info("No notes found.")
@@ -295,9 +371,28 @@ elif page == "Knowledge":
             for note in notes:
                 with st.expander(f"{note['title']} ({note.get('tags', '')})"):
                     st.markdown(note['content'])
-                    st.caption(f"Created: {note.get('created_at', '')[:10]}")
+                    st.caption(f"Created: {str(note.get('created_at', ''))[:10]}")
 
     with tab2:
+        due = count_due()
+        if not due:
+            st.success("Nothing due for review today.")
+        else:
+            st.metric("Due Today", due)
+            # One card at a time, most overdue first
+            note = get_due_notes(limit=1)[0]
+            st.subheader(note['title'])
+            if note.get('tags'):
+                st.caption(note['tags'])
+            if st.checkbox("Show note", key=f"reveal_{note['id']}"):
+                st.markdown(note['content'])
+                cols = st.columns(len(GRADES))
+                for col, (label, grade) in zip(cols, GRADES.items()):
+                    if col.button(label, key=f"grade_{label}_{note['id']}"):
+                        grade_note(note['id'], grade)
+                        st.experimental_rerun()
+
+    with tab3:
         with st.form("note_form"):
             title = st.text_input("Title")
             tags = st.text_input("Tags (comma separated)")
@@ -0,0 +1,56 @@
+"""Times import_statement on generated bank statements.
+
+Usage (from the lifeos/ directory):
+    python benchmarks/bench_import.py
+
+Each size is imported twice into an empty table: the second run finds every
+row already there, which times the duplicate check on its own.
+"""
+import os
+import sys
+import tempfile
+import shutil
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.getcwd())
+
+import pandas as pd
+from src.finance import importer
+from tests.helpers import finance_tables
+
+SIZES = [10_000, 100_000]
+
+def make_statement(path: str, rows: int) -> None:
+    pd.DataFrame({
+        "Date": [f"{1 + i % 28:02d}/{1 + i % 12:02d}/2024" for i in range(rows)],
+        "Description": [f"CARD PAYMENT SHOP {i % 500}" for i in range(rows)],
+        "Amount": [-(1 + i % 300) / 4 if i % 20 else 1500.0 for i in range(rows)],
+    }).to_csv(path, index=False)
+
+def main():
+    tmp = tempfile.mkdtemp()
+    try:
+        print(f"{'rows':>8} {'first s':>8} {'again s':>8}")
+        for rows in SIZES:
+            statement = os.path.join(tmp, f"statement_{rows}.csv")
+            make_statement(statement, rows)
+            data_dir = Path(tmp) / f"data_{rows}"
+            os.makedirs(data_dir)
+            # Every finance table, the classifier's included, and its cached index
+            with ExitStack() as stack:
+                for target, value in finance_tables(data_dir).items():
+                    stack.enter_context(patch(target, value))
+                times = []
+                for _ in range(2):
+                    start = time.perf_counter()
+                    importer.import_statement(statement, dayfirst=True)
+                    times.append(time.perf_counter() - start)
+            print(f"{rows:>8} {times[0]:>8.2f} {times[1]:>8.2f}")
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    main()
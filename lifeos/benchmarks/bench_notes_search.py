@@ -0,0 +1,64 @@
+"""Times knowledge note search on generated notes.
+
+Usage (from the lifeos/ directory):
+    python benchmarks/bench_notes_search.py
+
+Builds the search index for each size, then times searches against it:
+a rare word, a common word, several words and an unfinished one.
+"""
+import os
+import random
+import sys
+import tempfile
+import shutil
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.getcwd())
+
+import pandas as pd
+from src.knowledge import notes, search
+
+SIZES = [5_000, 50_000]
+QUERIES = ["zettelkasten", "python", "python pandas index", "progr"]
+REPEAT = 50
+
+def make_notes(path: Path, rows: int) -> None:
+    rng = random.Random(0)
+    vocabulary = [f"word{i}" for i in range(20_000)] + ["python", "pandas", "index", "programming", "progress"]
+    pd.DataFrame({
+        "id": [f"n{i}" for i in range(rows)],
+        "title": [" ".join(rng.choices(vocabulary, k=4)) for _ in range(rows)],
+        "content": [" ".join(rng.choices(vocabulary, k=120)) for _ in range(rows)],
+        "tags": ["zettelkasten" if i % 1000 == 0 else "misc" for i in range(rows)],
+        "created_at": "2024-01-01T00:00:00",
+        "review_date": "2024-01-01T00:00:00",
+    }).to_csv(path, index=False)
+
+def main():
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        print(f"{'notes':>8} {'index s':>8} " + " ".join(f"{q[:14]:>15}" for q in QUERIES) + "   (ms per get_notes)")
+        for rows in SIZES:
+            path = tmp / f"notes_{rows}.csv"
+            make_notes(path, rows)
+            with patch("src.knowledge.notes.KNOWLEDGE_NOTES_FILE", path), \
+                 patch("src.knowledge.search.KNOWLEDGE_NOTES_FILE", path), \
+                 patch("src.knowledge.search._index", None):
+                start = time.perf_counter()
+                search.get_index()
+                build = time.perf_counter() - start
+                times = []
+                for query in QUERIES:
+                    notes.get_notes(query, limit=50) # warm the posting arrays
+                    start = time.perf_counter()
+                    for _ in range(REPEAT):
+                        notes.get_notes(query, limit=50)
+                    times.append((time.perf_counter() - start) / REPEAT * 1000)
+            print(f"{rows:>8} {build:>8.2f} " + " ".join(f"{t:>15.2f}" for t in times))
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    main()
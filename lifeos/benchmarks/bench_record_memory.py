@@ -0,0 +1,61 @@
+"""Compares memory of get_all_records (dict per row) with get_rows (__slots__ objects).
+
+Usage (from the lifeos/ directory):
+    python benchmarks/bench_record_memory.py
+"""
+import gc
+import os
+import sys
+import tempfile
+import shutil
+import time
+import tracemalloc
+
+sys.path.insert(0, os.getcwd())
+
+import pandas as pd
+from src.data.crud import get_all_records, get_rows, read_csv
+
+SIZES = [10_000, 100_000]
+
+def make_log(path: str, rows: int) -> None:
+    pd.DataFrame({
+        "date": [f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}" for i in range(rows)],
+        "exercise_name": ["Squat", "Bench Press", "Deadlift"] * (rows // 3) + ["Squat"] * (rows % 3),
+        "weight_kg": [100.0 + i % 20 for i in range(rows)],
+        "reps": [5] * rows,
+        "rpe": [8] * rows,
+        "notes": [""] * rows,
+        "id": [f"id-{i}" for i in range(rows)],
+        "created_at": ["2024-01-01T00:00:00"] * rows,
+        "updated_at": ["2024-01-01T00:00:00"] * rows,
+    }).to_csv(path, index=False)
+
+def measure(fn, path):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, elapsed
+
+def main():
+    tmp = tempfile.mkdtemp()
+    try:
+        print(f"{'rows':>8} {'api':<16} {'MiB':>8} {'bytes/row':>10} {'ms':>8}")
+        for rows in SIZES:
+            path = os.path.join(tmp, f"{rows}", "gym_logs.csv")
+            os.makedirs(os.path.dirname(path))
+            make_log(path, rows)
+            read_csv(path) # Warm the table cache so only the row objects are measured
+            for name, fn in [("get_all_records", get_all_records), ("get_rows", get_rows)]:
+                used, elapsed = measure(fn, path)
+                print(f"{rows:>8} {name:<16} {used / 2**20:>8.1f} {used / rows:>10.0f} {elapsed * 1000:>8.1f}")
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Times save_record against CSVs of increasing size.
+
+Usage (from the lifeos/ directory):
+    python benchmarks/bench_save_record.py
+
+Per-insert time should stay flat as the file grows, since a row that fits the
+existing header is appended instead of rewriting the whole table. Each size
+is timed twice:
+    cold  nothing has read the table, so only the file is appended to
+    warm  the table was read first (as the app does), so every insert also
+          extends the cached copy; each insert is followed by a get_record
+          of the new row
+"""
+import os
+import sys
+import time
+import tempfile
+import shutil
+import uuid
+
+sys.path.insert(0, os.getcwd())
+
+import pandas as pd
+from src.data.crud import clear_cache, get_record, read_csv, save_record
+
+SIZES = [1_000, 10_000, 100_000]
+INSERTS = 200
+
+def make_log(path: str, rows: int) -> None:
+    df = pd.DataFrame({
+        "date": ["2024-01-01"] * rows,
+        "exercise_name": ["Squat"] * rows,
+        "weight_kg": [100.0] * rows,
+        "reps": [5] * rows,
+        "rpe": [8] * rows,
+        "notes": [""] * rows,
+        "id": [str(uuid.uuid4()) for _ in range(rows)],
+        "created_at": ["2024-01-01T00:00:00"] * rows,
+        "updated_at": ["2024-01-01T00:00:00"] * rows,
+    })
+    df.to_csv(path, index=False)
+
+def time_inserts(path: str, warm: bool) -> float:
+    """Average microseconds per insert (plus lookup, when warm)."""
+    clear_cache()
+    if warm:
+        read_csv(path)
+        get_record(path, "id", "")
+    start = time.perf_counter()
+    for i in range(INSERTS):
+        row_id = f"bench-{warm}-{i}"
+        save_record(path, {
+            "date": "2024-02-01", "exercise_name": "Squat",
+            "weight_kg": 102.5, "reps": 5, "rpe": 8, "notes": "", "id": row_id,
+        })
+        if warm:
+            assert get_record(path, "id", row_id) is not None
+    return (time.perf_counter() - start) / INSERTS * 1e6
+
+def main():
+    tmp = tempfile.mkdtemp()
+    try:
+        print(f"{'rows':>8} {'cold us/insert':>15} {'warm us/insert+get':>19}")
+        for rows in SIZES:
+            path = os.path.join(tmp, f"gym_logs_{rows}.csv")
+            make_log(path, rows)
+            cold = time_inserts(path, warm=False)
+            warm = time_inserts(path, warm=True)
+            print(f"{rows:>8} {cold:>15.1f} {warm:>19.1f}")
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Import-time profile of app startup, based on python -X importtime.
+
+Usage (from the lifeos/ directory):
+    python benchmarks/profile_imports.py [module ...]
+
+By default it compares what app.py used to import before drawing anything
+(every page's module, and pandas through them) with what it imports now
+(config and the init step), then profiles each page's modules on their own.
+Pass module names to profile those instead. Each set is imported in a fresh
+interpreter; the best of RUNS is reported.
+"""
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+RUNS = 5
+TOP = 8
+
+# Modules app.py imports at the top, not counting streamlit and src.ui
+STARTUP = {
+    "eager (old app.py)": ["config", "src.core.planner", "src.core.execution",
+                           "src.analytics.dashboard", "src.utils.date_utils"],
+    "lazy (app.py + init)": ["config", "src.core.bootstrap"],
+}
+PAGES = {
+    "Dashboard": ["src.gamification.engine", "src.analytics.dashboard", "src.core.sleep", "src.core.execution"],
+    "Planner": ["src.core.planner"],
+    "Gym": ["src.gym.library", "src.gym.workouts", "src.gym.analytics"],
+    "Finance": ["src.finance.manager"],
+    "Knowledge": ["src.knowledge.notes"],
+    "Systems": ["src.systems.reviews"],
+    "Analytics": ["src.analytics.insights"],
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \| *(\S+)")
+
+def profile(modules: List[str]) -> Tuple[float, Dict[str, float]]:
+    """Returns (total ms, {root package: self ms}) for one fresh import."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, cwd=os.getcwd())
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    by_package = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            # Self times add up without double counting nested imports
+            root = m.group(2).split(".")[0]
+            by_package[root] = by_package.get(root, 0) + int(m.group(1)) / 1000
+    return sum(by_package.values()), by_package
+
+def best_of(modules: List[str]) -> Tuple[float, Dict[str, float]]:
+    return min((profile(modules) for _ in range(RUNS)), key=lambda r: r[0])
+
+def report(name: str, modules: List[str]) -> None:
+    try:
+        total, top = best_of(modules)
+    except RuntimeError as e:
+        print(f"{name:<22} failed: {e}")
+        return
+    heaviest = sorted(top.items(), key=lambda kv: kv[1], reverse=True)[:TOP]
+    print(f"{name:<22} {total:>8.1f} ms   " + ", ".join(f"{k} {v:.0f}" for k, v in heaviest))
+
+def main():
+    sys.path.insert(0, os.getcwd())
+    if len(sys.argv) > 1:
+        report("custom", sys.argv[1:])
+        return
+    print("Startup (before the first page renders)")
+    for name, modules in STARTUP.items():
+        report(name, modules)
+    print("\nPer page (first visit)")
+    for name, modules in PAGES.items():
+        report(name, modules)
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,6 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
-
 # Data Files
 DAILY_PLAN_FILE = DATA_DIR / "daily_plan.csv"
 DAILY_EXECUTION_FILE = DATA_DIR / "daily_execution.csv"
@@ -16,11 +13,14 @@ HABITS_FILE = DATA_DIR / "habits.csv"
 HABIT_LOGS_FILE = DATA_DIR / "habit_logs.csv"
 STUDY_SESSIONS_FILE = DATA_DIR / "study_sessions.csv"
 EXERCISES_FILE = DATA_DIR / "exercises.csv"
+GYM_PRS_FILE = DATA_DIR / "gym_personal_records.csv"
+GYM_SESSIONS_FILE = DATA_DIR / "gym_sessions.json" # Live set counters, see src/gym/sessions.py
 
 # Finance Files
 FINANCE_TRANSACTIONS_FILE = DATA_DIR / "finance_transactions.csv"
 FINANCE_BUDGETS_FILE = DATA_DIR / "finance_budgets.csv"
 FINANCE_CATEGORIES_FILE = DATA_DIR / "finance_categories.csv"
+FINANCE_ROLLUPS_FILE = DATA_DIR / "finance_monthly_rollups.csv"
 
 # Knowledge Files
 KNOWLEDGE_NOTES_FILE = DATA_DIR / "knowledge_notes.csv"
@@ -29,6 +29,27 @@ KNOWLEDGE_NOTES_FILE = DATA_DIR / "knowledge_notes.csv"
 SYSTEMS_REVIEWS_FILE = DATA_DIR / "sys_reviews.csv"
 SYSTEMS_OKRS_FILE = DATA_DIR / "sys_okrs.csv"
 
+# Storage Settings
+# "csv" (one file per table, the default) or "sqlite" (see src/data/migrate.py)
+STORAGE_BACKEND = os.environ.get("LIFEOS_STORAGE_BACKEND", "csv")
+# The sqlite backend keeps every table of a data directory in this file
+SQLITE_DB_NAME = "lifeos.db"
+# Per-table overrides by file name, e.g. {"gym_logs.csv": "parquet"} or
+# {"finance_transactions.csv": "partitioned"} (one CSV per month, see src/data/partitioned_store.py)
+TABLE_BACKENDS = {}
+# The parquet backend folds its CSV tail into the snapshot past this many rows
+PARQUET_TAIL_MAX_ROWS = 2000
+
+# Rows per chunk for crud.iter_records
+ITER_CHUNK_ROWS = 10_000
+
+# Upper bound on memory used by parsed tables kept in crud's process-wide cache
+TABLE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+def ensure_data_dir() -> None:
+    """Creates DATA_DIR. Run by the app's init step (src/core/bootstrap.py), not at import."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+
 # App Settings
 APP_TITLE = "LifeOS"
 THEME_COLOR = "#FF4B4B"
@@ -1,11 +1,11 @@
 from config import DAILY_EXECUTION_FILE
-from src.data.crud import get_all_records
-import pandas as pd
+from src.data.crud import read_csv
 
 def get_dashboard_metrics():
     """Aggregates key metrics for the dashboard."""
-    records = get_all_records(DAILY_EXECUTION_FILE)
-    if not records:
+    # Typed columns (see src/data/schema.py)
+    df = read_csv(DAILY_EXECUTION_FILE, columns=["study_hours_actual", "gym_done"])
+    if df.empty:
         return {
             "avg_score": 0,
             "study_total": 0,
@@ -13,11 +13,9 @@ def get_dashboard_metrics():
             "streak": 0
         }
     
-    df = pd.DataFrame(records)
-    
     # Simple aggregations
-    study_total = df["study_hours_actual"].fillna(0).sum()
-    gym_sessions = df["gym_done"].apply(lambda x: 1 if str(x).lower() == 'true' else 0).sum()
+    study_total = float(df["study_hours_actual"].sum()) if "study_hours_actual" in df.columns else 0.0
+    gym_sessions = int(df["gym_done"].sum()) if "gym_done" in df.columns else 0
     
     # Streak logic (simplified)
     # Sort by date, check consecutive
@@ -1,15 +1,12 @@
 from config import DAILY_EXECUTION_FILE
-from src.data.crud import get_all_records
-import pandas as pd
+from src.data.crud import read_csv
 from typing import List, Dict
 
 def get_insights() -> List[Dict]:
     """Analyzes data to find correlations."""
-    records = get_all_records(DAILY_EXECUTION_FILE)
-    if not records:
+    df = read_csv(DAILY_EXECUTION_FILE)
+    if df.empty:
          return []
-         
-    df = pd.DataFrame(records)
     
     # Needs columns: study_hours_actual, mood_score, gym_done, morning_routine_done
     # We also need Sleep data (from daily plan or logging). 
@@ -19,8 +16,10 @@ def get_insights() -> List[Dict]:
     insights = []
     
     if "mood_score" in df.columns and "study_hours_actual" in df.columns:
-        df["mood_score"] = pd.to_numeric(df["mood_score"], errors='coerce').fillna(5)
-        df["study_hours_actual"] = pd.to_numeric(df["study_hours_actual"], errors='coerce').fillna(0)
+        # Already numeric from the schema; just fill gaps. Plain floats so an
+        # empty group's mean is NaN rather than <NA>.
+        df["mood_score"] = df["mood_score"].fillna(5).astype(float)
+        df["study_hours_actual"] = df["study_hours_actual"].fillna(0).astype(float)
         
         # 1. Does Mood affect Study?
         high_mood = df[df["mood_score"] >= 7]["study_hours_actual"].mean()
@@ -43,11 +42,12 @@ def get_insights() -> List[Dict]:
 
     # 2. Does Gym affect Mood?
     if "gym_done" in df.columns and "mood_score" in df.columns:
-        # gym_done might be string 'True'
-        df["gym_bool"] = df["gym_done"].apply(lambda x: str(x).lower() == 'true')
+        gym_bool = df["gym_done"].fillna(False).astype(bool)
         
-        gym_mood = df[df["gym_bool"] == True]["mood_score"].mean()
-        no_gym_mood = df[df["gym_bool"] == False]["mood_score"].mean()
+        mood = df["mood_score"].astype(float)
+        
+        gym_mood = mood[gym_bool].mean()
+        no_gym_mood = mood[~gym_bool].mean()
         
         diff = gym_mood - no_gym_mood
         if abs(diff) > 0.5:
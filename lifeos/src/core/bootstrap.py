@@ -0,0 +1,52 @@
+"""One-time startup work: the data directory and the seed tables.
+
+Importing config or a page module never touches the disk; app.py runs
+init_app() once per server process instead. It can also be run by hand
+(from the lifeos/ directory):
+    python -m src.core.bootstrap
+"""
+from pathlib import Path
+from typing import List, Union
+
+from config import (
+    ensure_data_dir, STORAGE_BACKEND, TABLE_BACKENDS,
+    FINANCE_CATEGORIES_FILE, FINANCE_TRANSACTIONS_FILE, FINANCE_ROLLUPS_FILE, EXERCISES_FILE
+)
+
+def _has_rows(file_path: Union[str, Path]) -> bool:
+    if TABLE_BACKENDS.get(Path(file_path).name, STORAGE_BACKEND) != "csv":
+        from src.data.crud import count_records
+        return count_records(file_path) > 0
+    # Plain CSV: peek at the first data line, so a warm start doesn't need pandas
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            f.readline()
+            return bool(f.readline().strip())
+    except FileNotFoundError:
+        return False
+
+def init_app() -> List[str]:
+    """Creates the data directory, seeds empty default tables and builds missing derived ones.
+
+    Returns the names of the tables it created. Safe to run repeatedly.
+    """
+    ensure_data_dir()
+    seeded = []
+    if not _has_rows(FINANCE_CATEGORIES_FILE):
+        from src.finance.manager import seed_categories
+        seed_categories()
+        seeded.append(Path(FINANCE_CATEGORIES_FILE).name)
+    if not _has_rows(EXERCISES_FILE):
+        from src.gym.library import seed_exercises
+        seed_exercises()
+        seeded.append(Path(EXERCISES_FILE).name)
+    if not _has_rows(FINANCE_ROLLUPS_FILE) and _has_rows(FINANCE_TRANSACTIONS_FILE):
+        # Transactions from before monthly rollups existed
+        from src.finance.rollups import rebuild_rollups
+        rebuild_rollups()
+        seeded.append(Path(FINANCE_ROLLUPS_FILE).name)
+    return seeded
+
+if __name__ == "__main__":
+    seeded = init_app()
+    print(f"Seeded: {', '.join(seeded)}" if seeded else "Nothing to seed.")
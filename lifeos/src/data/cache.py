@@ -0,0 +1,285 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.schema import concat_frames
+
+# Appended rows are kept aside and only joined onto the cached frame when
+# the whole table is next read, or once this many have piled up
+PENDING_ROWS_MAX = 1000
+
+@dataclass
+class CachedTable:
+    frame: pd.DataFrame # without pending rows - use .df
+    version: tuple # file_version() of the file when it was parsed
+    nbytes: int
+    # column -> {str(value): position of first row with that value}
+    indexes: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # column -> (row positions in value order, the values in that order);
+    # rows appended since it was built are merged in on next use
+    sorted_indexes: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+    # Appended rows not yet joined onto frame
+    pending: List[pd.DataFrame] = field(default_factory=list)
+    pending_rows: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The whole table, pending rows included."""
+        if self.pending:
+            self.join_pending()
+        return self.frame
+
+    def join_pending(self) -> None:
+        with self._lock:
+            if self.pending:
+                self.frame = concat_frames([self.frame, *self.pending])
+                self.pending, self.pending_rows = [], 0
+
+    def row_count(self) -> int:
+        return len(self.frame) + self.pending_rows
+
+    def add_rows(self, rows: pd.DataFrame) -> None:
+        """Adds rows to the end of the table, updating its indexes in place."""
+        start = self.row_count()
+        for column in list(self.indexes):
+            # A dtype change (e.g. int -> float) changes the string keys, so rebuild later
+            if not _same_keys(self.frame, rows, column):
+                del self.indexes[column]
+                continue
+            idx = self.indexes[column]
+            for pos, key in enumerate(rows[column].astype(str), start):
+                idx.setdefault(key, pos)
+        for column in list(self.sorted_indexes):
+            if not _same_keys(self.frame, rows, column):
+                del self.sorted_indexes[column]
+        with self._lock:
+            self.pending.append(rows)
+            self.pending_rows += len(rows)
+        if self.pending_rows >= PENDING_ROWS_MAX:
+            self.join_pending()
+
+    def row(self, position: int) -> Dict:
+        """One row as a dict, without joining pending rows onto the table."""
+        with self._lock:
+            frame, pending = self.frame, list(self.pending)
+        if position < len(frame):
+            return frame.iloc[position].to_dict()
+        position -= len(frame)
+        for rows in pending:
+            if position < len(rows):
+                return rows.iloc[position].to_dict()
+            position -= len(rows)
+        raise IndexError(position)
+
+    def index(self, column: str) -> Dict[str, int]:
+        """Returns the hash index for a column, building it on first use."""
+        idx = self.indexes.get(column)
+        if idx is None:
+            idx = build_index(self.df[column])
+            self.indexes[column] = idx
+        return idx
+
+    def positions_between(self, column: str, low: Optional[str], high: Optional[str]) -> np.ndarray:
+        """Row positions whose value (as a string) is within [low, high], in table order.
+
+        Binary search over the column's sorted order, which is built on first
+        use - for YYYY-MM-DD dates that is a date range.
+        """
+        df = self.df
+        found = self.sorted_indexes.get(column)
+        if found is None:
+            values = df[column].astype(str).to_numpy(dtype=str)
+            order = np.argsort(values, kind="stable")
+            found = (order, values[order])
+            self.sorted_indexes[column] = found
+        elif len(found[0]) < len(df):
+            # Merge in the rows appended since, rather than sorting everything again
+            order, values = found
+            added = df[column].iloc[len(order):].astype(str).to_numpy(dtype=str)
+            added_order = np.argsort(added, kind="stable")
+            added = added[added_order]
+            at = values.searchsorted(added, side="right")
+            values = values.astype(np.result_type(values, added), copy=False)
+            found = (np.insert(order, at, added_order + len(order)), np.insert(values, at, added))
+            self.sorted_indexes[column] = found
+        order, values = found
+        lo = 0 if low is None else values.searchsorted(low, side="left")
+        hi = len(values) if high is None else values.searchsorted(high, side="right")
+        return np.sort(order[lo:hi])
+
+def rows_between(entry: CachedTable, start: Optional[str], end: Optional[str],
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """A cached table's rows dated within [start, end], optionally projected."""
+    if entry.df.empty or "date" not in entry.df.columns:
+        return entry.df.iloc[0:0]
+    df = entry.df.iloc[entry.positions_between("date", start, end)]
+    return df if columns is None else df[[c for c in columns if c in df.columns]]
+
+def _same_keys(df: pd.DataFrame, rows: pd.DataFrame, column: str) -> bool:
+    """Whether rows' values in column turn into the same kind of string keys as df's."""
+    if column not in df.columns or column not in rows.columns:
+        return False
+    old, new = df[column].dtype, rows[column].dtype
+    # Categories grow as rows arrive, but the values themselves don't change
+    return old == new or (isinstance(old, pd.CategoricalDtype) and isinstance(new, pd.CategoricalDtype))
+
+def build_index(values: pd.Series) -> Dict[str, int]:
+    """Maps each value (as a string) to the position of its first occurrence."""
+    keys = values.astype(str).tolist()
+    n = len(keys)
+    # Walk backwards so the first occurrence wins
+    return dict(zip(reversed(keys), range(n - 1, -1, -1)))
+
+def frame_bytes(df: pd.DataFrame, index: bool = True) -> int:
+    """Memory a frame takes, counting the contents of object columns."""
+    return int(df.memory_usage(index=index, deep=True).sum())
+
+def file_version(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """Returns (mtime_ns, size, inode) for a file, or None if it doesn't exist.
+
+    The inode changes whenever a file is atomically replaced, even if the
+    new one has the same size and timestamp.
+    """
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+class TableCache:
+    """Process-wide LRU cache of parsed tables, keyed by file path.
+
+    An entry is only served while the file's mtime and size still match what
+    was parsed, so edits from outside the app are picked up on the next read.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedTable]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    def get(self, file_path: str, loader: Callable[[str], pd.DataFrame],
+            version_of: Callable[[str], Optional[tuple]] = file_version) -> CachedTable:
+        """Returns the cached table, parsing it with `loader` on a miss.
+
+        `version_of` says what the table currently looks like on disk; tables
+        spread over several files pass their own. The entry's DataFrame is
+        shared - callers must not mutate it.
+        """
+        version = version_of(file_path)
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and version is not None and entry.version == version:
+                self._entries.move_to_end(file_path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        df = loader(file_path)
+        if version is None:
+            self.invalidate(file_path)
+            return CachedTable(df, (0, 0), 0)
+        return self.put(file_path, df, version)
+
+    def peek(self, file_path: str) -> Optional[CachedTable]:
+        """Returns the entry without checking the file or touching counters."""
+        with self._lock:
+            return self._entries.get(file_path)
+
+    def put(self, file_path: str, df: pd.DataFrame, version: tuple,
+            indexes: Optional[Dict[str, Dict[str, int]]] = None,
+            nbytes: Optional[int] = None) -> CachedTable:
+        """Stores a table. nbytes is its size if the caller already knows it."""
+        if nbytes is None:
+            nbytes = frame_bytes(df)
+        entry = CachedTable(df, version, nbytes, indexes or {})
+        with self._lock:
+            self._drop(file_path)
+            if nbytes > self.max_bytes:
+                return entry # Too big to be worth evicting everything else for
+            self._entries[file_path] = entry
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+        return entry
+
+    def append(self, file_path: str, rows: pd.DataFrame, old_version: tuple,
+               new_version: tuple) -> None:
+        """Adds freshly appended rows to a cached table and its indexes.
+
+        Only applies if the entry was current before the append; otherwise the
+        entry is dropped and the next read re-parses the file. The entry is
+        extended in place, so this costs the rows added, not the table size.
+        """
+        with self._lock:
+            entry = self._entries.get(file_path)
+        if entry is None or entry.version != old_version:
+            self.invalidate(file_path)
+            return
+        if not entry.row_count():
+            self.put(file_path, rows.reset_index(drop=True), new_version)
+            return
+
+        entry.add_rows(rows)
+        # The old rows are unchanged, so only the new ones need measuring
+        added = frame_bytes(rows, index=False)
+        with self._lock:
+            entry.version = new_version
+            entry.nbytes += added
+            if self._entries.get(file_path) is not entry:
+                return
+            self._entries.move_to_end(file_path)
+            self._bytes += added
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def replace(self, file_path: str, df: pd.DataFrame, version: tuple,
+                keep_indexes: Iterable[str] = (), changed: Optional[List[int]] = None) -> None:
+        """Stores a rewritten table, carrying over indexes whose keys didn't move.
+
+        changed lists the row positions that differ from the cached table, if
+        that's all that did; only those are measured for the cache's size.
+        """
+        with self._lock:
+            entry = self._entries.get(file_path)
+        indexes, nbytes = {}, None
+        if entry is not None and len(entry.df) == len(df):
+            indexes = {c: entry.indexes[c] for c in keep_indexes if c in entry.indexes}
+            if changed is not None and entry.df.columns.equals(df.columns):
+                nbytes = (entry.nbytes - frame_bytes(entry.df.iloc[changed], index=False)
+                          + frame_bytes(df.iloc[changed], index=False))
+        self.put(file_path, df, version, indexes, nbytes)
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """Drops one table, or everything if no path is given."""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._drop(file_path)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "tables": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _drop(self, file_path: str) -> None:
+        entry = self._entries.pop(file_path, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
@@ -1,84 +1,301 @@
 import pandas as pd
-import os
 from pathlib import Path
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Union, Any, Iterator, Callable
+import threading
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
+from config import STORAGE_BACKEND, TABLE_BACKENDS, ITER_CHUNK_ROWS
+from src.data import storage
+from src.data.records import Record, to_records
+from src.data.schema import get_schema
+from src.data.storage import StorageBackend
+
+# Default backend, and backends created for per-table overrides (by name)
+_backend: Optional[StorageBackend] = None
+_named_backends: Dict[str, StorageBackend] = {}
+
+# Open batch() for the current thread (each Streamlit session runs in its own)
+_local = threading.local()
+
+class _Batch:
+    def __init__(self):
+        self.inserts: Dict[str, List[Dict]] = {}
+        self.updates: Dict[str, Dict[str, Dict]] = {} # path -> id -> merged updates
+        self.callbacks: List[Callable[[bool], None]] = []
+
+    def flush(self) -> None:
+        for file_path in dict.fromkeys(list(self.inserts) + list(self.updates)):
+            backend = get_backend(file_path)
+            if self.inserts.get(file_path):
+                backend.insert(file_path, self.inserts[file_path])
+            if self.updates.get(file_path):
+                backend.update_many(file_path, self.updates[file_path])
 
 def flatten_path(path_obj_or_str):
     return str(path_obj_or_str)
 
-def read_csv(file_path: Union[str, Path]) -> pd.DataFrame:
-    """Reads a CSV file into a DataFrame. Returns empty DF if file doesn't exist."""
+def create_backend(name: str) -> StorageBackend:
+    """Builds a storage backend by its config name."""
+    if name == "csv":
+        from src.data.csv_store import CSVBackend
+        return CSVBackend()
+    if name == "sqlite":
+        from src.data.sqlite_store import SQLiteBackend
+        return SQLiteBackend()
+    if name == "parquet":
+        from src.data.parquet_store import ParquetBackend
+        return ParquetBackend()
+    if name == "partitioned":
+        from src.data.partitioned_store import PartitionedCSVBackend
+        return PartitionedCSVBackend()
+    raise ValueError(f"Unknown storage backend: {name}")
+
+def get_backend(file_path: Optional[str] = None) -> StorageBackend:
+    """Returns the backend for a table.
+
+    That's config.TABLE_BACKENDS[<file name>] if the table has an override,
+    otherwise the default from config.STORAGE_BACKEND.
+    """
+    global _backend
+    name = TABLE_BACKENDS.get(Path(file_path).name) if file_path else None
+    if name is not None:
+        if name not in _named_backends:
+            _named_backends[name] = create_backend(name)
+        return _named_backends[name]
+    if _backend is None:
+        _backend = create_backend(STORAGE_BACKEND)
+    return _backend
+
+def set_backend(backend: StorageBackend) -> None:
+    """Swaps the backend used by every crud call (e.g. for tests or migration)."""
+    global _backend
+    _backend = backend
+
+def read_csv(file_path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Reads a table into a DataFrame. Returns empty DF if it doesn't exist.
+
+    Pass `columns` to load only those; columnar backends skip the rest on disk.
+    """
     file_path = flatten_path(file_path)
-    if not os.path.exists(file_path):
-        return pd.DataFrame()
+    if columns is not None:
+        return get_backend(file_path).read_columns(file_path, columns).copy()
+    return get_backend(file_path).read(file_path).copy()
+
+def _all_backends() -> List[StorageBackend]:
+    # The default backend plus any created for TABLE_BACKENDS overrides
+    backends = [get_backend()] + list(_named_backends.values())
+    return list({id(b): b for b in backends}.values())
+
+def get_cache_stats() -> Dict:
+    """Returns hit/miss counters and memory use of the table caches, summed over every backend in use."""
+    totals: Dict = {}
+    for backend in _all_backends():
+        for key, value in backend.cache_stats().items():
+            if isinstance(value, (int, float)):
+                totals[key] = totals.get(key, 0) + value
+    return totals
+
+def clear_cache() -> None:
+    for backend in _all_backends():
+        backend.clear_cache()
+
+def declare_key_column(file_path: Union[str, Path], column: str) -> None:
+    """Marks a column of one table as a lookup key so get_record uses an index for it."""
+    storage.declare_key_column(flatten_path(file_path), column)
+
+def _current_batch() -> Optional[_Batch]:
+    return getattr(_local, "batch", None)
+
+@contextmanager
+def batch() -> Iterator[None]:
+    """Buffers saves and updates, then writes each touched table once on exit.
+
+    If the block raises, nothing buffered is written. Reads inside the block
+    don't see the buffered changes yet. Nested batches join the outer one.
+    """
+    if _current_batch() is not None:
+        yield
+        return
+    pending = _local.batch = _Batch()
+    try:
+        yield
+    except BaseException:
+        _local.batch = None
+        for callback in pending.callbacks:
+            callback(False)
+        raise
+    _local.batch = None
+    written = False
     try:
-        return pd.read_csv(file_path)
-    except pd.errors.EmptyDataError:
-        return pd.DataFrame()
+        pending.flush()
+        written = True
+    finally:
+        for callback in pending.callbacks:
+            callback(written)
 
-def save_record(file_path: Union[str, Path], data: Dict) -> None:
-    """Appends a single record to a CSV file."""
-    file_path = flatten_path(file_path)
-    
-    # Add metadata
+def after_batch(callback: Callable[[bool], None]) -> bool:
+    """Has the open batch() call callback(written) when it ends.
+
+    written is True once the buffered changes are on disk, False if they
+    were discarded. Returns False, without registering, if no batch is open.
+    """
+    pending = _current_batch()
+    if pending is None:
+        return False
+    pending.callbacks.append(callback)
+    return True
+
+def _stamp(data: Dict) -> Dict:
+    """Adds id/created_at/updated_at metadata to a record in place."""
     if "id" not in data:
         data["id"] = str(uuid.uuid4())
     if "created_at" not in data:
         data["created_at"] = datetime.now().isoformat()
     data["updated_at"] = datetime.now().isoformat()
+    return data
+
+def save_record(file_path: Union[str, Path], data: Dict) -> None:
+    """Appends a single record to a table.
+
+    With the CSV backend the row is appended in place if every key already
+    has a column; the file is only rewritten when the record adds columns.
+    """
+    save_records(file_path, [data])
+
+def save_records(file_path: Union[str, Path], rows: List[Dict]) -> None:
+    """Appends several records to a table with a single write."""
+    file_path = flatten_path(file_path)
+    rows = [_stamp(r) for r in rows]
+    if not rows:
+        return
     
-    df = read_csv(file_path)
-    new_record = pd.DataFrame([data])
-    
-    if df.empty:
-        df = new_record
-    else:
-        df = pd.concat([df, new_record], ignore_index=True)
-        
-    df.to_csv(file_path, index=False)
+    pending = _current_batch()
+    if pending is not None:
+        pending.inserts.setdefault(file_path, []).extend(rows)
+        return
+    get_backend(file_path).insert(file_path, rows)
 
 def update_record(file_path: Union[str, Path], record_id: str, updates: Dict) -> bool:
     """Updates a record by ID."""
     file_path = flatten_path(file_path)
-    df = read_csv(file_path)
+    updates = dict(updates)
+    updates["updated_at"] = datetime.now().isoformat()
     
-    if df.empty or "id" not in df.columns:
-        return False
-        
-    if record_id not in df["id"].values:
-        return False
-        
-    idx = df[df["id"] == record_id].index[0]
+    pending = _current_batch()
+    if pending is None:
+        return get_backend(file_path).update(file_path, record_id, updates)
     
-    for key, value in updates.items():
-        if key in df.columns: # Only update existing columns to avoid schema drift for now, or allow?
-             # For flexibility, we might want to allow new columns, but for now strict.
-             # Actually, let's allow updating any key, but pandas handles it.
-             # If column doesn't exist, pandas creates it.
-             pass
-        df.at[idx, key] = value
-        
-    df.at[idx, "updated_at"] = datetime.now().isoformat()
-    df.to_csv(file_path, index=False)
+    # Still buffered from this batch: edit the pending row directly
+    for row in pending.inserts.get(file_path, []):
+        if str(row["id"]) == str(record_id):
+            row.update(updates)
+            return True
+    if get_backend(file_path).find(file_path, "id", record_id) is None:
+        return False
+    pending.updates.setdefault(file_path, {}).setdefault(str(record_id), {}).update(updates)
     return True
 
 def get_record(file_path: Union[str, Path], column: str, value: Any) -> Optional[Dict]:
-    """Retrieves a single record where column matches value."""
+    """Retrieves a single record where column matches value.
+
+    Values are compared as strings, so "5" finds 5 and vice versa. Key
+    columns (id, date, declared keys) are looked up through an index.
+    """
     file_path = flatten_path(file_path)
-    df = read_csv(file_path)
-    if df.empty or column not in df.columns:
-        return None
-    
-    # Ensure types match if possible, or string compare
-    filtered = df[df[column].astype(str) == str(value)]
-    if filtered.empty:
-        return None
-    
-    return filtered.iloc[0].to_dict()
+    return get_backend(file_path).find(file_path, column, value)
 
 def get_all_records(file_path: Union[str, Path]) -> List[Dict]:
     """Returns all records as a list of dictionaries."""
-    df = read_csv(file_path)
+    file_path = flatten_path(file_path)
+    df = get_backend(file_path).read(file_path)
     return df.to_dict(orient="records")
+
+def get_rows(file_path: Union[str, Path]) -> List[Record]:
+    """Returns all records as compact __slots__ objects (see src/data/records.py).
+
+    Uses less memory and is faster than get_all_records. Rows support both
+    row.title and row["title"] / row.get("title").
+    """
+    file_path = flatten_path(file_path)
+    df = get_backend(file_path).read(file_path)
+    schema = get_schema(file_path)
+    return to_records(df, schema.model if schema else None)
+
+def take_rows(file_path: Union[str, Path], positions: List[int]) -> pd.DataFrame:
+    """Returns the rows at these positions (0 = first row of the table), in the order given.
+
+    Only those rows are copied, so with a cached table this costs the number
+    of positions rather than the table size. Date-partitioned tables only
+    load the partitions the rows are in.
+    """
+    file_path = flatten_path(file_path)
+    return get_backend(file_path).take(file_path, list(positions)).copy()
+
+def read_range(file_path: Union[str, Path], start: Optional[str] = None, end: Optional[str] = None,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Reads the rows dated between start and end inclusive (YYYY-MM-DD strings).
+
+    Date-partitioned tables only open the months in the range.
+    """
+    file_path = flatten_path(file_path)
+    return get_backend(file_path).read_range(file_path, start, end, columns).copy()
+
+def _where_mask(chunk: pd.DataFrame, where: Union[Dict, Callable]) -> pd.Series:
+    if callable(where):
+        return where(chunk)
+    mask = pd.Series(True, index=chunk.index)
+    for column, value in where.items():
+        if column not in chunk.columns:
+            return pd.Series(False, index=chunk.index)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            mask &= chunk[column].isin(value).fillna(False)
+        else:
+            mask &= (chunk[column] == value).fillna(False)
+    return mask
+
+def iter_records(file_path: Union[str, Path], columns: Optional[List[str]] = None,
+                 where: Optional[Union[Dict, Callable]] = None,
+                 chunksize: int = ITER_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Streams a table as DataFrame chunks of at most `chunksize` rows.
+
+    columns: load only these. Columns named in a `where` dict are read as
+        well; a `where` function only sees `columns`.
+    where: {column: value} - a list/set value matches any of its items - or
+        a function taking a chunk and returning a boolean mask.
+
+    Chunks with no matching rows are skipped. The CSV and SQLite backends
+    read the file chunk by chunk, so memory is bounded by chunksize rather
+    than by the table; a table that's already cached is just sliced.
+    """
+    file_path = flatten_path(file_path)
+    load = columns
+    if columns is not None and isinstance(where, dict):
+        load = list(dict.fromkeys(list(columns) + list(where)))
+    for chunk in get_backend(file_path).read_chunks(file_path, load, chunksize):
+        if where is not None:
+            chunk = chunk[_where_mask(chunk, where)]
+            if chunk.empty:
+                continue
+        if columns is not None:
+            chunk = chunk[[c for c in columns if c in chunk.columns]]
+        yield chunk
+
+def table_version(file_path: Union[str, Path]) -> Optional[tuple]:
+    """Changes whenever the table does, so results derived from it can be cached.
+
+    Writes still buffered in an open batch() don't count until it ends.
+    """
+    file_path = flatten_path(file_path)
+    return get_backend(file_path).version(file_path)
+
+def count_records(file_path: Union[str, Path]) -> int:
+    """Returns the number of rows in a table without materializing them.
+
+    A CSV table that's already cached is counted from the cache, otherwise
+    the file is streamed line by line and the count kept until it changes;
+    SQLite runs a COUNT(*). Writes still buffered in an open batch() don't
+    count yet.
+    """
+    file_path = flatten_path(file_path)
+    return get_backend(file_path).count(file_path)
@@ -0,0 +1,218 @@
+import csv
+import io
+import math
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from config import TABLE_CACHE_MAX_BYTES
+from src.data.cache import TableCache, CachedTable, file_version, rows_between
+from src.data.locking import writer_lock, atomic_write, append_text
+from src.data.schema import apply_schema, set_value
+from src.data.storage import StorageBackend, is_key_column
+
+# ISO timestamps, same as the datetime.isoformat() strings crud stamps
+CSV_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+def _parse_csv(file_path: str) -> pd.DataFrame:
+    """Parses a CSV and applies the table's schema from src.data.schema."""
+    if not os.path.exists(file_path):
+        return pd.DataFrame()
+    try:
+        return apply_schema(file_path, pd.read_csv(file_path))
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+def _write_csv(file_path: str, df: pd.DataFrame) -> None:
+    atomic_write(file_path, lambda f: df.to_csv(f, index=False, date_format=CSV_DATE_FORMAT))
+
+def _read_header(file_path: str) -> List[str]:
+    """Returns the column names from the first line of a CSV, or [] if there is none."""
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+def _count_rows(file_path: str) -> int:
+    """Data rows in a CSV, read line by line (quoted newlines and blank lines handled)."""
+    with open(file_path, newline="", encoding="utf-8") as f:
+        rows = sum(1 for row in csv.reader(f) if row)
+    return max(rows - 1, 0)
+
+def _csv_value(value: Any) -> Any:
+    # Match what DataFrame.to_csv writes for missing values
+    if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+class CSVBackend(StorageBackend):
+    """One CSV file per table, with a process-wide cache of parsed tables.
+
+    Writers serialize on a '<file>.lock' advisory lock and re-check the file
+    under it, so concurrent sessions don't lose each other's rows. Rewrites
+    go through a temp file and an atomic rename, and appends are a single
+    write, so readers never wait and never see half a file.
+    """
+
+    name = "csv"
+
+    def __init__(self, cache_max_bytes: int = TABLE_CACHE_MAX_BYTES):
+        self._cache = TableCache(cache_max_bytes)
+        self._counts: Dict[str, Tuple[tuple, int]] = {} # path -> (file_version, rows)
+
+    def _load(self, file_path: str) -> CachedTable:
+        return self._cache.get(file_path, _parse_csv)
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        return self._load(file_path).df
+
+    def read_chunks(self, file_path: str, columns: Optional[List[str]],
+                    chunksize: int) -> Iterator[pd.DataFrame]:
+        entry = self._cache.peek(file_path)
+        if entry is not None and entry.version == file_version(file_path):
+            # Already parsed - slicing it beats reading the file again
+            yield from super().read_chunks(file_path, columns, chunksize)
+            return
+        header = _read_header(file_path)
+        usecols = header if columns is None else [c for c in header if c in columns]
+        if not usecols:
+            return
+        # Streamed chunks skip the cache on purpose, so memory stays bounded by chunksize
+        with pd.read_csv(file_path, usecols=usecols, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield apply_schema(file_path, chunk)
+
+    def read_range(self, file_path: str, start: Optional[str], end: Optional[str],
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return rows_between(self._load(file_path), start, end, columns)
+
+    def count(self, file_path: str) -> int:
+        """Counts from the cached table if it's current, otherwise by streaming the file.
+
+        A streamed count is kept until the file changes.
+        """
+        version = file_version(file_path)
+        if version is None:
+            return 0
+        entry = self._cache.peek(file_path)
+        if entry is not None and entry.version == version:
+            return entry.row_count()
+        counted = self._counts.get(file_path)
+        if counted is None or counted[0] != version:
+            counted = self._counts[file_path] = (version, _count_rows(file_path))
+        return counted[1]
+
+    def cache_stats(self) -> Dict:
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        self._cache.invalidate()
+        self._counts.clear()
+
+    def insert(self, file_path: str, records: List[Dict]) -> None:
+        """Appends rows in place when they fit the header, otherwise rewrites the file."""
+        with writer_lock(file_path):
+            header = _read_header(file_path)
+            if header and all(set(r).issubset(header) for r in records):
+                self._append_rows(file_path, header, records)
+                return
+            
+            # Schema changed (or new file): rewrite with the extra columns
+            df = self.read(file_path)
+            new_records = pd.DataFrame(records)
+            
+            if df.empty:
+                df = new_records
+            else:
+                df = pd.concat([df, new_records], ignore_index=True)
+                
+            _write_csv(file_path, df)
+            self._cache.invalidate(file_path)
+
+    def _append_rows(self, file_path: str, header: List[str], records: List[Dict]) -> None:
+        """Writes rows to the end of an existing CSV, in header order.
+
+        The cached copy of the table (and its indexes) is extended with the
+        same rows, so the next read doesn't have to re-parse the file.
+        """
+        buf = io.StringIO(newline="")
+        writer = csv.writer(buf, lineterminator=os.linesep)
+        for data in records:
+            writer.writerow([_csv_value(data.get(col)) for col in header])
+        lines = buf.getvalue()
+
+        with open(file_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) not in (b"\n", b"\r")
+
+        old_version = file_version(file_path)
+        text = (os.linesep if needs_newline else "") + lines
+        append_text(file_path, text)
+        new_version = file_version(file_path)
+
+        # If anything else touched the file meanwhile, let the next read re-parse it
+        if needs_newline or new_version[1] != old_version[1] + len(text.encode("utf-8")):
+            self._cache.invalidate(file_path)
+            return
+        rows = apply_schema(file_path, pd.read_csv(io.StringIO(lines), header=None, names=header))
+        self._cache.append(file_path, rows, old_version, new_version)
+
+    def update(self, file_path: str, record_id: str, updates: Dict) -> bool:
+        return self._update_rows(file_path, {record_id: updates}) > 0
+
+    def update_many(self, file_path: str, updates_by_id: Dict[str, Dict]) -> None:
+        self._update_rows(file_path, updates_by_id)
+
+    def _update_rows(self, file_path: str, updates_by_id: Dict[str, Dict]) -> int:
+        """Applies updates by id with a single rewrite. Returns how many rows matched."""
+        with writer_lock(file_path):
+            return self._update_rows_locked(file_path, updates_by_id)
+
+    def _update_rows_locked(self, file_path: str, updates_by_id: Dict[str, Dict]) -> int:
+        # Loading under the lock picks up rows other sessions wrote meanwhile
+        entry = self._load(file_path)
+        
+        if entry.df.empty or "id" not in entry.df.columns:
+            return 0
+        
+        id_index = entry.index("id")
+        positions = {}
+        for record_id, updates in updates_by_id.items():
+            idx = id_index.get(str(record_id))
+            if idx is not None:
+                positions[idx] = updates
+        if not positions:
+            return 0
+        
+        df = entry.df.copy()
+        for idx, updates in positions.items():
+            for key, value in updates.items():
+                # New keys become new columns
+                set_value(df, idx, key, value)
+            
+        _write_csv(file_path, df)
+        
+        # Indexes stay valid unless an update changed one of their keys
+        unchanged = [
+            col for col in entry.indexes
+            if all(col not in updates or str(df.at[idx, col]) == str(entry.df.at[idx, col])
+                   for idx, updates in positions.items())
+        ]
+        self._cache.replace(file_path, df, file_version(file_path), unchanged, list(positions))
+        return len(positions)
+
+    def find(self, file_path: str, column: str, value: Any) -> Optional[Dict]:
+        if not is_key_column(file_path, column):
+            return super().find(file_path, column, value)
+
+        entry = self._load(file_path)
+        if not entry.row_count() or column not in entry.frame.columns:
+            return None
+        idx = entry.index(column).get(str(value))
+        if idx is None:
+            return None
+        return entry.row(idx)
@@ -0,0 +1,112 @@
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, IO, Iterator
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+# Locks this thread already holds (path -> depth), so nested calls don't deadlock
+_held = threading.local()
+
+def lock_path(file_path: str) -> str:
+    return file_path + ".lock"
+
+@contextmanager
+def writer_lock(file_path: str) -> Iterator[None]:
+    """Holds an exclusive advisory lock for writing a data file.
+
+    Only writers take it - readers never block. The lock lives in a
+    '<file>.lock' sidecar so the data file itself can be atomically replaced
+    while it's held. Re-entrant within a thread.
+    """
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = {}
+    if held.get(file_path):
+        held[file_path] += 1
+        try:
+            yield
+        finally:
+            held[file_path] -= 1
+        return
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    fd = os.open(lock_path(file_path), os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        held[file_path] = 1
+        try:
+            yield
+        finally:
+            held.pop(file_path, None)
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+def _new_file_mode(file_path: str) -> int:
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def atomic_write(file_path: str, write: Callable[[IO], None], binary: bool = False) -> None:
+    """Writes a whole file via a temp file, fsync and rename.
+
+    Readers see either the old file or the new one, never a partial write.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp = tempfile.mkstemp(prefix="." + os.path.basename(file_path), suffix=".tmp", dir=directory)
+    try:
+        os.chmod(tmp, _new_file_mode(file_path))
+        if binary:
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", newline="", encoding="utf-8")
+        with f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, file_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if fcntl is not None:
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def append_text(file_path: str, text: str) -> None:
+    """Appends text with a single O_APPEND write, then fsyncs.
+
+    One write() to a local file lands whole, so readers see the rows either
+    all there or not yet - without paying for a full rewrite per insert.
+    """
+    data = text.encode("utf-8")
+    fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, _new_file_mode(file_path))
+    try:
+        written = os.write(fd, data)
+        while written < len(data): # Rare short write
+            written += os.write(fd, data[written:])
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,58 @@
+"""One-shot import of the CSV data directory into the SQLite backend.
+
+Usage (from the lifeos/ directory):
+    python -m src.data.migrate [data_dir] [--overwrite]
+
+Then set LIFEOS_STORAGE_BACKEND=sqlite (or STORAGE_BACKEND in config.py).
+The CSV files are left in place as a backup.
+"""
+import sys
+from pathlib import Path
+from typing import Dict, Union
+
+import pandas as pd
+
+from config import DATA_DIR
+from src.data.csv_store import _parse_csv
+from src.data.sqlite_store import SQLiteBackend, _quote
+
+def migrate_csv_to_sqlite(data_dir: Union[str, Path] = DATA_DIR, overwrite: bool = False) -> Dict[str, int]:
+    """Copies every CSV in data_dir into its SQLite table.
+
+    Tables that already exist are skipped unless overwrite is set. Returns
+    the number of rows imported per table.
+    """
+    data_dir = Path(data_dir)
+    backend = SQLiteBackend()
+    imported = {}
+
+    for csv_path in sorted(data_dir.glob("*.csv")):
+        if csv_path.name.endswith(".tail.csv"):
+            continue # Recent writes of a parquet table, not a table of their own
+        file_path = str(csv_path)
+        db_path, table = backend._locate(file_path)
+        conn = backend.connect(db_path)
+
+        if not backend.read(file_path).empty or backend._table_columns(conn, db_path, table):
+            if not overwrite:
+                print(f"skip {table}: already in {Path(db_path).name}")
+                continue
+            with conn:
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            backend._columns.pop((db_path, table), None)
+
+        df = _parse_csv(file_path)
+        if df.empty:
+            continue
+        # NaN -> None so missing cells become NULL
+        records = df.astype(object).where(pd.notna(df), None).to_dict(orient="records")
+        backend.insert(file_path, records)
+        imported[table] = len(records)
+        print(f"{table}: {len(records)} rows")
+
+    backend.close()
+    return imported
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    migrate_csv_to_sqlite(args[0] if args else DATA_DIR, overwrite="--overwrite" in sys.argv)
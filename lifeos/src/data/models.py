@@ -41,3 +41,99 @@ class GymLog:
 
     def to_dict(self):
         return asdict(self)
+
+@dataclass
+class PersonalRecord:
+    key: str # "<exercise>|weight", "<exercise>|e1rm" or "<exercise>|reps@<weight>"
+    exercise_name: str
+    record: str # weight / e1rm / reps
+    weight_kg: float
+    reps: int
+    e1rm: float
+    date: str
+
+    def to_dict(self):
+        return asdict(self)
+
+@dataclass
+class Exercise:
+    name: str
+    muscle: str = ""
+    type: str = "" # 'Compound' or 'Isolation'
+
+    def to_dict(self):
+        return asdict(self)
+
+@dataclass
+class Transaction:
+    date: str
+    amount: float
+    type: str # 'Income' or 'Expense'
+    category: str
+    description: str = ""
+
+    def to_dict(self):
+        return asdict(self)
+
+@dataclass
+class Budget:
+    category: str
+    monthly_limit: float
+    effective_from: str = "" # YYYY-MM; blank = always
+
+    def to_dict(self):
+        return asdict(self)
+
+@dataclass
+class MonthlyRollup:
+    key: str # "<month>|<type>|<category>"
+    month: str # YYYY-MM
+    type: str
+    category: str
+    amount: float = 0.0
+    count: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+@dataclass
+class Category:
+    name: str
+
+    def to_dict(self):
+        return asdict(self)
+
+@dataclass
+class Note:
+    title: str
+    content: str
+    tags: str = ""
+    review_date: Optional[datetime] = None # next spaced-repetition review
+    ease_factor: float = 2.5
+    interval_days: int = 0
+    repetitions: int = 0 # successful reviews in a row
+
+    def to_dict(self):
+        return asdict(self)
+
+@dataclass
+class WeeklyReview:
+    week_start: str
+    wins: str = ""
+    challenges: str = ""
+    focus: str = ""
+    score: int = 0
+    reviewed_at: Optional[datetime] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+@dataclass
+class OKR:
+    quarter: str
+    objective: str
+    key_results: str = ""
+    status: str = "On Track" # "On Track", "At Risk", "Completed"
+
+    def to_dict(self):
+        return asdict(self)
@@ -0,0 +1,202 @@
+"""Parquet snapshot + CSV tail storage for large, append-heavy tables.
+
+For a table like data/gym_logs.csv the backend keeps:
+    data/gym_logs.parquet   compacted, columnar snapshot
+    data/gym_logs.tail.csv  small append-only log of recent writes
+
+Inserts append to the tail. Updates append the new version of the row to the
+tail, and readers keep the last version of each id. Once the tail passes
+PARQUET_TAIL_MAX_ROWS it is folded into the snapshot.
+
+If a table has no snapshot yet but its old CSV exists, the first read
+compacts the CSV into a snapshot (the CSV is left in place as a backup).
+
+Usage (from the lifeos/ directory), to compact by hand:
+    python -m src.data.parquet_store data/gym_logs.csv [...]
+"""
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from config import PARQUET_TAIL_MAX_ROWS, TABLE_CACHE_MAX_BYTES
+from src.data.cache import TableCache, CachedTable, file_version, rows_between
+from src.data.csv_store import CSVBackend, _parse_csv
+from src.data.locking import writer_lock, atomic_write
+from src.data.schema import apply_schema
+from src.data.storage import StorageBackend, is_key_column
+
+# infer_dtype results pyarrow can store as-is; anything else is written as text
+_ARROW_SAFE_TYPES = {"string", "empty", "boolean", "integer", "floating", "decimal", "bytes"}
+
+def snapshot_path(file_path: str) -> str:
+    return str(Path(file_path).with_suffix(".parquet"))
+
+def tail_path(file_path: str) -> str:
+    return str(Path(file_path).with_suffix(".tail.csv"))
+
+def _latest_versions(df: pd.DataFrame) -> pd.DataFrame:
+    """Keeps the last version of every id, at the position of its first version."""
+    if df.empty or "id" not in df.columns:
+        return df
+    keep = ~df["id"].duplicated(keep="last").values
+    if keep.all():
+        return df
+    # factorize numbers ids in order of first appearance
+    first_seen = pd.factorize(df["id"])[0][keep]
+    return df[keep].iloc[first_seen.argsort(kind="stable")].reset_index(drop=True)
+
+def _arrow_ready(df: pd.DataFrame) -> pd.DataFrame:
+    """Stringifies object columns holding mixed types, which pyarrow rejects."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) not in _ARROW_SAFE_TYPES:
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+class ParquetBackend(StorageBackend):
+    """Columnar snapshot per table plus a CSV write-ahead tail."""
+
+    name = "parquet"
+
+    def __init__(self, tail_max_rows: int = PARQUET_TAIL_MAX_ROWS,
+                 cache_max_bytes: int = TABLE_CACHE_MAX_BYTES):
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("The parquet storage backend needs pyarrow: pip install pyarrow")
+        self.tail_max_rows = tail_max_rows
+        self._tail = CSVBackend(cache_max_bytes)
+        self._cache = TableCache(cache_max_bytes)
+
+    def _version(self, file_path: str) -> Optional[tuple]:
+        snap = file_version(snapshot_path(file_path))
+        tail = file_version(tail_path(file_path))
+        if snap is None and tail is None:
+            return None
+        return (snap, tail)
+
+    def version(self, file_path: str) -> Optional[tuple]:
+        return self._version(file_path)
+
+    def _ensure_snapshot(self, file_path: str) -> None:
+        """Seeds the snapshot from the table's old CSV the first time it's used."""
+        if os.path.exists(snapshot_path(file_path)) or os.path.exists(tail_path(file_path)):
+            return
+        if os.path.exists(file_path):
+            self._write_snapshot(file_path, _parse_csv(file_path))
+
+    def _read_snapshot(self, file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        path = snapshot_path(file_path)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = pq.read_schema(path).names
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(path, columns=columns)
+
+    def _merge(self, file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        snapshot = self._read_snapshot(file_path, columns)
+        tail = self._tail.read(tail_path(file_path))
+        if columns is not None:
+            tail = tail[[c for c in columns if c in tail.columns]]
+        if tail.empty:
+            return apply_schema(file_path, snapshot)
+        if snapshot.empty:
+            merged = tail.reset_index(drop=True)
+        else:
+            merged = pd.concat([snapshot, tail], ignore_index=True)
+        return apply_schema(file_path, _latest_versions(merged))
+
+    def _load(self, file_path: str) -> CachedTable:
+        self._ensure_snapshot(file_path)
+        return self._cache.get(file_path, self._merge, self._version)
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        return self._load(file_path).df
+
+    def read_columns(self, file_path: str, columns: List[str]) -> pd.DataFrame:
+        entry = self._cache.peek(file_path)
+        if entry is not None and entry.version == self._version(file_path):
+            return super().read_columns(file_path, columns)
+        self._ensure_snapshot(file_path)
+        # id is needed to drop superseded rows, even if the caller didn't ask for it
+        wanted = list(columns) + ([] if "id" in columns else ["id"])
+        df = self._merge(file_path, wanted)
+        return df[[c for c in columns if c in df.columns]]
+
+    def read_range(self, file_path: str, start: Optional[str], end: Optional[str],
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return rows_between(self._load(file_path), start, end, columns)
+
+    def cache_stats(self) -> Dict:
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        self._cache.invalidate()
+        self._tail.clear_cache()
+
+    def insert(self, file_path: str, records: List[Dict]) -> None:
+        # The table lock covers snapshot seeding and compaction; the tail has its own
+        with writer_lock(file_path):
+            self._ensure_snapshot(file_path)
+            tail = tail_path(file_path)
+            self._tail.insert(tail, records)
+            if len(self._tail.read(tail)) > self.tail_max_rows:
+                self.compact(file_path)
+
+    def update(self, file_path: str, record_id: str, updates: Dict) -> bool:
+        with writer_lock(file_path):
+            current = self.find(file_path, "id", record_id)
+            if current is None:
+                return False
+            current.update(updates)
+            self.insert(file_path, [current])
+            return True
+
+    def update_many(self, file_path: str, updates_by_id: Dict[str, Dict]) -> None:
+        with writer_lock(file_path):
+            versions = []
+            for record_id, updates in updates_by_id.items():
+                current = self.find(file_path, "id", record_id)
+                if current is not None:
+                    current.update(updates)
+                    versions.append(current)
+            if versions:
+                self.insert(file_path, versions)
+
+    def find(self, file_path: str, column: str, value: Any) -> Optional[Dict]:
+        if not is_key_column(file_path, column):
+            return super().find(file_path, column, value)
+        entry = self._load(file_path)
+        if not entry.row_count() or column not in entry.frame.columns:
+            return None
+        idx = entry.index(column).get(str(value))
+        if idx is None:
+            return None
+        return entry.row(idx)
+
+    def compact(self, file_path: str) -> int:
+        """Folds the tail into the snapshot. Returns the snapshot's row count."""
+        tail = tail_path(file_path)
+        with writer_lock(file_path), writer_lock(tail):
+            self._ensure_snapshot(file_path)
+            df = self._merge(file_path)
+            self._write_snapshot(file_path, df)
+            # Rows still in the tail after a crash here are deduped by id on read
+            if os.path.exists(tail):
+                os.remove(tail)
+            self._tail.clear_cache()
+            self._cache.invalidate(file_path)
+            return len(df)
+
+    def _write_snapshot(self, file_path: str, df: pd.DataFrame) -> None:
+        df = _arrow_ready(df)
+        atomic_write(snapshot_path(file_path), lambda f: df.to_parquet(f, index=False), binary=True)
+
+if __name__ == "__main__":
+    backend = ParquetBackend()
+    for arg in sys.argv[1:]:
+        print(f"{arg}: {backend.compact(arg)} rows in snapshot")
@@ -0,0 +1,246 @@
+"""Date-partitioned CSV storage for tables that only grow, like transactions.
+
+Instead of one data/finance_transactions.csv the table is a directory with
+one CSV per month of each row's `date`:
+    data/finance_transactions/2024-01.csv
+    data/finance_transactions/2024-02.csv
+    data/finance_transactions/undated.csv   rows without a usable date
+
+Appends only touch the partition of the new row's month, read_range() and
+date lookups only open the months they cover, and take_rows() only parses
+the partitions its rows are in; only whole-table reads join every
+partition. Every partition is a plain CSV handled by CSVBackend (cache,
+locking, atomic writes). An update that changes a row's date moves the
+row to its new month's partition.
+
+Turn it on per table in config.py, e.g.
+    TABLE_BACKENDS = {"finance_transactions.csv": "partitioned", "gym_logs.csv": "partitioned"}
+
+If the table directory doesn't exist yet but the old single CSV does, the
+first use splits it into partitions (the CSV is left in place as a backup).
+To split by hand (from the lifeos/ directory), either the tables set to
+"partitioned" in TABLE_BACKENDS or the given CSV paths:
+    python -m src.data.partitioned_store [table.csv ...] [--overwrite]
+"""
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_DIR, TABLE_BACKENDS, TABLE_CACHE_MAX_BYTES
+from src.data.cache import file_version
+from src.data.csv_store import CSVBackend, _parse_csv, _write_csv
+from src.data.locking import writer_lock
+from src.data.schema import PARTITION_NAME, concat_frames
+from src.data.storage import StorageBackend
+
+UNDATED = "undated"
+
+_MONTH = re.compile(r"\d{4}-\d{2}")
+
+def table_dir(file_path: str) -> Path:
+    return Path(file_path).with_suffix("")
+
+def partition_of(date: Any) -> str:
+    """Returns the partition (YYYY-MM) a row with this date belongs to."""
+    # Covers 'YYYY-MM-DD' strings and Timestamps; NaN/None/garbage are undated
+    m = _MONTH.match(str(date))
+    return m.group(0) if m else UNDATED
+
+def partition_table(file_path: str, overwrite: bool = False) -> Dict[str, int]:
+    """Splits a single-file table into monthly partitions.
+
+    Does nothing if the table already has partitions, unless overwrite is
+    set. Returns the number of rows written per partition.
+    """
+    file_path = str(file_path)
+    with writer_lock(file_path):
+        directory = table_dir(file_path)
+        existing = list(directory.glob("*.csv")) if directory.is_dir() else []
+        if existing:
+            if not overwrite:
+                return {}
+            for path in existing:
+                os.remove(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        df = _parse_csv(file_path)
+        if df.empty:
+            return {}
+        if "date" in df.columns:
+            keys = df["date"].map(partition_of)
+        else:
+            keys = pd.Series(UNDATED, index=df.index)
+        counts = {}
+        for name, part in df.groupby(keys, sort=True):
+            _write_csv(str(directory / f"{name}.csv"), part)
+            counts[name] = len(part)
+        return counts
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return frames[0] if len(frames) == 1 else concat_frames(frames)
+
+class PartitionedCSVBackend(StorageBackend):
+    """One CSV per month of data, in a directory per table."""
+
+    name = "partitioned"
+
+    def __init__(self, cache_max_bytes: int = TABLE_CACHE_MAX_BYTES):
+        self._parts = CSVBackend(cache_max_bytes)
+
+    def _ensure_partitioned(self, file_path: str) -> None:
+        """Splits the table's old single CSV the first time it's used."""
+        if not table_dir(file_path).is_dir() and os.path.exists(file_path):
+            partition_table(file_path)
+
+    def partitions(self, file_path: str, start: Optional[str] = None,
+                   end: Optional[str] = None) -> List[str]:
+        """Partition files of a table, oldest month first.
+
+        With start/end (YYYY-MM-DD) only the months overlapping that range
+        are returned; the undated partition is only part of a full scan.
+        """
+        self._ensure_partitioned(file_path)
+        directory = table_dir(file_path)
+        if not directory.is_dir():
+            return []
+        # "undated" sorts after every YYYY-MM
+        names = sorted(p.stem for p in directory.glob("*.csv") if PARTITION_NAME.fullmatch(p.stem))
+        if start is not None or end is not None:
+            names = [
+                n for n in names if n != UNDATED
+                and (start is None or n >= start[:7]) and (end is None or n <= end[:7])
+            ]
+        return [str(directory / f"{n}.csv") for n in names]
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        return _concat([self._parts.read(p) for p in self.partitions(file_path)])
+
+    def read_columns(self, file_path: str, columns: List[str]) -> pd.DataFrame:
+        return _concat([self._parts.read_columns(p, columns) for p in self.partitions(file_path)])
+
+    def read_chunks(self, file_path: str, columns: Optional[List[str]],
+                    chunksize: int) -> Iterator[pd.DataFrame]:
+        for path in self.partitions(file_path):
+            yield from self._parts.read_chunks(path, columns, chunksize)
+
+    def read_range(self, file_path: str, start: Optional[str], end: Optional[str],
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return _concat([
+            self._parts.read_range(p, start, end, columns)
+            for p in self.partitions(file_path, start, end)
+        ])
+
+    def count(self, file_path: str) -> int:
+        return sum(self._parts.count(p) for p in self.partitions(file_path))
+
+    def take(self, file_path: str, positions: List[int]) -> pd.DataFrame:
+        """Rows at these positions, loading only the partitions they fall in."""
+        if not len(positions):
+            return pd.DataFrame()
+        paths = self.partitions(file_path)
+        ends = np.cumsum([self._parts.count(p) for p in paths])
+        positions = np.asarray(positions, dtype=np.int64)
+        if positions.min() < 0 or positions.max() >= (ends[-1] if paths else 0):
+            raise IndexError("positions are out of bounds")
+        which = np.searchsorted(ends, positions, side="right")
+        # Gathered partition by partition, then put back in the order asked for
+        order = np.argsort(which, kind="stable")
+        frames = []
+        for part in np.unique(which):
+            start = ends[part - 1] if part else 0
+            frames.append(self._parts.take(paths[part], (positions[which == part] - start).tolist()))
+        return _concat(frames).iloc[np.argsort(order)].reset_index(drop=True)
+
+    def version(self, file_path: str) -> Optional[tuple]:
+        paths = self.partitions(file_path)
+        return tuple(file_version(p) for p in paths) if paths else None
+
+    def cache_stats(self) -> Dict:
+        return self._parts.cache_stats()
+
+    def clear_cache(self) -> None:
+        self._parts.clear_cache()
+
+    def insert(self, file_path: str, records: List[Dict]) -> None:
+        self._ensure_partitioned(file_path)
+        directory = table_dir(file_path)
+        directory.mkdir(parents=True, exist_ok=True)
+        by_partition: Dict[str, List[Dict]] = {}
+        for record in records:
+            by_partition.setdefault(partition_of(record.get("date")), []).append(record)
+        for name, rows in by_partition.items():
+            self._parts.insert(str(directory / f"{name}.csv"), rows)
+
+    def update(self, file_path: str, record_id: str, updates: Dict) -> bool:
+        return self._update_rows(file_path, {record_id: updates}) > 0
+
+    def update_many(self, file_path: str, updates_by_id: Dict[str, Dict]) -> None:
+        self._update_rows(file_path, updates_by_id)
+
+    def _update_rows(self, file_path: str, updates_by_id: Dict[str, Dict]) -> int:
+        """Applies updates by id, moving rows whose date leaves their month. Returns how many matched."""
+        remaining = {str(rid): u for rid, u in updates_by_id.items()}
+        matched = 0
+        # Held across partitions so two sessions don't move the same row
+        with writer_lock(file_path):
+            for path in self.partitions(file_path):
+                here = {rid: u for rid, u in remaining.items() if self._parts.find(path, "id", rid) is not None}
+                if not here:
+                    continue
+                month = Path(path).stem
+                moving = {rid: u for rid, u in here.items() if "date" in u and partition_of(u["date"]) != month}
+                staying = {rid: u for rid, u in here.items() if rid not in moving}
+                if staying:
+                    self._parts.update_many(path, staying)
+                if moving:
+                    self._move_rows(file_path, path, moving)
+                matched += len(here)
+                for rid in here:
+                    del remaining[rid]
+                if not remaining:
+                    break
+        return matched
+
+    def _move_rows(self, file_path: str, path: str, updates_by_id: Dict[str, Dict]) -> None:
+        with writer_lock(path):
+            df = self._parts.read(path)
+            mask = df["id"].astype(str).isin(updates_by_id)
+            rows = df[mask].to_dict(orient="records")
+            for row in rows:
+                row.update(updates_by_id[str(row["id"])])
+            # Into the new partitions first: if this is cut short the row is doubled, not lost
+            self.insert(file_path, rows)
+            _write_csv(path, df[~mask])
+            self._parts._cache.invalidate(path)
+
+    def find(self, file_path: str, column: str, value: Any) -> Optional[Dict]:
+        if column == "date":
+            # Only the value's own month can hold it
+            paths = [str(table_dir(file_path) / f"{partition_of(value)}.csv")]
+            self._ensure_partitioned(file_path)
+        else:
+            paths = self.partitions(file_path)
+        for path in paths:
+            found = self._parts.find(path, column, value)
+            if found is not None:
+                return found
+        return None
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        args = [str(DATA_DIR / name) for name, backend in TABLE_BACKENDS.items() if backend == "partitioned"]
+    for arg in args:
+        counts = partition_table(arg, overwrite="--overwrite" in sys.argv)
+        if not counts:
+            print(f"{arg}: nothing to do (no rows, or already partitioned - use --overwrite)")
+        for name, rows in counts.items():
+            print(f"{arg}: {name} {rows} rows")
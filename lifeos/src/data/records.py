@@ -0,0 +1,118 @@
+"""Compact row objects for reading whole tables.
+
+get_all_records() builds one dict per row, which is the biggest memory cost
+for long histories. The classes here use __slots__ instead (no per-row
+__dict__), generated from the models.py dataclass registered for the table
+plus whatever extra columns the file has (id, created_at, ...). They still
+support record["col"] and record.get("col") so they can stand in for dicts.
+Tables with a column that can't be an attribute ("my col", "class", "get")
+get plain dicts instead.
+"""
+import keyword
+from dataclasses import MISSING, fields, is_dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+class Record:
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+# (model, columns) -> generated class
+_record_types: Dict[tuple, type] = {}
+
+# Taken by the generated __init__ or by Record itself
+_RESERVED = {"self", "_defaults"} | set(dir(Record))
+
+def is_attr_name(column: Any) -> bool:
+    """Whether a column can be a slot of a generated record class as it is."""
+    return (isinstance(column, str) and column.isidentifier()
+            and not keyword.iskeyword(column) and column not in _RESERVED)
+
+def _model_defaults(model: Optional[type]) -> Dict[str, Any]:
+    defaults = {}
+    if model is not None and is_dataclass(model):
+        for f in fields(model):
+            if f.default is not MISSING:
+                defaults[f.name] = f.default
+            elif f.default_factory is not MISSING:
+                defaults[f.name] = f.default_factory()
+            else:
+                defaults[f.name] = None
+    return defaults
+
+def record_type(model: Optional[type], columns: List[str]) -> type:
+    """Returns a __slots__ class with the model's fields followed by any extra columns.
+
+    Model fields the table doesn't have yet get the dataclass default.
+    Every name must pass is_attr_name(); they go into generated source.
+    """
+    key = (model, tuple(columns))
+    cls = _record_types.get(key)
+    if cls is not None:
+        return cls
+
+    defaults = _model_defaults(model)
+    names = list(dict.fromkeys(list(defaults) + list(columns)))
+    bad = [n for n in names if not is_attr_name(n)]
+    if bad:
+        raise ValueError(f"Not usable as record attributes: {bad}")
+    from_columns = list(columns)
+    if len(set(from_columns)) != len(from_columns):
+        raise ValueError(f"Duplicate columns: {columns}")
+
+    # A generated positional __init__ is much faster than setattr in a loop
+    args = ", ".join(from_columns)
+    body = [f"    self.{n} = {n}" for n in from_columns]
+    body += [f"    self.{n} = _defaults[{n!r}]" for n in names if n not in from_columns]
+    src = f"def __init__(self{', ' if args else ''}{args}):\n" + ("\n".join(body) or "    pass")
+    namespace = {"_defaults": defaults}
+    exec(src, namespace)
+
+    name = (model.__name__ if model is not None else "Row") + "Record"
+    cls = type(name, (Record,), {"__slots__": tuple(names), "__init__": namespace["__init__"]})
+    _record_types[key] = cls
+    return cls
+
+def to_records(df: pd.DataFrame, model: Optional[type] = None) -> List[Record]:
+    """Converts a DataFrame into a list of compact records.
+
+    Falls back to dicts (model defaults filled in) when a column name can't
+    be an attribute or appears twice.
+    """
+    if df.empty:
+        return []
+    columns = list(df.columns)
+    defaults = _model_defaults(model)
+    if len(set(columns)) != len(columns) or not all(is_attr_name(c) for c in list(defaults) + columns):
+        return [{**defaults, **row} for row in df.to_dict(orient="records")]
+    cls = record_type(model, columns)
+    # tolist() hands back plain Python values, like to_dict(orient="records")
+    values = [df[c].tolist() for c in columns]
+    return [cls(*row) for row in zip(*values)]
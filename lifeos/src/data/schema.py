@@ -0,0 +1,157 @@
+"""Column types for each data file, derived from the dataclasses in models.py.
+
+Backends run apply_schema() when they parse a table, so everything reading
+through crud gets real booleans, numbers, categories and timestamps instead
+of re-parsing 'True' strings and calling pd.to_numeric on every use.
+"""
+import re
+import typing
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    DAILY_PLAN_FILE, DAILY_EXECUTION_FILE, GYM_LOGS_FILE, GYM_PRS_FILE, EXERCISES_FILE,
+    FINANCE_TRANSACTIONS_FILE, FINANCE_BUDGETS_FILE, FINANCE_CATEGORIES_FILE, FINANCE_ROLLUPS_FILE,
+    KNOWLEDGE_NOTES_FILE, SYSTEMS_REVIEWS_FILE, SYSTEMS_OKRS_FILE,
+)
+from src.data.models import (
+    DailyPlan, DailyExecution, GymLog, PersonalRecord, Exercise, Transaction, Budget, Category, MonthlyRollup,
+    Note, WeeklyReview, OKR,
+)
+
+# Default dtype per dataclass field type. str fields are left as parsed.
+_TYPE_DTYPES = {
+    bool: "boolean",
+    float: "float64", # float32 can't hold typed-in values like 62.3 exactly
+    int: "Int16",
+    datetime: "datetime",
+}
+
+# Columns crud adds to every record
+METADATA_DTYPES = {"created_at": "datetime", "updated_at": "datetime"}
+
+_BOOL_STRINGS = {"true": True, "false": False, "1": True, "0": False, "1.0": True, "0.0": False}
+
+@dataclass
+class TableSchema:
+    model: type
+    dtypes: Dict[str, str]
+
+_schemas: Dict[str, TableSchema] = {}
+
+def _field_dtype(annotation: Any) -> Optional[str]:
+    # Optional[X] -> X
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    return _TYPE_DTYPES.get(annotation)
+
+def register_schema(file_path, model: type, **overrides: str) -> TableSchema:
+    """Maps a data file (by file name) to a model, with per-column dtype overrides."""
+    dtypes = dict(METADATA_DTYPES)
+    for f in fields(model):
+        dtype = _field_dtype(f.type)
+        if dtype is not None:
+            dtypes[f.name] = dtype
+    dtypes.update(overrides)
+    schema = TableSchema(model, dtypes)
+    _schemas[Path(file_path).name] = schema
+    return schema
+
+# Files of a date-partitioned table: <table>/<YYYY-MM>.csv (see partitioned_store.py)
+PARTITION_NAME = re.compile(r"\d{4}-\d{2}|undated")
+
+def get_schema(file_path) -> Optional[TableSchema]:
+    path = Path(file_path)
+    schema = _schemas.get(path.name)
+    if schema is None and PARTITION_NAME.fullmatch(path.stem):
+        schema = _schemas.get(path.parent.name + ".csv")
+    return schema
+
+register_schema(DAILY_PLAN_FILE, DailyPlan)
+register_schema(DAILY_EXECUTION_FILE, DailyExecution, mood_score="Int8")
+register_schema(GYM_LOGS_FILE, GymLog, exercise_name="category", rpe="Int8")
+register_schema(GYM_PRS_FILE, PersonalRecord, exercise_name="category", record="category", reps="Int32")
+register_schema(EXERCISES_FILE, Exercise, muscle="category", type="category")
+register_schema(FINANCE_TRANSACTIONS_FILE, Transaction, type="category", category="category")
+register_schema(FINANCE_BUDGETS_FILE, Budget)
+register_schema(FINANCE_CATEGORIES_FILE, Category)
+register_schema(FINANCE_ROLLUPS_FILE, MonthlyRollup, count="Int32")
+register_schema(KNOWLEDGE_NOTES_FILE, Note)
+register_schema(SYSTEMS_REVIEWS_FILE, WeeklyReview, score="Int8")
+register_schema(SYSTEMS_OKRS_FILE, OKR, status="category")
+
+def coerce_column(values: pd.Series, dtype: str) -> pd.Series:
+    """Converts a column to dtype; values that don't parse become missing."""
+    if dtype == "boolean":
+        if pd.api.types.is_bool_dtype(values):
+            return values.astype("boolean")
+        lowered = values.map(lambda v: str(v).strip().lower() if pd.notna(v) else v)
+        return lowered.map(_BOOL_STRINGS).astype("boolean")
+    if dtype == "datetime":
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        return pd.to_datetime(values, errors="coerce", format="ISO8601")
+    if dtype == "category":
+        return values.astype("category")
+    nums = pd.to_numeric(values, errors="coerce")
+    if dtype.startswith("Int"):
+        valid = nums.dropna()
+        if not (valid == valid.round()).all():
+            return nums # Fractional values - keep them rather than truncate
+        info = np.iinfo(dtype.lower())
+        if len(valid) and (valid.min() < info.min or valid.max() > info.max):
+            dtype = "Int64"
+    return nums.astype(dtype)
+
+def apply_schema(file_path, df: pd.DataFrame) -> pd.DataFrame:
+    """Returns df with the registered dtypes applied to the columns it has."""
+    schema = get_schema(file_path)
+    if schema is None or df.empty:
+        return df
+    for col, dtype in schema.dtypes.items():
+        if col in df.columns:
+            df[col] = coerce_column(df[col], dtype)
+    return df
+
+def concat_tables(df: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """Concatenates typed frames without losing category dtypes to object."""
+    return concat_frames([df, rows])
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """concat_tables for any number of frames, in one pass."""
+    cats = {}
+    for df in frames:
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                known = cats.get(col)
+                cats[col] = df[col].cat.categories if known is None else known.union(df[col].cat.categories)
+    aligned = []
+    for df in frames:
+        changes = {
+            col: df[col].cat.set_categories(values) for col, values in cats.items()
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+            and not df[col].cat.categories.equals(values)
+        }
+        aligned.append(df.assign(**changes) if changes else df)
+    return pd.concat(aligned, ignore_index=True)
+
+def set_value(df: pd.DataFrame, idx: int, column: str, value: Any) -> None:
+    """df.at[idx, column] = value, widening the column if its dtype can't hold value."""
+    try:
+        df.at[idx, column] = value
+        return
+    except (TypeError, ValueError):
+        pass
+    if isinstance(df[column].dtype, pd.CategoricalDtype):
+        df[column] = df[column].cat.add_categories([value])
+    elif pd.api.types.is_numeric_dtype(df[column]) and isinstance(value, (int, float)):
+        df[column] = df[column].astype("float64")
+    else:
+        df[column] = df[column].astype(object)
+    df.at[idx, column] = value
@@ -0,0 +1,247 @@
+import math
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import SQLITE_DB_NAME
+from src.data.cache import file_version
+from src.data.schema import apply_schema
+from src.data.storage import StorageBackend, is_key_column, key_columns
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _sql_value(value: Any) -> Any:
+    """Converts a Python/numpy value into something sqlite3 can bind.
+
+    Booleans are stored as 'True'/'False' text, the same as in the CSVs, so
+    consumers that compare str(x).lower() == 'true' keep working.
+    """
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return str(bool(value))
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is pd.NaT:
+        return None
+    if isinstance(value, datetime):
+        # Same ISO "T" form crud stamps, not str()'s space-separated one
+        return value.isoformat()
+    if isinstance(value, (int, float, str, bytes)):
+        return value
+    return str(value)
+
+class SQLiteBackend(StorageBackend):
+    """Stores each table in a SQLite database next to where its CSV would live.
+
+    config.py's data/gym_logs.csv becomes table "gym_logs" in data/lifeos.db.
+    Columns are untyped so values keep the Python type they were saved with,
+    and new keys are added with ALTER TABLE like the CSV backend grows its
+    header. The database runs in WAL mode so readers don't block the writer.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_name: str = SQLITE_DB_NAME):
+        self.db_name = db_name
+        self._local = threading.local() # one connection per thread per database
+        self._columns: Dict[tuple, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def _locate(self, file_path: str):
+        path = Path(file_path)
+        table = re.sub(r"\W", "_", path.stem)
+        return str(path.parent / self.db_name), table
+
+    def connect(self, db_path: str) -> sqlite3.Connection:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(db_path)
+        if conn is None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            # sqlite3 keeps compiled statements per connection; our SQL text is
+            # fixed per table so repeated calls reuse the prepared statement.
+            conn = sqlite3.connect(db_path, timeout=30, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conns[db_path] = conn
+        return conn
+
+    def close(self) -> None:
+        """Closes this thread's connections."""
+        for conn in getattr(self._local, "conns", {}).values():
+            conn.close()
+        self._local.conns = {}
+
+    def _table_columns(self, conn: sqlite3.Connection, db_path: str, table: str) -> List[str]:
+        key = (db_path, table)
+        cols = self._columns.get(key)
+        if cols is None:
+            cols = [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+            if cols:
+                self._columns[key] = cols
+        return cols
+
+    def _ensure_columns(self, conn: sqlite3.Connection, db_path: str, table: str,
+                        file_path: str, names: List[str]) -> List[str]:
+        """Creates the table or adds missing columns, plus indexes on key columns."""
+        with self._lock:
+            cols = self._table_columns(conn, db_path, table)
+            if all(n in cols for n in names):
+                return cols
+            # Another process may have added columns since we last looked
+            self._columns.pop((db_path, table), None)
+            cols = self._table_columns(conn, db_path, table)
+            missing = [n for n in dict.fromkeys(names) if n not in cols]
+            if not missing:
+                return cols
+            if not cols:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({', '.join(_quote(n) for n in missing)})")
+            else:
+                for name in missing:
+                    conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(name)}")
+            cols = cols + missing
+            for col in key_columns(file_path):
+                if col in missing:
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{col}')} "
+                        f"ON {_quote(table)} ({_quote(col)})"
+                    )
+            self._columns[(db_path, table)] = cols
+            return cols
+
+    def version(self, file_path: str) -> Optional[tuple]:
+        # Whole database: writes to any table (or the WAL) count as a change
+        db_path, _ = self._locate(file_path)
+        db = file_version(db_path)
+        return None if db is None else (db, file_version(db_path + "-wal"))
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        db_path, table = self._locate(file_path)
+        if not Path(db_path).exists():
+            return pd.DataFrame()
+        conn = self.connect(db_path)
+        if not self._table_columns(conn, db_path, table):
+            return pd.DataFrame()
+        df = pd.read_sql_query(f"SELECT * FROM {_quote(table)} ORDER BY rowid", conn)
+        return apply_schema(file_path, df)
+
+    def count(self, file_path: str) -> int:
+        db_path, table = self._locate(file_path)
+        if not Path(db_path).exists():
+            return 0
+        conn = self.connect(db_path)
+        if not self._table_columns(conn, db_path, table):
+            return 0
+        return conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0]
+
+    def read_chunks(self, file_path: str, columns: Optional[List[str]],
+                    chunksize: int) -> Iterator[pd.DataFrame]:
+        db_path, table = self._locate(file_path)
+        if not Path(db_path).exists():
+            return
+        conn = self.connect(db_path)
+        cols = self._table_columns(conn, db_path, table)
+        if columns is not None:
+            cols = [c for c in cols if c in columns]
+        if not cols:
+            return
+        sql = f"SELECT {', '.join(_quote(c) for c in cols)} FROM {_quote(table)} ORDER BY rowid"
+        for chunk in pd.read_sql_query(sql, conn, chunksize=chunksize):
+            yield apply_schema(file_path, chunk)
+
+    def read_range(self, file_path: str, start: Optional[str], end: Optional[str],
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+        db_path, table = self._locate(file_path)
+        if not Path(db_path).exists():
+            return pd.DataFrame()
+        conn = self.connect(db_path)
+        cols = self._table_columns(conn, db_path, table)
+        if "date" not in cols:
+            return pd.DataFrame()
+        if columns is not None:
+            cols = [c for c in cols if c in columns]
+        # Uses the index on date
+        where, params = ["1"], []
+        if start is not None:
+            where.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            where.append("date <= ?")
+            params.append(end)
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(_quote(c) for c in cols)} FROM {_quote(table)} "
+            f"WHERE {' AND '.join(where)} ORDER BY rowid", conn, params=params
+        )
+        return apply_schema(file_path, df)
+
+    def insert(self, file_path: str, records: List[Dict]) -> None:
+        if not records:
+            return
+        db_path, table = self._locate(file_path)
+        conn = self.connect(db_path)
+        names = [k for r in records for k in r]
+        with conn:
+            cols = self._ensure_columns(conn, db_path, table, file_path, names)
+            sql = (f"INSERT INTO {_quote(table)} ({', '.join(_quote(c) for c in cols)}) "
+                   f"VALUES ({', '.join('?' for _ in cols)})")
+            conn.executemany(sql, [[_sql_value(r.get(c)) for c in cols] for r in records])
+
+    def update(self, file_path: str, record_id: str, updates: Dict) -> bool:
+        return self._update_rows(file_path, {record_id: updates}) > 0
+
+    def update_many(self, file_path: str, updates_by_id: Dict[str, Dict]) -> None:
+        self._update_rows(file_path, updates_by_id)
+
+    def _update_rows(self, file_path: str, updates_by_id: Dict[str, Dict]) -> int:
+        """Applies updates by id in one transaction. Returns how many rows matched."""
+        db_path, table = self._locate(file_path)
+        if not Path(db_path).exists():
+            return 0
+        conn = self.connect(db_path)
+        if "id" not in self._table_columns(conn, db_path, table):
+            return 0
+        matched = 0
+        with conn:
+            names = [k for updates in updates_by_id.values() for k in updates]
+            self._ensure_columns(conn, db_path, table, file_path, names)
+            for record_id, updates in updates_by_id.items():
+                assignments = ", ".join(f"{_quote(k)} = ?" for k in updates)
+                # Only the first matching row, like the CSV backend
+                sql = (f"UPDATE {_quote(table)} SET {assignments} WHERE rowid = "
+                       f"(SELECT rowid FROM {_quote(table)} WHERE id = ? ORDER BY rowid LIMIT 1)")
+                cur = conn.execute(sql, [_sql_value(v) for v in updates.values()] + [str(record_id)])
+                matched += cur.rowcount
+        return matched
+
+    def find(self, file_path: str, column: str, value: Any) -> Optional[Dict]:
+        db_path, table = self._locate(file_path)
+        if not Path(db_path).exists():
+            return None
+        conn = self.connect(db_path)
+        if column not in self._table_columns(conn, db_path, table):
+            return None
+        # Key columns hold text, so a plain comparison can use their index
+        if is_key_column(file_path, column):
+            where = f"{_quote(column)} = ?"
+        else:
+            where = f"CAST({_quote(column)} AS TEXT) = ?"
+        df = pd.read_sql_query(
+            f"SELECT * FROM {_quote(table)} WHERE {where} ORDER BY rowid LIMIT 1",
+            conn, params=[str(value)],
+        )
+        if df.empty:
+            return None
+        return apply_schema(file_path, df).iloc[0].to_dict()
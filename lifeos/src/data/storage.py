@@ -0,0 +1,110 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from src.data.cache import file_version
+
+# Columns that get an index for point lookups, in every table
+KEY_COLUMNS = ("id", "date")
+
+# Extra indexed columns for specific tables (path -> columns)
+_declared_keys: Dict[str, set] = {}
+
+def declare_key_column(file_path: str, column: str) -> None:
+    _declared_keys.setdefault(file_path, set()).add(column)
+
+def key_columns(file_path: str) -> List[str]:
+    return list(KEY_COLUMNS) + sorted(_declared_keys.get(file_path, ()))
+
+def is_key_column(file_path: str, column: str) -> bool:
+    return column in KEY_COLUMNS or column in _declared_keys.get(file_path, ())
+
+class StorageBackend:
+    """Interface behind the crud functions.
+
+    Tables are addressed by the *_FILE paths from config.py, whatever the
+    backend actually stores them as. Records arrive with id/created_at/
+    updated_at already filled in by crud.
+    """
+
+    name = ""
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        """Returns the whole table. The result may be shared - don't mutate it."""
+        raise NotImplementedError
+
+    def read_columns(self, file_path: str, columns: List[str]) -> pd.DataFrame:
+        """Returns only the given columns (those that exist) of a table."""
+        df = self.read(file_path)
+        return df[[c for c in columns if c in df.columns]]
+
+    def read_chunks(self, file_path: str, columns: Optional[List[str]],
+                    chunksize: int) -> Iterator[pd.DataFrame]:
+        """Yields the table (or just `columns`) in chunks of at most chunksize rows.
+
+        This default slices a full read; backends override it to stream from disk.
+        """
+        df = self.read(file_path) if columns is None else self.read_columns(file_path, columns)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize].copy()
+
+    def read_range(self, file_path: str, start: Optional[str], end: Optional[str],
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Returns rows whose date is within [start, end] (YYYY-MM-DD, either may be None)."""
+        wanted = None if columns is None else list(dict.fromkeys(list(columns) + ["date"]))
+        df = self.read(file_path) if wanted is None else self.read_columns(file_path, wanted)
+        if df.empty or "date" not in df.columns:
+            return df.iloc[0:0]
+        # Dates are stored as YYYY-MM-DD strings, which sort like dates
+        dates = df["date"].astype(str)
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= dates >= start
+        if end is not None:
+            mask &= dates <= end
+        df = df[mask]
+        return df if columns is None else df[[c for c in columns if c in df.columns]]
+
+    def take(self, file_path: str, positions: List[int]) -> pd.DataFrame:
+        """Rows at these positions (0 = first row), in the order given. May be shared."""
+        df = self.read(file_path)
+        return df if df.empty else df.iloc[positions]
+
+    def count(self, file_path: str) -> int:
+        """Number of rows in the table. This default reads it; backends override it to count cheaper."""
+        return len(self.read(file_path))
+
+    def version(self, file_path: str) -> Optional[tuple]:
+        """Something that changes whenever the table's stored data does (None if there's none).
+
+        Lets callers cache things derived from a table. This default is the
+        file's (mtime, size, inode).
+        """
+        return file_version(file_path)
+
+    def insert(self, file_path: str, records: List[Dict]) -> None:
+        raise NotImplementedError
+
+    def update(self, file_path: str, record_id: str, updates: Dict) -> bool:
+        raise NotImplementedError
+
+    def update_many(self, file_path: str, updates_by_id: Dict[str, Dict]) -> None:
+        """Applies several updates to one table. Backends override this to write once."""
+        for record_id, updates in updates_by_id.items():
+            self.update(file_path, record_id, updates)
+
+    def find(self, file_path: str, column: str, value: Any) -> Optional[Dict]:
+        """Returns the first record whose column equals value (compared as strings)."""
+        df = self.read(file_path)
+        if df.empty or column not in df.columns:
+            return None
+        filtered = df[df[column].astype(str) == str(value)]
+        if filtered.empty:
+            return None
+        return filtered.iloc[0].to_dict()
+
+    def cache_stats(self) -> Dict:
+        return {}
+
+    def clear_cache(self) -> None:
+        pass
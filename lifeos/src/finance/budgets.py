@@ -0,0 +1,104 @@
+"""Budget limits over time and budget vs. actual for ranges of months.
+
+Budgets are kept as a history: each row is a category's monthly limit from
+`effective_from` (YYYY-MM) until the next row for that category. Rows from
+before this existed have no effective_from and apply from the beginning.
+
+get_budget_grid() works out limit, spent, remaining and percent for every
+(month, category) of a range at once: the limit in force is found with an
+as-of join and spending comes from the monthly rollups, so a 12-month view
+costs about the same as a single month.
+"""
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+from config import FINANCE_BUDGETS_FILE
+from src.data.crud import read_csv, save_record, update_record
+from src.finance.rollups import get_rollups
+
+GRID_COLUMNS = ["month", "category", "limit", "spent", "remaining", "percent"]
+
+def _month_number(months: pd.Series) -> pd.Series:
+    """YYYY-MM -> months since year 0, so they can be compared as numbers. Blank -> 0."""
+    months = months.fillna("").astype(str)
+    valid = months.str.match(r"^\d{4}-\d{2}")
+    numbers = pd.Series(0, index=months.index, dtype="int64")
+    numbers[valid] = months[valid].str[:4].astype(int) * 12 + months[valid].str[5:7].astype(int) - 1
+    return numbers
+
+def shift_month(month: str, n: int) -> str:
+    """Moves a YYYY-MM month by n months (negative goes back)."""
+    year, mon = int(month[:4]), int(month[5:7])
+    total = year * 12 + mon - 1 + n
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+def get_budget_history() -> pd.DataFrame:
+    """All budget rows (category, monthly_limit, effective_from), oldest first per category."""
+    df = read_csv(FINANCE_BUDGETS_FILE)
+    if df.empty:
+        return df
+    if "effective_from" not in df.columns:
+        df["effective_from"] = ""
+    df["effective_from"] = df["effective_from"].fillna("").astype(str)
+    # Stable, so equal dates keep file order and the later row wins
+    return df.sort_values("effective_from", kind="stable")
+
+def set_budget_limit(category: str, amount: float, effective_from: Optional[str] = None) -> None:
+    """Sets a category's limit from a month (YYYY-MM, default this month) on.
+
+    Earlier months keep the limit they had. Setting the same month again
+    replaces that month's row instead of adding another.
+    """
+    effective_from = effective_from or datetime.now().strftime("%Y-%m")
+    history = get_budget_history()
+    if not history.empty:
+        same = history[(history["category"] == category) & (history["effective_from"] == effective_from)]
+        if not same.empty:
+            update_record(FINANCE_BUDGETS_FILE, same["id"].iloc[-1], {"monthly_limit": amount})
+            return
+    save_record(FINANCE_BUDGETS_FILE, {"category": category, "monthly_limit": amount, "effective_from": effective_from})
+
+def get_budget_grid(start_month: str, end_month: str) -> pd.DataFrame:
+    """Budget vs. spending for every month (YYYY-MM, inclusive) and budgeted category.
+
+    One row per (month, category) that has a limit in force that month,
+    with limit, spent, remaining and percent (spent / limit, capped at 1).
+    """
+    history = get_budget_history()
+    if history.empty:
+        return pd.DataFrame(columns=GRID_COLUMNS)
+
+    months = pd.period_range(start_month, end_month, freq="M").strftime("%Y-%m")
+    categories = pd.unique(history["category"].astype(str))
+    grid = pd.MultiIndex.from_product([months, categories], names=["month", "category"]).to_frame(index=False)
+    grid["month_no"] = _month_number(grid["month"])
+
+    limits = pd.DataFrame({
+        "category": history["category"].astype(str),
+        "month_no": _month_number(history["effective_from"]),
+        "limit": history["monthly_limit"].astype("float64"),
+    }).sort_values("month_no", kind="stable")
+    # The latest limit that took effect on or before each month
+    grid = pd.merge_asof(grid.sort_values("month_no", kind="stable"), limits, on="month_no", by="category")
+    grid = grid.dropna(subset=["limit"])
+
+    spent = get_rollups(start_month, end_month)
+    if not spent.empty:
+        spent = spent[spent["type"] == "Expense"]
+    if spent.empty:
+        grid["spent"] = 0.0
+    else:
+        totals = spent.groupby(["month", spent["category"].astype(str)])["amount"].sum().rename("spent")
+        grid = grid.join(totals, on=["month", "category"])
+        grid["spent"] = grid["spent"].fillna(0.0)
+
+    grid["remaining"] = grid["limit"] - grid["spent"]
+    # Limits of 0 (or less) show as 0%
+    positive = grid["limit"].where(grid["limit"] > 0)
+    grid["percent"] = (grid["spent"] / positive).clip(upper=1.0).fillna(0.0)
+
+    order = {c: i for i, c in enumerate(categories)}
+    grid = grid.assign(_order=grid["category"].map(order)).sort_values(["month", "_order"])
+    return grid[GRID_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,88 @@
+"""Income / expense / net over time, for the cashflow trend chart.
+
+The transactions are reduced once to one row per day (income, expense);
+daily, weekly and monthly series are resampled from that, with rolling
+averages and a running balance. Both the daily totals and each finished
+series are cached until the transactions table changes (crud.table_version),
+so redrawing the chart doesn't touch the transactions at all.
+"""
+from typing import Dict, Optional
+
+import pandas as pd
+
+from config import FINANCE_TRANSACTIONS_FILE
+from src.data.crud import iter_records, table_version
+
+# Pandas resample rules; weeks start on Monday, every period is labelled by its first day
+FREQUENCIES = {"D": "D", "W": "W-MON", "M": "MS"}
+# Periods as pandas Periods, to find the one a date falls in
+PERIODS = {"D": "D", "W": "W-SUN", "M": "M"}
+# Default rolling average length per frequency, in periods
+ROLLING_WINDOWS = {"D": 7, "W": 4, "M": 3}
+
+COLUMNS = ["income", "expense", "net", "income_avg", "expense_avg", "net_avg", "balance"]
+
+_cache: Dict[tuple, pd.DataFrame] = {}
+_cache_version = None
+
+def _daily_totals() -> pd.DataFrame:
+    """Income and expense per calendar day, indexed by date (days with nothing logged left out)."""
+    parts = []
+    for chunk in iter_records(FINANCE_TRANSACTIONS_FILE, columns=["date", "type", "amount"]):
+        if "type" not in chunk.columns:
+            continue
+        amounts = chunk["amount"].astype("float64")
+        parts.append(pd.DataFrame({
+            "date": chunk["date"].astype(str).str[:10],
+            "income": amounts.where(chunk["type"] == "Income", 0.0),
+            "expense": amounts.where(chunk["type"] == "Expense", 0.0),
+        }).groupby("date").sum())
+    if not parts:
+        return pd.DataFrame(columns=["income", "expense"], index=pd.DatetimeIndex([], name="date"))
+    daily = pd.concat(parts).groupby(level=0).sum()
+    daily.index = pd.to_datetime(daily.index, format="%Y-%m-%d", errors="coerce")
+    daily = daily[daily.index.notna()].sort_index()
+    daily.index.name = "date"
+    return daily
+
+def _cached(key: tuple, build) -> pd.DataFrame:
+    global _cache_version
+    version = table_version(FINANCE_TRANSACTIONS_FILE)
+    if version != _cache_version:
+        _cache.clear()
+        _cache_version = version
+    if key not in _cache:
+        _cache[key] = build()
+    return _cache[key]
+
+def _series(freq: str, window: int) -> pd.DataFrame:
+    daily = _cached(("daily",), _daily_totals)
+    if daily.empty:
+        return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], name="date"))
+    # Sum into periods; periods with no transactions come out as zeros
+    df = daily.resample(FREQUENCIES[freq], label="left", closed="left").sum()
+    df["net"] = df["income"] - df["expense"]
+    rolling = df[["income", "expense", "net"]].rolling(window, min_periods=1).mean()
+    df[["income_avg", "expense_avg", "net_avg"]] = rolling.to_numpy()
+    df["balance"] = df["net"].cumsum()
+    df.index.name = "date"
+    return df[COLUMNS]
+
+def get_cashflow(freq: str = "M", start: Optional[str] = None, end: Optional[str] = None,
+                 window: Optional[int] = None) -> pd.DataFrame:
+    """Cashflow per day ("D"), week ("W") or month ("M"), indexed by each period's first day.
+
+    Columns: income, expense, net, their rolling averages over `window`
+    periods (income_avg, ...), and balance, the running total of net since
+    the first transaction. start/end (YYYY-MM-DD) only trim the result, so
+    the averages and balance at the start still account for earlier history.
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"freq must be one of {sorted(FREQUENCIES)}, not {freq!r}")
+    window = window or ROLLING_WINDOWS[freq]
+    df = _cached((freq, window), lambda: _series(freq, window))
+    if start is not None or end is not None:
+        # Keep the periods that contain start and end, not just those starting inside the range
+        first = None if start is None else pd.Timestamp(start).to_period(PERIODS[freq]).start_time
+        df = df.loc[first:end]
+    return df.copy()
@@ -0,0 +1,148 @@
+"""Guesses a transaction's category from its description, learning from history.
+
+Every past transaction adds its description's words (and their first few
+letters, so "starbucks" also answers "starb") to an index of
+word -> {category: count}. Classifying a description only looks up its own
+words, so it costs the same however long the history is. A few built-in
+keywords cover a fresh install; history outweighs them quickly.
+
+The index is built on first use, updated by add_transaction() as each
+transaction is logged, and rebuilt when the transactions table changes
+some other way (imports, edits to the CSV).
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from config import FINANCE_TRANSACTIONS_FILE
+from src.data.crud import iter_records, table_version
+
+# Starting point before there's any history: (type, category) -> words
+SEED_KEYWORDS = {
+    ("Expense", "Food"): ["food", "lunch", "dinner", "breakfast", "burger", "coffee", "pizza", "groceries", "restaurant"],
+    ("Expense", "Transport"): ["uber", "taxi", "bus", "gas", "fuel", "train", "metro", "parking"],
+    ("Expense", "Rent"): ["rent", "landlord"],
+    ("Expense", "Fun"): ["cinema", "movie", "bar", "concert", "game"],
+    ("Expense", "Subscriptions"): ["netflix", "spotify", "subscription", "gym", "membership"],
+    ("Income", "Salary"): ["salary", "payroll", "wages"],
+    ("Income", "Freelance"): ["invoice", "freelance", "client"],
+}
+
+MIN_PREFIX = 4 # Shortest word start that's indexed
+MAX_PREFIX = 8 # Longer words are matched on their first MAX_PREFIX letters
+PREFIX_WEIGHT = 0.5 # A prefix match counts half as much as a whole word
+
+_WORD = re.compile(r"[a-z][a-z0-9']*")
+
+def tokenize(text) -> List[str]:
+    """Lowercase words of a description, without numbers and one-letter noise."""
+    if text is None or (isinstance(text, float) and pd.isna(text)):
+        return []
+    return [w for w in _WORD.findall(str(text).lower()) if len(w) > 1]
+
+def _prefixes(word: str) -> range:
+    return range(MIN_PREFIX, min(len(word), MAX_PREFIX) + 1)
+
+class CategoryIndex:
+    """word -> category counts, plus which types each category is used with."""
+
+    def __init__(self):
+        self.words: Dict[str, Counter] = {}
+        self.prefixes: Dict[str, Counter] = {}
+        self.types: Dict[str, Counter] = {} # category -> {type: count}
+        self.totals: Counter = Counter() # category -> transactions
+
+    def learn(self, description, category, type: str = "Expense", weight: int = 1) -> None:
+        if category is None or (isinstance(category, float) and pd.isna(category)) or str(category) == "":
+            return
+        category = str(category)
+        self.types.setdefault(category, Counter())[type] += weight
+        self.totals[category] += weight
+        for word in set(tokenize(description)):
+            self.words.setdefault(word, Counter())[category] += weight
+            for n in _prefixes(word):
+                self.prefixes.setdefault(word[:n], Counter())[category] += weight
+
+    def scores(self, description, type: Optional[str] = None) -> Counter:
+        """Category -> score for a description; empty if no word is known."""
+        scores = Counter()
+        for word in set(tokenize(description)):
+            counts, weight = self.words.get(word), 1.0
+            if counts is None:
+                counts, weight = self.prefixes.get(word[:MAX_PREFIX]), PREFIX_WEIGHT
+            if not counts:
+                continue
+            # Share of the word's uses per category, so words used everywhere
+            # ("card", "payment") don't drown out the telling ones
+            total = sum(counts.values())
+            for category, n in counts.items():
+                if type is None or self.types[category][type]:
+                    scores[category] += weight * n / total
+        return scores
+
+    def classify(self, description, type: Optional[str] = None, default: str = "Other") -> str:
+        scores = self.scores(description, type)
+        if not scores:
+            return default
+        # Ties go to the category used most overall
+        return max(scores, key=lambda c: (scores[c], self.totals[c]))
+
+_index: Optional[CategoryIndex] = None
+_index_version = None
+
+def build_index() -> CategoryIndex:
+    """Builds an index from the seed keywords and every saved transaction."""
+    index = CategoryIndex()
+    for (type, category), words in SEED_KEYWORDS.items():
+        index.learn(" ".join(words), category, type)
+    for chunk in iter_records(FINANCE_TRANSACTIONS_FILE, columns=["description", "category", "type"]):
+        if "description" not in chunk.columns or "category" not in chunk.columns:
+            continue
+        rows = pd.DataFrame({
+            "description": chunk["description"].astype(object),
+            "category": chunk["category"].astype(object),
+            "type": chunk["type"].astype(object) if "type" in chunk.columns else "Expense",
+        })
+        # Repeated descriptions (the same shop every week) are learned once, weighted
+        repeats = rows.groupby(["description", "category", "type"], dropna=True).size()
+        for (description, category, type), n in repeats.items():
+            index.learn(description, category, type, weight=int(n))
+    return index
+
+def get_index() -> CategoryIndex:
+    """The cached index, rebuilt if the transactions changed behind our back."""
+    global _index, _index_version
+    version = table_version(FINANCE_TRANSACTIONS_FILE)
+    if _index is None or version != _index_version:
+        _index = build_index()
+        _index_version = version
+    return _index
+
+def learn(description: str, category: str, type: str) -> None:
+    """Adds a just-saved transaction to the cached index (if there is one yet)."""
+    global _index_version
+    if _index is None:
+        return # Built from the table, with this row in it, on first use
+    _index.learn(description, category, type)
+    _index_version = table_version(FINANCE_TRANSACTIONS_FILE)
+
+def classify(description: str, type: Optional[str] = None, default: str = "Other") -> str:
+    """Most likely category for a description, or default if none of its words are known.
+
+    type ("Expense"/"Income") limits the answer to categories used with it.
+    """
+    return get_index().classify(description, type, default)
+
+def classify_many(descriptions: Iterable, types: Iterable, default: str = "Other") -> List[str]:
+    """classify() for many rows, working out each distinct (description, type) once."""
+    index = get_index()
+    memo: Dict[tuple, str] = {}
+    out = []
+    for description, type in zip(descriptions, types):
+        key = (description, type)
+        if key not in memo:
+            memo[key] = index.classify(description, type, default)
+        out.append(memo[key])
+    return out
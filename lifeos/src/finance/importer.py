@@ -0,0 +1,145 @@
+"""Bulk import of bank statement CSV exports into the transactions table.
+
+The statement is streamed in chunks. Columns are matched by common header
+names (or an explicit column_map), amounts are signed (negative = expense) or
+split into debit/credit columns, and rows already in the table are skipped
+by (date, amount, description). Rows without a category column are
+categorized from their description by src/finance/classifier.py. Everything
+new is written with a single save_records call, then the monthly rollups are
+rebuilt once.
+
+Usage (from the lifeos/ directory):
+    python -m src.finance.importer statement.csv [--dry-run]
+"""
+import sys
+from collections import Counter
+from typing import Dict, IO, List, Optional, Union
+
+import pandas as pd
+
+from config import FINANCE_TRANSACTIONS_FILE, ITER_CHUNK_ROWS
+from src.data.crud import iter_records, save_records
+from src.finance.classifier import classify_many
+from src.finance.rollups import rebuild_rollups
+
+# Header names banks commonly use, lowercase
+COLUMN_ALIASES = {
+    "date": ["date", "transaction date", "posting date", "posted date", "booking date", "value date"],
+    "description": ["description", "details", "memo", "narrative", "payee", "reference", "name"],
+    "amount": ["amount", "value", "transaction amount"],
+    "debit": ["debit", "withdrawal", "withdrawals", "money out", "paid out"],
+    "credit": ["credit", "deposit", "deposits", "money in", "paid in"],
+    "category": ["category"],
+}
+
+def _resolve_columns(header: List[str], column_map: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Maps our field names to the statement's column names."""
+    lowered = {str(h).strip().lower(): h for h in header}
+    resolved = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                resolved[field] = lowered[alias]
+                break
+    resolved.update(column_map or {})
+    if "date" not in resolved or not ("amount" in resolved or "debit" in resolved or "credit" in resolved):
+        raise ValueError(f"Can't find date/amount columns in statement header {header}; pass column_map")
+    return resolved
+
+def _numbers(values: pd.Series) -> pd.Series:
+    # "1,234.50" / "$12" / "(12.00)" style exports
+    text = values.astype(str).str.replace(r"[,$£€\s]", "", regex=True)
+    text = text.str.replace(r"^\((.*)\)$", r"-\1", regex=True)
+    return pd.to_numeric(text, errors="coerce")
+
+def dedup_key(dates: pd.Series, amounts: pd.Series, descriptions: pd.Series) -> pd.Series:
+    """(date, amount, description) as one string, the key duplicates are detected by."""
+    return (dates.astype(str) + "|" + amounts.astype("float64").round(2).map("{:.2f}".format)
+            + "|" + descriptions.fillna("").astype(str).str.strip().str.lower())
+
+def _normalize(chunk: pd.DataFrame, columns: Dict[str, str], date_format: Optional[str],
+               dayfirst: bool, default_category: str) -> pd.DataFrame:
+    """Statement rows -> date/amount/type/category/description, dropping rows that don't parse."""
+    dates = pd.to_datetime(chunk[columns["date"]], format=date_format or "mixed", dayfirst=dayfirst, errors="coerce")
+    if "amount" in columns:
+        signed = _numbers(chunk[columns["amount"]])
+    else:
+        debit = _numbers(chunk[columns["debit"]]).abs().fillna(0) if "debit" in columns else 0
+        credit = _numbers(chunk[columns["credit"]]).abs().fillna(0) if "credit" in columns else 0
+        signed = credit - debit
+    if "description" in columns:
+        descriptions = chunk[columns["description"]].fillna("").astype(str).str.strip()
+    else:
+        descriptions = pd.Series("", index=chunk.index)
+    types = signed.lt(0).map({True: "Expense", False: "Income"})
+
+    out = pd.DataFrame({
+        "date": dates.dt.strftime("%Y-%m-%d"),
+        "amount": signed.abs().round(2),
+        "type": types,
+        "description": descriptions,
+    })
+    out = out[dates.notna() & signed.notna() & signed.ne(0)]
+    if "category" in columns:
+        out["category"] = chunk.loc[out.index, columns["category"]].fillna(default_category).astype(str)
+    else:
+        out["category"] = classify_many(out["description"], out["type"], default_category)
+    return out[["date", "amount", "type", "category", "description"]]
+
+def _existing_keys() -> Counter:
+    """How many times each (date, amount, description) is already in the table."""
+    counts = Counter()
+    for chunk in iter_records(FINANCE_TRANSACTIONS_FILE, columns=["date", "amount", "description"]):
+        if "description" not in chunk.columns:
+            chunk = chunk.assign(description="")
+        counts.update(dedup_key(chunk["date"], chunk["amount"], chunk["description"]).tolist())
+    return counts
+
+def import_statement(source: Union[str, IO], column_map: Optional[Dict[str, str]] = None,
+                     date_format: Optional[str] = None, dayfirst: bool = False,
+                     default_category: str = "Other", dry_run: bool = False,
+                     chunksize: int = ITER_CHUNK_ROWS) -> Dict[str, int]:
+    """Imports a bank CSV export. Returns counts of rows read, imported, duplicate and skipped.
+
+    A row is a duplicate if the table already has a transaction with the same
+    date, amount and description. Identical rows within the statement (two
+    coffees on one day) are kept, up to however many the table doesn't have yet.
+    """
+    existing = _existing_keys()
+    seen = Counter() # Occurrences of each key so far in this statement
+    new_frames = []
+    stats = {"read": 0, "imported": 0, "duplicates": 0, "skipped": 0}
+
+    columns = None
+    with pd.read_csv(source, chunksize=chunksize, dtype=str, skipinitialspace=True) as reader:
+        for chunk in reader:
+            if columns is None:
+                columns = _resolve_columns(list(chunk.columns), column_map)
+            stats["read"] += len(chunk)
+            rows = _normalize(chunk, columns, date_format, dayfirst, default_category)
+            stats["skipped"] += len(chunk) - len(rows)
+            if rows.empty:
+                continue
+
+            keys = dedup_key(rows["date"], rows["amount"], rows["description"])
+            # n-th occurrence of the key in the statement vs. copies already stored
+            occurrence = keys.groupby(keys).cumcount() + keys.map(seen).fillna(0).astype(int)
+            duplicate = occurrence < keys.map(existing).fillna(0).astype(int)
+            seen.update(keys.tolist())
+            stats["duplicates"] += int(duplicate.sum())
+            new_frames.append(rows[~duplicate.values])
+
+    new_rows = pd.concat(new_frames, ignore_index=True) if new_frames else pd.DataFrame()
+    stats["imported"] = len(new_rows)
+    if dry_run or new_rows.empty:
+        return stats
+    # One write for the whole statement, then one pass to refresh the monthly totals
+    save_records(FINANCE_TRANSACTIONS_FILE, new_rows.to_dict(orient="records"))
+    rebuild_rollups()
+    return stats
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    for arg in args:
+        result = import_statement(arg, dry_run="--dry-run" in sys.argv)
+        print(f"{arg}: " + ", ".join(f"{k} {v}" for k, v in result.items()))
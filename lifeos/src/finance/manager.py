@@ -1,8 +1,10 @@
-from config import FINANCE_TRANSACTIONS_FILE, FINANCE_BUDGETS_FILE, FINANCE_CATEGORIES_FILE
-from src.data.crud import save_record, get_all_records, update_record
+from config import FINANCE_TRANSACTIONS_FILE, FINANCE_CATEGORIES_FILE
+from src.data.crud import save_record, save_records, get_all_records, read_range
+from src.finance.rollups import add_to_rollup, get_month_rollup, get_rollups
+from src.finance.budgets import get_budget_grid, set_budget_limit
+from src.finance import classifier
 import pandas as pd
 from typing import List, Dict, Optional
-from datetime import datetime
 
 DEFAULT_CATEGORIES = ["Food", "Transport", "Rent", "Fun", "Subscriptions", "Other", "Salary", "Freelance"]
 
@@ -10,17 +12,21 @@ def get_categories() -> List[str]:
     """Retrieves finance categories, defaulting if empty."""
     records = get_all_records(FINANCE_CATEGORIES_FILE)
     if not records:
-        # Initialize defaults if file doesn't exist
-        for cat in DEFAULT_CATEGORIES:
-            save_record(FINANCE_CATEGORIES_FILE, {"name": cat})
+        # Not seeded yet (see src/core/bootstrap.py) - reads never write
         return sorted(DEFAULT_CATEGORIES)
     
     return sorted([r["name"] for r in records])
 
+def seed_categories() -> None:
+    """Writes the default categories. Called by the init step on an empty table."""
+    save_records(FINANCE_CATEGORIES_FILE, [{"name": cat} for cat in DEFAULT_CATEGORIES])
+
 def add_category(name: str) -> None:
     """Adds a new category if it doesn't exist."""
     current = get_categories()
     if name not in current:
+        if not get_all_records(FINANCE_CATEGORIES_FILE):
+            seed_categories() # Keep the defaults next to the new one
         save_record(FINANCE_CATEGORIES_FILE, {"name": name})
 
 def delete_category(name: str) -> None:
@@ -39,24 +45,18 @@ def add_transaction(date: str, amount: float, type: str, category: str, descript
         "description": description
     }
     save_record(FINANCE_TRANSACTIONS_FILE, data)
+    add_to_rollup(date, amount, type, category)
+    classifier.learn(description, category, type)
 
 def get_monthly_summary(month_str: str) -> Dict:
     """Calculates income, expense, and savings for a given month (YYYY-MM)."""
-    records = get_all_records(FINANCE_TRANSACTIONS_FILE)
-    if not records:
-        return {"income": 0.0, "expense": 0.0, "savings": 0.0}
-        
-    df = pd.DataFrame(records)
-    # Filter by month
-    df["date"] = pd.to_datetime(df["date"])
-    mask = df["date"].dt.strftime("%Y-%m") == month_str
-    month_df = df[mask]
-    
+    # Answered from the monthly rollup (src/finance/rollups.py), not the transactions
+    month_df = get_month_rollup(month_str)
     if month_df.empty:
         return {"income": 0.0, "expense": 0.0, "savings": 0.0}
         
-    income = month_df[month_df["type"] == "Income"]["amount"].sum()
-    expense = month_df[month_df["type"] == "Expense"]["amount"].sum()
+    income = float(month_df.loc[month_df["type"] == "Income", "amount"].sum())
+    expense = float(month_df.loc[month_df["type"] == "Expense", "amount"].sum())
     
     return {
         "income": round(income, 2),
@@ -66,71 +66,49 @@ def get_monthly_summary(month_str: str) -> Dict:
 
 def get_category_breakdown(month_str: str) -> pd.DataFrame:
     """Returns expense breakdown by category."""
-    records = get_all_records(FINANCE_TRANSACTIONS_FILE)
-    if not records:
+    month_df = get_month_rollup(month_str)
+    if month_df.empty:
         return pd.DataFrame()
-        
-    df = pd.DataFrame(records)
-    df["date"] = pd.to_datetime(df["date"])
-    mask = (df["date"].dt.strftime("%Y-%m") == month_str) & (df["type"] == "Expense")
-    month_df = df[mask]
-    
+    # Rollup rows are already one per category; "" collects uncategorized ones
+    month_df = month_df[(month_df["type"] == "Expense") & (month_df["category"].fillna("") != "")]
     if month_df.empty:
         return pd.DataFrame()
     
-    return month_df.groupby("category")["amount"].sum().reset_index().sort_values("amount", ascending=False)
+    return month_df[["category", "amount"]].sort_values("amount", ascending=False).reset_index(drop=True)
 
-def set_budget(category: str, amount: float) -> None:
-    """Sets a monthly budget for a category."""
-    existing = get_all_records(FINANCE_BUDGETS_FILE)
-    
-    # Simple overwrite logic since we don't have IDs for budgets yet easily accessible, 
-    # or we just append and take latest.
-    # Cleaner: Read, update df, save.
-    
-    data = {"category": category, "monthly_limit": amount}
-    
-    # We can use update_record if we knew ID, but let's just use a simple overwrite for now
-    # or better: check if exists.
-    
-    df = pd.DataFrame(existing)
-    if not df.empty and "category" in df.columns:
-        if category in df["category"].values:
-            # Update
-            idx = df[df["category"] == category].index[0]
-            df.at[idx, "monthly_limit"] = amount
-            df.at[idx, "updated_at"] = datetime.now().isoformat()
-            df.to_csv(FINANCE_BUDGETS_FILE, index=False)
-            return
+def get_transactions(start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """Transactions dated within [start, end] (YYYY-MM-DD, inclusive, either optional).
+
+    Binary search over the cached table's date order - no per-row date parsing.
+    """
+    return read_range(FINANCE_TRANSACTIONS_FILE, start, end)
+
+def get_month_category_matrix(start_month: str, end_month: str, type: str = "Expense") -> pd.DataFrame:
+    """Totals per month (rows, YYYY-MM) x category (columns) over a range of months.
 
-    save_record(FINANCE_BUDGETS_FILE, data)
+    Every month in the range gets a row, zeros where nothing was logged, so
+    e.g. a 24-month range lines up for year-over-year comparisons.
+    """
+    months = pd.period_range(start_month, end_month, freq="M").strftime("%Y-%m")
+    df = get_rollups(start_month, end_month)
+    if not df.empty:
+        df = df[(df["type"] == type) & (df["category"].fillna("") != "")]
+    if df.empty:
+        return pd.DataFrame(index=pd.Index(months, name="month"))
+    matrix = df.pivot_table(index="month", columns="category", values="amount", aggfunc="sum", fill_value=0.0)
+    matrix.columns = matrix.columns.astype(str)
+    return matrix.reindex(months, fill_value=0.0).rename_axis(index="month", columns="category")
+
+def set_budget(category: str, amount: float, effective_from: Optional[str] = None) -> None:
+    """Sets a monthly budget for a category, from effective_from (YYYY-MM, default this month) on.
+
+    Past months keep their old limit (see src/finance/budgets.py).
+    """
+    set_budget_limit(category, amount, effective_from)
 
 def get_budget_status(month_str: str) -> pd.DataFrame:
     """Compares actual spending vs budget for the month."""
-    # Get actuals
-    breakdown = get_category_breakdown(month_str)
-    if breakdown.empty:
-        actuals = {}
-    else:
-        actuals = dict(zip(breakdown["category"], breakdown["amount"]))
-        
-    # Get budgets
-    budgets = get_all_records(FINANCE_BUDGETS_FILE)
-    if not budgets:
+    grid = get_budget_grid(month_str, month_str)
+    if grid.empty:
         return pd.DataFrame() # No budgets set
-        
-    rows = []
-    for b in budgets:
-        cat = b["category"]
-        limit = float(b["monthly_limit"])
-        spent = actuals.get(cat, 0.0)
-        remaining = limit - spent
-        rows.append({
-            "category": cat,
-            "limit": limit,
-            "spent": spent,
-            "remaining": remaining,
-            "percent": min(spent/limit, 1.0) if limit > 0 else 0
-        })
-        
-    return pd.DataFrame(rows)
+    return grid.drop(columns="month")
@@ -0,0 +1,155 @@
+"""Per-month finance totals, kept up to date as transactions are added.
+
+One row per (month, type, category) with the summed amount and the number of
+transactions, so the Finance page never aggregates the transaction history:
+its size only grows with months x categories. add_transaction() bumps the
+matching row; rebuild_rollups() recomputes all of them from the transactions
+(e.g. after editing the CSV by hand). Reads never write: the table is first
+built at app startup (or by the first add_transaction). From the lifeos/
+directory:
+    python -m src.finance.rollups
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from config import FINANCE_TRANSACTIONS_FILE, FINANCE_ROLLUPS_FILE
+from src.data.crud import (
+    after_batch, batch, count_records, declare_key_column, get_all_records, get_record,
+    iter_records, read_csv, save_record, save_records, update_record
+)
+from src.data.locking import writer_lock
+
+declare_key_column(FINANCE_ROLLUPS_FILE, "key")
+
+# Totals of transactions added inside the current thread's open batch()
+_local = threading.local()
+
+def rollup_key(month: str, type: str, category: str) -> str:
+    return f"{month}|{type}|{category}"
+
+def _category(value) -> str:
+    # Transactions without a category still count towards the month's totals
+    return "" if value is None or pd.isna(value) else str(value)
+
+def add_to_rollup(date: str, amount: float, type: str, category: str) -> None:
+    """Adds one (already saved) transaction to its month's totals.
+
+    Inside crud.batch() the transaction isn't on disk yet, so the totals are
+    collected and applied once the batch has been written.
+    """
+    month = str(date)[:7]
+    category = _category(category)
+    key = rollup_key(month, type, category)
+    pending = getattr(_local, "pending", None)
+    if pending is None and after_batch(_batch_ended):
+        pending = _local.pending = {}
+    if pending is None:
+        _apply({key: (month, type, category, float(amount), 1)})
+        return
+    _, _, _, prev_amount, prev_n = pending.get(key, (month, type, category, 0.0, 0))
+    pending[key] = (month, type, category, prev_amount + float(amount), prev_n + 1)
+
+def _batch_ended(written: bool) -> None:
+    pending, _local.pending = _local.pending, None
+    if written:
+        _apply(pending)
+
+def _apply(deltas: Dict[str, Tuple[str, str, str, float, int]]) -> None:
+    """Adds (month, type, category, amount, count) totals to the stored rollups."""
+    if not deltas:
+        return
+    if not count_records(FINANCE_ROLLUPS_FILE):
+        # First rollup: the rebuild counts these along with any history from before rollups existed
+        rebuild_rollups()
+        return
+    # Read-modify-write, so concurrent sessions must not interleave here
+    with writer_lock(str(FINANCE_ROLLUPS_FILE)), batch():
+        for key, (month, type, category, amount, n) in deltas.items():
+            row = get_record(FINANCE_ROLLUPS_FILE, "key", key)
+            if row is None:
+                save_record(FINANCE_ROLLUPS_FILE, {
+                    "key": key, "month": month, "type": type, "category": category,
+                    "amount": amount, "count": n
+                })
+            else:
+                update_record(FINANCE_ROLLUPS_FILE, row["id"], {
+                    "amount": float(row["amount"]) + amount,
+                    "count": int(row["count"]) + n
+                })
+
+def _totals() -> Dict[str, Tuple[str, str, str, float, int]]:
+    """(month, type, category, amount, count) per rollup key, summed from the transactions."""
+    totals: Dict[str, Tuple[str, str, str, float, int]] = {}
+    for chunk in iter_records(FINANCE_TRANSACTIONS_FILE, columns=["date", "type", "category", "amount"]):
+        keys = pd.DataFrame({
+            "month": chunk["date"].astype(str).str[:7],
+            "type": chunk["type"].astype(object),
+            "category": chunk["category"].map(_category) if "category" in chunk else "",
+            "amount": chunk["amount"].astype("float64"),
+        })
+        grouped = keys.groupby(["month", "type", "category"])["amount"].agg(["sum", "size"])
+        for (month, type, category), (amount, n) in grouped.iterrows():
+            key = rollup_key(month, type, category)
+            _, _, _, prev_amount, prev_n = totals.get(key, (month, type, category, 0.0, 0))
+            totals[key] = (month, type, category, prev_amount + amount, prev_n + int(n))
+    return totals
+
+def rebuild_rollups() -> Optional[int]:
+    """Recomputes every rollup row from the transactions. Returns how many months x categories there are.
+
+    Inside crud.batch() it runs once the batch has been written (and returns None).
+    """
+    if after_batch(lambda written: written and rebuild_rollups()):
+        return None
+    # Counted by the rebuild, so they mustn't be added again
+    pending = getattr(_local, "pending", None)
+    if pending:
+        pending.clear()
+
+    totals = _totals()
+    with writer_lock(str(FINANCE_ROLLUPS_FILE)), batch():
+        existing = {r["key"]: r for r in get_all_records(FINANCE_ROLLUPS_FILE)}
+        new_rows = []
+        for key, (month, type, category, amount, n) in totals.items():
+            if key in existing:
+                update_record(FINANCE_ROLLUPS_FILE, existing[key]["id"], {"amount": amount, "count": n})
+            else:
+                new_rows.append({"key": key, "month": month, "type": type, "category": category,
+                                 "amount": amount, "count": n})
+        save_records(FINANCE_ROLLUPS_FILE, new_rows)
+        # Months/categories with no transactions left are zeroed rather than deleted
+        for key, row in existing.items():
+            if key not in totals and row["count"]:
+                update_record(FINANCE_ROLLUPS_FILE, row["id"], {"amount": 0.0, "count": 0})
+    return len(totals)
+
+def get_rollups(start_month: Optional[str] = None, end_month: Optional[str] = None) -> pd.DataFrame:
+    """Rollup rows (month, type, category, amount, count) for a range of months (YYYY-MM, inclusive).
+
+    Read-only. Transactions from before rollups existed are summed in memory
+    until the table is built (rebuild_rollups(), done at app startup).
+    """
+    df = read_csv(FINANCE_ROLLUPS_FILE)
+    if df.empty:
+        totals = _totals()
+        if not totals:
+            return df
+        df = pd.DataFrame(
+            [(key, *values) for key, values in totals.items()],
+            columns=["key", "month", "type", "category", "amount", "count"],
+        )
+    mask = df["count"] > 0
+    if start_month is not None:
+        mask &= df["month"] >= start_month
+    if end_month is not None:
+        mask &= df["month"] <= end_month
+    return df[mask]
+
+def get_month_rollup(month_str: str) -> pd.DataFrame:
+    """Rollup rows (type, category, amount, count) for one month (YYYY-MM)."""
+    return get_rollups(month_str, month_str)
+
+if __name__ == "__main__":
+    print(f"Rebuilt {rebuild_rollups()} rollup rows.")
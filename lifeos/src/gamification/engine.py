@@ -1,5 +1,5 @@
-from config import DAILY_EXECUTION_FILE, GYM_LOGS_FILE, KNOWLEDGE_NOTES_FILE, FINANCE_TRANSACTIONS_FILE
-from src.data.crud import get_all_records
+from config import DAILY_EXECUTION_FILE, GYM_LOGS_FILE, KNOWLEDGE_NOTES_FILE
+from src.data.crud import get_rows, count_records
 import pandas as pd
 from typing import Dict
 
@@ -7,28 +7,28 @@ def calculate_rpg_stats() -> Dict:
     """Calculates player stats (XP, Level, Attributes) based on all data."""
     
     # 1. Fetch Data
-    exec_recs = get_all_records(DAILY_EXECUTION_FILE)
-    gym_recs = get_all_records(GYM_LOGS_FILE)
-    notes_recs = get_all_records(KNOWLEDGE_NOTES_FILE)
-    finance_recs = get_all_records(FINANCE_TRANSACTIONS_FILE)
+    # Compact row objects; gym sets and notes only need counting
+    exec_rows = get_rows(DAILY_EXECUTION_FILE)
+    gym_sets = count_records(GYM_LOGS_FILE)
+    note_count = count_records(KNOWLEDGE_NOTES_FILE)
     
     # 2. Calculate XP Sources
     # Study XP: 100 XP per hour
-    study_hours = sum([float(r.get("study_hours_actual", 0)) for r in exec_recs]) 
+    study_hours = sum([r.study_hours_actual for r in exec_rows if pd.notna(r.study_hours_actual)])
     study_xp = int(study_hours * 100)
     
     # Gym XP: 200 XP per set logged (Simple proxy for effort)
     # Better: 50 XP per set
-    gym_sets = len(gym_recs)
     gym_xp = gym_sets * 50
     
     # Knowledge XP: 50 XP per note
-    note_xp = len(notes_recs) * 50
+    note_xp = note_count * 50
     
     # Discipline XP: Day Score total
     # If day score is stored, sum it? Or calculate. 
     # Let's assume day score isn't stored historically in simple format, so use count of gym/routine done
-    routine_count = sum([1 for r in exec_recs if str(r.get("morning_routine_done")).lower() == 'true'])
+    # morning_routine_done is a real boolean (or <NA>) thanks to the schema
+    routine_count = sum([1 for r in exec_rows if r.morning_routine_done is True])
     discipline_xp = routine_count * 150
     
     # 3. Total
@@ -52,7 +52,7 @@ def calculate_rpg_stats() -> Dict:
         "attributes": {
             "STR": gym_sets // 10,  # 1 STR per 10 sets
             "INT": int(study_hours) // 5, # 1 INT per 5 hours
-            "WIS": len(notes_recs) // 2, # 1 WIS per 2 notes
+            "WIS": note_count // 2, # 1 WIS per 2 notes
             "DIS": routine_count # 1 DIS per routine day
         }
     }
@@ -1,12 +1,31 @@
+from config import GYM_LOGS_FILE, EXERCISES_FILE
+from src.data.crud import read_csv, table_version
 from .workouts import get_last_session_stats, get_exercise_history
+from .records import check_records
+from .library import get_exercises
+import numpy as np
 import pandas as pd
 
+VOLUME_COLUMNS = ["week", "week_start", "muscle", "sets", "reps", "tonnage", "sets_avg", "reps_avg", "tonnage_avg"]
+
+# (logs version, library version, window) -> weekly volume
+_volume_cache: dict = {}
+
 def check_progressive_overload(exercise_name: str, current_weight: float, current_reps: int) -> str:
-    """Checks if current set beats the last session's best."""
+    """Checks if current set beats the all-time records, then the last session's best."""
     last = get_last_session_stats(exercise_name)
     if not last:
         return "New Exercise! 💪"
     
+    # All-time records first (src/gym/records.py), by key - no history scan
+    broken = check_records(exercise_name, current_weight, current_reps)
+    if "weight" in broken:
+        return "🏆 All-time Weight PR!"
+    elif "e1rm" in broken:
+        return "🏆 Estimated 1RM PR!"
+    elif "reps" in broken:
+        return f"🏆 Rep PR at {float(current_weight):g}kg!"
+    
     prev_weight = float(last["weight"])
     prev_reps = int(last["reps"])
     
@@ -19,9 +38,58 @@ def check_progressive_overload(exercise_name: str, current_weight: float, curren
     else:
         return "" # Lower performance (deload or fatigue)
 
-def calculate_weekly_volume() -> pd.DataFrame:
-    """Returns volume (weight * reps) per muscle group per week."""
-    # This requires joining logs with library to get muscle group
-    # For now, minimal implementation using just exercise logs
-    # We would need to load library and map names
-    return pd.DataFrame() 
+def _muscles_of(names: pd.Series) -> pd.Categorical:
+    """Muscle group of each logged exercise name, "Other" if it isn't in the library."""
+    library = {str(e["name"]).strip().lower(): str(e.get("muscle") or "Other") for e in get_exercises()}
+    # Look up each distinct name once and spread the answers by category code
+    names = names.astype("category")
+    muscles = [library.get(str(n).strip().lower(), "Other") for n in names.cat.categories]
+    groups = sorted(set(muscles) | {"Other"})
+    lookup = np.array([groups.index(m) for m in muscles] + [groups.index("Other")]) # Last slot: missing name
+    return pd.Categorical.from_codes(lookup[names.cat.codes.to_numpy()], categories=groups)
+
+def calculate_weekly_volume(window: int = 4) -> pd.DataFrame:
+    """Returns sets, reps and volume (weight * reps) per muscle group per ISO week.
+
+    One row per week (from the first logged week to the last) and muscle
+    group, with zeros for weeks a muscle wasn't trained, plus rolling
+    averages over the last `window` weeks (sets_avg, reps_avg, tonnage_avg).
+    Cached until the gym log or the exercise library changes.
+    """
+    key = (table_version(GYM_LOGS_FILE), table_version(EXERCISES_FILE), window)
+    if key not in _volume_cache:
+        _volume_cache.clear()
+        _volume_cache[key] = _weekly_volume(window)
+    return _volume_cache[key].copy()
+
+def _weekly_volume(window: int) -> pd.DataFrame:
+    logs = read_csv(GYM_LOGS_FILE, columns=["date", "exercise_name", "weight_kg", "reps"])
+    if logs.empty or not {"date", "exercise_name", "reps"} <= set(logs.columns):
+        return pd.DataFrame(columns=VOLUME_COLUMNS)
+    dates = pd.to_datetime(logs["date"].astype(str).str[:10], format="%Y-%m-%d", errors="coerce")
+    reps = pd.to_numeric(logs["reps"], errors="coerce").fillna(0)
+    weight = pd.to_numeric(logs["weight_kg"], errors="coerce").fillna(0) if "weight_kg" in logs else 0.0
+    sets = pd.DataFrame({
+        # Monday of the set's ISO week
+        "week_start": dates.dt.to_period("W-SUN").dt.start_time,
+        "muscle": _muscles_of(logs["exercise_name"]),
+        "reps": reps,
+        "tonnage": weight * reps,
+    })[dates.notna()]
+    if sets.empty:
+        return pd.DataFrame(columns=VOLUME_COLUMNS)
+
+    weekly = sets.groupby(["week_start", "muscle"], observed=True).agg(
+        sets=("reps", "size"), reps=("reps", "sum"), tonnage=("tonnage", "sum"))
+    # Every week x muscle, so rest weeks count as zero in the averages
+    weeks = pd.date_range(weekly.index.levels[0].min(), weekly.index.levels[0].max(), freq="7D")
+    muscles = weekly.index.get_level_values("muscle").unique()
+    wide = weekly.unstack("muscle").reindex(weeks, fill_value=0).fillna(0)
+    rolling = wide.rolling(window, min_periods=1).mean()
+    rolling.columns = pd.MultiIndex.from_tuples([(f"{stat}_avg", m) for stat, m in rolling.columns], names=wide.columns.names)
+    out = pd.concat([wide, rolling], axis=1).rename_axis("week_start").stack("muscle", future_stack=True).reset_index()
+    out = out[out["muscle"].isin(muscles)]
+    iso = out["week_start"].dt.isocalendar()
+    out["week"] = iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)
+    out["sets"] = out["sets"].astype(int)
+    return out[VOLUME_COLUMNS].sort_values(["week_start", "muscle"]).reset_index(drop=True) 
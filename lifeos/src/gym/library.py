@@ -1,6 +1,9 @@
 from config import EXERCISES_FILE
-from src.data.crud import get_all_records, save_record
-from typing import List, Dict
+from src.data.crud import get_all_records, save_record, save_records, table_version
+from typing import List, Dict, Optional
+from difflib import SequenceMatcher
+import re
+import threading
 
 DEFAULT_EXERCISES = [
     {"name": "Squat", "muscle": "Legs", "type": "Compound"},
@@ -15,15 +18,115 @@ DEFAULT_EXERCISES = [
 ]
 
 def get_exercises() -> List[Dict]:
-    """Returns all available exercises, initializing defaults if empty."""
+    """Returns all available exercises, or the defaults if the library is empty."""
     exercises = get_all_records(EXERCISES_FILE)
     if not exercises:
-        for ex in DEFAULT_EXERCISES:
-            save_record(EXERCISES_FILE, ex)
-        return DEFAULT_EXERCISES
+        # Not seeded yet (see src/core/bootstrap.py) - reads never write
+        return [dict(ex) for ex in DEFAULT_EXERCISES]
     return exercises
 
+# Common shorthand -> library name (only used if that name is in the library)
+ALIASES = {
+    "bench": "Bench Press", "bp": "Bench Press",
+    "ohp": "Overhead Press", "military press": "Overhead Press",
+    "dl": "Deadlift", "deads": "Deadlift",
+    "pullup": "Pull Up", "pullups": "Pull Up", "chin up": "Pull Up",
+    "db row": "Dumbbell Row", "row": "Dumbbell Row",
+    "curl": "Bicep Curl", "curls": "Bicep Curl", "biceps": "Bicep Curl",
+    "triceps": "Tricep Extension", "laterals": "Lateral Raise",
+}
+
+FUZZY_CUTOFF = 0.75 # Similarity (0-1) a typo needs to still count as a name
+
+def normalize_name(text: str) -> str:
+    """Lowercase, single-spaced, with -, _ and . treated as spaces."""
+    return " ".join(re.split(r"[\s\-_.]+", str(text).lower())).strip()
+
+def _trigrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class _NameIndex:
+    """Every way of writing an exercise name, precomputed for the library.
+
+    exact: full name, name without spaces, initials ("bp") and aliases
+    prefixes: starts of the name or of any of its words ("dead", "lat", "raise")
+    trigrams: for typos, which keys share each 3-letter piece
+    A key that fits more than one exercise maps to None (ambiguous).
+    """
+
+    def __init__(self, names: List[str]):
+        self.exact: Dict[str, Optional[str]] = {}
+        self.prefixes: Dict[str, Optional[str]] = {}
+        self.trigrams: Dict[str, set] = {}
+        by_key = {normalize_name(n): n for n in names}
+
+        def add(table, key, name):
+            table[key] = name if table.get(key, name) == name else None
+
+        for key, name in by_key.items():
+            words = key.split()
+            add(self.exact, key, name)
+            add(self.exact, "".join(words), name)
+            if len(words) > 1:
+                add(self.exact, "".join(w[0] for w in words), name)
+            for word_start in range(len(words)):
+                rest = " ".join(words[word_start:])
+                for n in range(2, len(rest) + 1):
+                    add(self.prefixes, rest[:n], name)
+        for alias, name in ALIASES.items():
+            if normalize_name(name) in by_key and alias not in self.exact:
+                self.exact[alias] = by_key[normalize_name(name)]
+        for key in self.exact:
+            for gram in _trigrams(key):
+                self.trigrams.setdefault(gram, set()).add(key)
+
+    def resolve(self, text: str) -> Optional[str]:
+        key = normalize_name(text)
+        if not key:
+            return None
+        if key in self.exact:
+            return self.exact[key]
+        if key in self.prefixes:
+            return self.prefixes[key]
+        # Typo: compare against the keys sharing at least one trigram
+        scores: Dict[str, float] = {}
+        for candidate in set().union(*(self.trigrams.get(g, ()) for g in _trigrams(key))):
+            name = self.exact[candidate]
+            if name is not None:
+                scores[name] = max(scores.get(name, 0.0), SequenceMatcher(None, key, candidate).ratio())
+        ranked = sorted(scores.values(), reverse=True)
+        if not ranked or ranked[0] < FUZZY_CUTOFF or (len(ranked) > 1 and ranked[1] == ranked[0]):
+            return None
+        return max(scores, key=scores.get)
+
+_name_index: Optional[_NameIndex] = None
+_name_index_version = None
+_name_index_lock = threading.Lock()
+
+def resolve_exercise(text: str) -> Optional[str]:
+    """Library name for what was typed - any case, shorthand, prefix or small typo.
+
+    "squat" -> "Squat", "bench" -> "Bench Press", "ohp" -> "Overhead Press",
+    "dead" -> "Deadlift", "sqaut" -> "Squat". None if nothing (or more than
+    one exercise equally) fits. The index is rebuilt only when the library changes.
+    """
+    global _name_index, _name_index_version
+    with _name_index_lock:
+        version = table_version(EXERCISES_FILE)
+        if _name_index is None or version != _name_index_version:
+            _name_index = _NameIndex([str(e["name"]) for e in get_exercises()])
+            _name_index_version = version
+        index = _name_index
+    return index.resolve(text)
+
+def seed_exercises() -> None:
+    """Writes the default exercises. Called by the init step on an empty table."""
+    save_records(EXERCISES_FILE, [dict(ex) for ex in DEFAULT_EXERCISES])
+
 def add_exercise(name: str, muscle: str, type: str) -> None:
     """Adds a new exercise to the library."""
+    if not get_all_records(EXERCISES_FILE):
+        seed_exercises() # Keep the defaults next to the new one
     data = {"name": name, "muscle": muscle, "type": type}
     save_record(EXERCISES_FILE, data)
@@ -0,0 +1,201 @@
+"""Personal records per exercise, kept up to date as sets are logged.
+
+Three kinds of record, one row each in the PR table:
+    <exercise>|weight          heaviest set (more reps breaks a tie)
+    <exercise>|e1rm            best estimated one-rep max
+    <exercise>|reps@<weight>   most reps done at that weight
+log_set() checks a new set against its three rows by key, so keeping the
+table current costs the same however long the log is, and PR checks and
+the leaderboard never scan the history. rebuild_records() recomputes the
+table from the log (e.g. after editing the CSV by hand). From the lifeos/
+directory:
+    python -m src.gym.records
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import GYM_LOGS_FILE, GYM_PRS_FILE
+from src.data.crud import (
+    batch, count_records, declare_key_column, get_all_records, get_record,
+    iter_records, read_csv, save_record, save_records, update_record
+)
+from src.data.locking import writer_lock
+
+declare_key_column(GYM_PRS_FILE, "key")
+
+# Formula behind the stored e1rm values; rebuild the table after changing it
+E1RM_FORMULA = "epley"
+
+PR_COLUMNS = ["key", "exercise_name", "record", "weight_kg", "reps", "e1rm", "date"]
+
+def epley(weight, reps):
+    return weight * (1 + reps / 30)
+
+def brzycki(weight, reps):
+    # Undefined from 37 reps on; that far out it's no estimate anyway
+    return weight * 36 / (37 - np.minimum(reps, 36))
+
+E1RM_FORMULAS = {"epley": epley, "brzycki": brzycki}
+
+def estimate_1rm(weight, reps, formula: str = E1RM_FORMULA):
+    """Estimated one-rep max of a set (scalars or arrays). A single rep is its own 1RM."""
+    estimate = np.where(np.asarray(reps) <= 1, weight, E1RM_FORMULAS[formula](weight, reps))
+    return float(estimate) if np.ndim(estimate) == 0 else estimate
+
+def _stored_e1rm(weight: float, reps: int) -> float:
+    # Rounded as the table stores it, so repeating a record set ties rather than beats it
+    return round(estimate_1rm(weight, reps), 2)
+
+def _weight_text(weight) -> str:
+    return f"{float(weight):g}"
+
+def record_key(exercise: str, record: str, weight=None) -> str:
+    if record == "reps":
+        return f"{exercise}|reps@{_weight_text(weight)}"
+    return f"{exercise}|{record}"
+
+def _reps(row: Dict) -> int:
+    # 0 for records zeroed by a rebuild (and blanks)
+    value = row.get("reps")
+    return 0 if value is None or pd.isna(value) else int(value)
+
+def _beats(record: str, weight: float, reps: int, e1rm: float, row: Dict) -> bool:
+    if record == "weight":
+        return (weight, reps) > (float(row["weight_kg"]), _reps(row))
+    if record == "e1rm":
+        return e1rm > float(row["e1rm"])
+    return reps > _reps(row)
+
+def _candidates(exercise: str, weight: float) -> Dict[str, str]:
+    return {record_key(exercise, r, weight): r for r in ("weight", "e1rm", "reps")}
+
+def check_records(exercise: str, weight: float, reps: int) -> List[str]:
+    """Which records (weight / e1rm / reps) a set would break, without logging it.
+
+    An exercise with no records yet breaks none.
+    """
+    _ensure_records()
+    weight, reps = float(weight), int(reps)
+    e1rm = _stored_e1rm(weight, reps)
+    broken = []
+    has_any = False
+    for key, record in _candidates(str(exercise), weight).items():
+        row = get_record(GYM_PRS_FILE, "key", key)
+        if row is not None and _reps(row) > 0:
+            has_any = True
+            if _beats(record, weight, reps, e1rm, row):
+                broken.append(record)
+    # A weight never done before isn't a rep PR; it may still be a weight / e1RM one
+    return broken if has_any else []
+
+def update_records(date: str, exercise: str, weight: float, reps: int) -> None:
+    """Folds one (already saved) set into the PR table."""
+    if not count_records(GYM_PRS_FILE):
+        # First PR: take in any history from before the table existed too
+        rebuild_records()
+        return
+    if weight is None or reps is None or pd.isna(weight) or pd.isna(reps) or int(reps) <= 0:
+        return
+    weight, reps = float(weight), int(reps)
+    e1rm = _stored_e1rm(weight, reps)
+    # Read-modify-write, so concurrent sessions must not interleave here
+    with writer_lock(str(GYM_PRS_FILE)), batch():
+        for key, record in _candidates(str(exercise), weight).items():
+            row = get_record(GYM_PRS_FILE, "key", key)
+            values = {"weight_kg": weight, "reps": reps, "e1rm": e1rm, "date": date}
+            if row is None:
+                save_record(GYM_PRS_FILE, {"key": key, "exercise_name": exercise, "record": record, **values})
+            elif _beats(record, weight, reps, e1rm, row):
+                update_record(GYM_PRS_FILE, row["id"], values)
+
+def _best_sets(sets: pd.DataFrame) -> pd.DataFrame:
+    """PR rows for a batch of sets (also for merging batches: best of the bests is the best)."""
+    # Earliest date first, so a record is credited to when it was first set
+    sets = sets.sort_values("date", kind="stable")
+    heaviest = sets.sort_values(["weight_kg", "reps"], ascending=False, kind="stable").drop_duplicates("exercise_name")
+    strongest = sets.sort_values("e1rm", ascending=False, kind="stable").drop_duplicates("exercise_name")
+    most_reps = sets.sort_values("reps", ascending=False, kind="stable").drop_duplicates(["exercise_name", "weight_kg"])
+    return pd.concat([
+        heaviest.assign(record="weight"), strongest.assign(record="e1rm"), most_reps.assign(record="reps"),
+    ], ignore_index=True)
+
+def rebuild_records() -> int:
+    """Recomputes every PR from the gym log. Returns how many records there are."""
+    best = []
+    for chunk in iter_records(GYM_LOGS_FILE, columns=["date", "exercise_name", "weight_kg", "reps"]):
+        if not {"exercise_name", "weight_kg", "reps"} <= set(chunk.columns):
+            continue
+        sets = pd.DataFrame({
+            "date": chunk["date"].astype(str) if "date" in chunk else "",
+            "exercise_name": chunk["exercise_name"].astype(object),
+            "weight_kg": pd.to_numeric(chunk["weight_kg"], errors="coerce"),
+            "reps": pd.to_numeric(chunk["reps"], errors="coerce"),
+        }).dropna(subset=["exercise_name", "weight_kg", "reps"])
+        sets = sets[sets["reps"] > 0]
+        if not sets.empty:
+            best.append(_best_sets(sets.assign(e1rm=estimate_1rm(sets["weight_kg"].to_numpy(), sets["reps"].to_numpy()))))
+
+    rows: Dict[str, Dict] = {}
+    if best:
+        merged = _best_sets(pd.concat(best, ignore_index=True).drop(columns="record"))
+        for exercise, record, weight, reps, e1rm, date in zip(
+                merged["exercise_name"], merged["record"], merged["weight_kg"], merged["reps"], merged["e1rm"], merged["date"]):
+            key = record_key(str(exercise), record, weight)
+            rows[key] = {"key": key, "exercise_name": exercise, "record": record, "weight_kg": float(weight),
+                         "reps": int(reps), "e1rm": round(float(e1rm), 2), "date": date}
+
+    with writer_lock(str(GYM_PRS_FILE)), batch():
+        existing = {r["key"]: r for r in get_all_records(GYM_PRS_FILE)}
+        new_rows = []
+        for key, row in rows.items():
+            if key in existing:
+                update_record(GYM_PRS_FILE, existing[key]["id"], {k: row[k] for k in ("weight_kg", "reps", "e1rm", "date")})
+            else:
+                new_rows.append(row)
+        save_records(GYM_PRS_FILE, new_rows)
+        # Records with no sets behind them any more are zeroed rather than deleted
+        for key, row in existing.items():
+            if key not in rows and _reps(row):
+                update_record(GYM_PRS_FILE, row["id"], {"weight_kg": 0.0, "reps": 0, "e1rm": 0.0})
+    return len(rows)
+
+def _ensure_records() -> None:
+    if not count_records(GYM_PRS_FILE) and count_records(GYM_LOGS_FILE):
+        rebuild_records() # Logs from before the PR table existed
+
+def _records(record: Optional[str] = None) -> pd.DataFrame:
+    _ensure_records()
+    df = read_csv(GYM_PRS_FILE)
+    if df.empty:
+        return pd.DataFrame(columns=PR_COLUMNS)
+    mask = df["reps"].fillna(0) > 0
+    if record is not None:
+        mask &= df["record"] == record
+    return df[mask]
+
+def get_personal_records(exercise: str) -> Dict:
+    """An exercise's records.
+
+    "weight" and "e1rm" are the record sets as dicts (None if there's none);
+    "reps" is a DataFrame of the most reps done at each weight, lightest first.
+    """
+    _ensure_records()
+    out = {}
+    for record in ("weight", "e1rm"):
+        row = get_record(GYM_PRS_FILE, "key", record_key(str(exercise), record))
+        out[record] = row if row is not None and _reps(row) > 0 else None
+    reps = _records("reps")
+    reps = reps[reps["exercise_name"].astype(str) == str(exercise)]
+    out["reps"] = reps[["weight_kg", "reps", "e1rm", "date"]].sort_values("weight_kg").reset_index(drop=True)
+    return out
+
+def get_leaderboard(limit: Optional[int] = None) -> pd.DataFrame:
+    """Best estimated 1RM per exercise, strongest first."""
+    df = _records("e1rm")[["exercise_name", "e1rm", "weight_kg", "reps", "date"]]
+    df = df.sort_values("e1rm", ascending=False).reset_index(drop=True)
+    return df if limit is None else df.head(limit)
+
+if __name__ == "__main__":
+    print(f"Rebuilt {rebuild_records()} personal records.")
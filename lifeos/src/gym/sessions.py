@@ -0,0 +1,155 @@
+"""Live workout sessions: set numbers and running totals per training day.
+
+A session is everything logged on one date. For the last few training days
+this keeps, per exercise, how many sets have been logged and their reps and
+tonnage, in memory and in a small JSON sidecar (data/gym_sessions.json), so
+log_set can number a set and the Gym page can show the session so far
+without reading the log.
+
+A day that isn't tracked (older, or before this existed) is counted from
+the log once, with a date-range read of just that day. If the log changed
+without going through log_set (another process, a hand edit) the sidecar
+no longer matches it and is recounted the same way.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+
+from config import GYM_LOGS_FILE, GYM_SESSIONS_FILE
+from src.data.crud import read_range, table_version
+from src.data.locking import atomic_write, writer_lock
+
+# Training days kept in the sidecar, most recent first
+KEEP_DAYS = 14
+
+_sessions: Dict[str, Dict] = {} # date -> session
+_log_version = None # table_version() of the gym log the sessions match
+_loaded = False
+_lock = threading.RLock()
+
+def session_lock():
+    """Lock log_set holds while it numbers, saves and counts a set.
+
+    Two sessions logging at once can't hand out the same set number.
+    """
+    return writer_lock(str(GYM_SESSIONS_FILE))
+
+def _tuples(value):
+    # JSON turns the version tuples into lists
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+def _load() -> None:
+    global _sessions, _log_version, _loaded
+    if _loaded:
+        return
+    try:
+        with open(GYM_SESSIONS_FILE, encoding="utf-8") as f:
+            state = json.load(f)
+        _sessions = state.get("sessions", {})
+        _log_version = _tuples(state.get("log_version"))
+    except (FileNotFoundError, ValueError, KeyError):
+        _sessions, _log_version = {}, None
+    _loaded = True
+
+def _save() -> None:
+    keep = sorted(_sessions, reverse=True)[:KEEP_DAYS]
+    state = {
+        "log_version": _log_version,
+        "sessions": {d: _sessions[d] for d in sorted(keep)},
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(GYM_SESSIONS_FILE)), exist_ok=True)
+    atomic_write(str(GYM_SESSIONS_FILE), lambda f: json.dump(state, f, indent=1, default=list))
+
+def _from_log(date: str) -> Dict:
+    """Counts one day's session from the log."""
+    df = read_range(GYM_LOGS_FILE, date, date, columns=["exercise_name", "weight_kg", "reps", "created_at"])
+    session = {"date": date, "started_at": None, "last_set_at": None, "exercises": {}}
+    if df.empty or "exercise_name" not in df.columns:
+        return session
+    reps = pd.to_numeric(df["reps"], errors="coerce").fillna(0) if "reps" in df else pd.Series(0, index=df.index)
+    weight = pd.to_numeric(df["weight_kg"], errors="coerce").fillna(0) if "weight_kg" in df else 0.0
+    per_exercise = pd.DataFrame({
+        "exercise": df["exercise_name"].astype(str), "reps": reps, "tonnage": weight * reps,
+    }).groupby("exercise").agg(sets=("reps", "size"), reps=("reps", "sum"), tonnage=("tonnage", "sum"))
+    session["exercises"] = {
+        name: {"sets": int(row.sets), "reps": int(row.reps), "tonnage": float(row.tonnage)}
+        for name, row in per_exercise.iterrows()
+    }
+    if "created_at" in df.columns:
+        stamps = pd.to_datetime(df["created_at"], errors="coerce").dropna()
+        if not stamps.empty:
+            session["started_at"] = stamps.min().isoformat()
+            session["last_set_at"] = stamps.max().isoformat()
+    return session
+
+def _session(date: str) -> Dict:
+    global _sessions, _log_version
+    _load()
+    version = table_version(GYM_LOGS_FILE)
+    if version != _log_version:
+        # Log changed behind our back: every tracked day gets recounted on use
+        _sessions, _log_version = {}, version
+    if date not in _sessions:
+        _sessions[date] = _from_log(date)
+    return _sessions[date]
+
+def next_set_number(date: str, exercise: str) -> int:
+    """The number the next set of this exercise on this date gets (1 for the first)."""
+    with _lock:
+        counts = _session(str(date))["exercises"].get(str(exercise))
+        return (counts["sets"] if counts else 0) + 1
+
+def record_set(date: str, exercise: str, weight: float, reps: int) -> None:
+    """Counts a set that has just been saved to the log.
+
+    Expects next_set_number() to have been called for it (under
+    session_lock()) before the save, while the sessions still matched the log.
+    """
+    global _log_version
+    date = str(date)
+    with _lock, session_lock():
+        _load()
+        session = _sessions.get(date)
+        if session is None:
+            # Not tracked yet: the log, with this set in it, has the right counts
+            _sessions[date] = _from_log(date)
+        else:
+            counts = session["exercises"].setdefault(str(exercise), {"sets": 0, "reps": 0, "tonnage": 0.0})
+            counts["sets"] += 1
+            counts["reps"] += int(reps or 0)
+            counts["tonnage"] += float(weight or 0) * int(reps or 0)
+            now = datetime.now().isoformat()
+            session["started_at"] = session["started_at"] or now
+            session["last_set_at"] = now
+        _log_version = table_version(GYM_LOGS_FILE)
+        _save()
+
+def get_session(date: str) -> Optional[Dict]:
+    """Summary of a day's session, or None if nothing was logged that day.
+
+    sets / reps / tonnage in total and per exercise, started_at and
+    last_set_at (ISO timestamps) and duration_min between them.
+    """
+    with _lock:
+        session = _session(str(date))
+        exercises = {name: dict(c) for name, c in session["exercises"].items()}
+    if not exercises:
+        return None
+    duration = 0.0
+    if session["started_at"] and session["last_set_at"]:
+        elapsed = datetime.fromisoformat(session["last_set_at"]) - datetime.fromisoformat(session["started_at"])
+        duration = round(elapsed.total_seconds() / 60, 1)
+    return {
+        "date": str(date),
+        "sets": sum(c["sets"] for c in exercises.values()),
+        "reps": sum(c["reps"] for c in exercises.values()),
+        "tonnage": round(sum(c["tonnage"] for c in exercises.values()), 2),
+        "exercises": exercises,
+        "started_at": session["started_at"],
+        "last_set_at": session["last_set_at"],
+        "duration_min": duration,
+    }
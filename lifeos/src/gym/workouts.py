@@ -1,10 +1,56 @@
 from config import GYM_LOGS_FILE
-from src.data.crud import save_record, get_all_records
+from src.data.crud import save_record, read_csv, take_rows, count_records, table_version
+from src.gym.records import update_records
+from src.gym import sessions
 from typing import List, Dict, Optional
+from bisect import bisect_left, bisect_right
+import threading
+import numpy as np
 import pandas as pd
 
-def log_set(date: str, exercise: str, weight: float, reps: int, rpe: int, notes: str = "") -> None:
-    """Logs a single set."""
+class _HistoryIndex:
+    """exercise name -> positions of its rows in the log, oldest date first.
+
+    Lets history lookups read just one exercise's rows from the cached table
+    instead of filtering every set ever logged. Built from the log on first
+    use and extended by log_set; rebuilt whenever the log changed otherwise.
+    """
+
+    def __init__(self, names: np.ndarray, dates: np.ndarray):
+        self.size = len(names)
+        order = np.argsort(dates, kind="stable") # date order, log order within a day
+        groups = pd.Series(order).groupby(names[order], sort=False).indices
+        self.positions: Dict[str, List[int]] = {name: order[idx].tolist() for name, idx in groups.items()}
+        self.dates: Dict[str, List[str]] = {name: dates[pos].tolist() for name, pos in self.positions.items()}
+
+    def add(self, name: str, date: str, position: int) -> None:
+        dates = self.dates.setdefault(name, [])
+        at = bisect_right(dates, date) # After any sets already logged that day
+        dates.insert(at, date)
+        self.positions.setdefault(name, []).insert(at, position)
+        self.size += 1
+
+_index: Optional[_HistoryIndex] = None
+_index_version = None
+_index_lock = threading.Lock()
+
+def _history_index() -> _HistoryIndex:
+    global _index, _index_version
+    with _index_lock:
+        version = table_version(GYM_LOGS_FILE)
+        if _index is None or version != _index_version:
+            df = read_csv(GYM_LOGS_FILE, columns=["exercise_name", "date"])
+            if df.empty or "exercise_name" not in df.columns:
+                names = dates = np.array([], dtype=object)
+            else:
+                names = df["exercise_name"].astype(str).to_numpy(dtype=object)
+                dates = df["date"].astype(str).to_numpy(dtype=object)
+            _index, _index_version = _HistoryIndex(names, dates), version
+        return _index
+
+def log_set(date: str, exercise: str, weight: float, reps: int, rpe: int, notes: str = "") -> int:
+    """Logs a single set. Returns its set number (1, 2, ...) for that exercise that day."""
+    global _index_version
     data = {
         "date": date,
         "exercise_name": exercise,
@@ -12,37 +58,49 @@ def log_set(date: str, exercise: str, weight: float, reps: int, rpe: int, notes:
         "reps": reps,
         "rpe": rpe,
         "notes": notes,
-        # "set_number" handling could be improved by checking prev logs for same day/exercise
-        # but for simplicity, we treat every log as a sequential entry in DB
     }
-    save_record(GYM_LOGS_FILE, data)
+    index = _history_index()
+    # Numbered from the live session counters (src/gym/sessions.py), not by scanning the log
+    with sessions.session_lock():
+        data["set_number"] = sessions.next_set_number(date, exercise)
+        save_record(GYM_LOGS_FILE, data)
+        sessions.record_set(date, exercise, weight, reps)
+    update_records(date, exercise, weight, reps)
+    with _index_lock:
+        if _index is index:
+            # Appended as the last row (not the case for e.g. a past month of a
+            # partitioned log): record its position, otherwise rebuild next time
+            position = index.size
+            if count_records(GYM_LOGS_FILE) == position + 1 and \
+                    str(take_rows(GYM_LOGS_FILE, [position])["id"].iloc[0]) == str(data["id"]):
+                index.add(str(exercise), str(date), position)
+                _index_version = table_version(GYM_LOGS_FILE)
+            else:
+                _index_version = None
+    return data["set_number"]
 
 def get_exercise_history(exercise_name: str) -> pd.DataFrame:
-    """Returns history for a specific exercise as DataFrame."""
-    records = get_all_records(GYM_LOGS_FILE)
-    if not records:
+    """Returns history for a specific exercise as DataFrame, newest first."""
+    positions = _history_index().positions.get(str(exercise_name))
+    if not positions:
         return pd.DataFrame()
-    
-    df = pd.DataFrame(records)
-    # Filter
-    df = df[df["exercise_name"] == exercise_name]
-    if not df.empty:
-        df = df.sort_values("date", ascending=False)
-    return df
+    return take_rows(GYM_LOGS_FILE, positions[::-1])
 
 def get_last_session_stats(exercise_name: str) -> Optional[Dict]:
     """Returns max weight/reps from the LAST session for this exercise."""
-    df = get_exercise_history(exercise_name)
-    if df.empty:
+    index = _history_index()
+    dates = index.dates.get(str(exercise_name))
+    if not dates:
         return None
-    
-    # Get most recent date
-    last_date = df.iloc[0]["date"]
-    last_session = df[df["date"] == last_date]
-    
+
+    # Most recent date, and only that day's sets
+    last_date = dates[-1]
+    start = bisect_left(dates, last_date)
+    last_session = take_rows(GYM_LOGS_FILE, index.positions[str(exercise_name)][start:])
+
     # Find max weight
     max_weight_row = last_session.loc[last_session["weight_kg"].idxmax()]
-    
+
     return {
         "date": last_date,
         "weight": max_weight_row["weight_kg"],
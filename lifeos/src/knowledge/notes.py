@@ -1,7 +1,11 @@
 from config import KNOWLEDGE_NOTES_FILE
-from src.data.crud import save_record, get_all_records, update_record
-import pandas as pd
-from typing import List, Dict, Optional
+from src.data.crud import save_record, get_rows, table_version, take_rows
+from src.data.schema import get_schema
+from src.data.locking import writer_lock
+from src.knowledge.search import index_note, search_notes
+from src.knowledge.review import queue_note
+from typing import List, Optional
+from src.data.records import Record, to_records
 from datetime import datetime
 
 def add_note(title: str, content: str, tags: str) -> None:
@@ -13,24 +17,30 @@ def add_note(title: str, content: str, tags: str) -> None:
         "created_at": datetime.now().isoformat(),
         "review_date": datetime.now().isoformat()
     }
-    save_record(KNOWLEDGE_NOTES_FILE, data)
+    # Locked so nothing lands between the version check and the save
+    with writer_lock(str(KNOWLEDGE_NOTES_FILE)):
+        before = table_version(KNOWLEDGE_NOTES_FILE)
+        save_record(KNOWLEDGE_NOTES_FILE, data)
+        index_note(data["id"], title, data["tags"], content, before)
+        queue_note(data["id"], data["review_date"], before)
 
-def get_notes(search_query: str = "") -> List[Dict]:
-    """Retrieves notes, optionally filtered by search."""
-    records = get_all_records(KNOWLEDGE_NOTES_FILE)
-    if not records:
-        return []
-    
-    if not search_query:
+def get_notes(search_query: str = "", limit: Optional[int] = None) -> List[Record]:
+    """Retrieves notes, optionally filtered by search.
+
+    Without a search, newest first. With one, the notes matching its words,
+    most relevant first (BM25, see src/knowledge/search.py); the last word
+    may be unfinished. At most limit notes are returned.
+    Notes are compact row objects; note["title"] and note.get("tags") work as before.
+    """
+    if not search_query.strip():
+        records = get_rows(KNOWLEDGE_NOTES_FILE)
         # Sort by created desc
-        return sorted(records, key=lambda x: x.get("created_at", ""), reverse=True)
-    
-    query = search_query.lower()
-    filtered = []
-    for r in records:
-        if (query in str(r.get("title", "")).lower() or 
-            query in str(r.get("tags", "")).lower() or
-            query in str(r.get("content", "")).lower()):
-            filtered.append(r)
-            
-    return sorted(filtered, key=lambda x: x.get("created_at", ""), reverse=True)
+        records = sorted(records, key=lambda x: x.get("created_at", ""), reverse=True)
+        return records if limit is None else records[:limit]
+
+    hits = search_notes(search_query, limit)
+    if not hits:
+        return []
+    df = take_rows(KNOWLEDGE_NOTES_FILE, [position for position, _ in hits])
+    schema = get_schema(KNOWLEDGE_NOTES_FILE)
+    return to_records(df, schema.model if schema else None)
@@ -0,0 +1,174 @@
+"""Spaced-repetition reviews of knowledge notes (SM-2).
+
+Every note has a review_date: when it's next due. Grading a review (0-5,
+3 and up meaning it was recalled) moves that date out by an interval that
+grows with each successful review and with how easy the note is:
+    first success 1 day, second 6 days, then previous interval x ease factor
+A failed review starts the note over at 1 day, and every grade nudges the
+ease factor (never below 1.3).
+
+The notes are kept in a min-heap on review_date, so "due today" pops just
+the due notes (O(k log n)) instead of reading every note, and a grade
+writes only that note's row. The heap is built from the notes table once
+and then kept up by add_note() and grade_note(); a change made elsewhere
+(another process, a hand edit) rebuilds it on next use.
+"""
+import heapq
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config import KNOWLEDGE_NOTES_FILE
+from src.data.crud import get_record, read_csv, table_version, take_rows, update_record
+from src.data.locking import writer_lock
+from src.data.records import Record, to_records
+from src.data.schema import get_schema
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_GRADE = 3
+# Labels for the grades the Knowledge page offers
+GRADES = {"Again": 1, "Hard": 3, "Good": 4, "Easy": 5}
+
+def _number(value, default):
+    return default if value is None or pd.isna(value) else value
+
+def next_review(grade: int, repetitions: int = 0, interval_days: int = 0, ease_factor: float = DEFAULT_EASE) -> Dict:
+    """SM-2: the note's repetitions / interval_days / ease_factor after a review graded 0-5."""
+    if not 0 <= grade <= 5:
+        raise ValueError("Grade must be between 0 and 5.")
+    if grade < PASSING_GRADE:
+        repetitions, interval_days = 0, 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval_days = 1
+        elif repetitions == 2:
+            interval_days = 6
+        else:
+            interval_days = max(1, round(interval_days * ease_factor))
+    miss = 5 - grade
+    ease_factor = max(MIN_EASE, ease_factor + 0.1 - miss * (0.08 + miss * 0.02))
+    return {"repetitions": repetitions, "interval_days": interval_days, "ease_factor": round(ease_factor, 2)}
+
+class ReviewQueue:
+    """Min-heap of (next review time, row position) over the notes.
+
+    Grading pushes the note again with its new time instead of moving it;
+    the old entry is recognized as stale (its time no longer matches) and
+    dropped when it surfaces.
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[int, int]] = []
+        self.due: Dict[int, int] = {} # row position -> current next review (ns timestamp)
+        self.positions: Dict[str, int] = {} # note id -> row position
+        self.version = None # notes table_version() the queue matches
+
+    def push(self, position: int, when) -> None:
+        # Notes without a review date are due right away
+        key = 0 if when is None or pd.isna(when) else pd.Timestamp(when).value
+        self.due[position] = key
+        heapq.heappush(self.heap, (key, position))
+        self.compact()
+
+    def due_before(self, cutoff: datetime, limit: Optional[int] = None) -> List[int]:
+        """Row positions of notes due before cutoff, earliest first."""
+        cutoff = pd.Timestamp(cutoff).value
+        found, popped = [], []
+        while self.heap and self.heap[0][0] < cutoff and (limit is None or len(found) < limit):
+            entry = heapq.heappop(self.heap)
+            if self.due.get(entry[1]) != entry[0]:
+                continue # Stale: the note was graded since
+            popped.append(entry)
+            found.append(entry[1])
+        # Peeking, not dequeuing: the notes stay due until graded
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+        return found
+
+    def compact(self) -> None:
+        # Drop stale entries once they make up most of the heap
+        if len(self.heap) > 2 * len(self.due) + 64:
+            self.heap = [(key, position) for position, key in self.due.items()]
+            heapq.heapify(self.heap)
+
+_queue: Optional[ReviewQueue] = None
+_lock = threading.RLock()
+
+def get_queue() -> ReviewQueue:
+    """The review heap, rebuilt from the notes table if that changed behind its back."""
+    global _queue
+    with _lock:
+        version = table_version(KNOWLEDGE_NOTES_FILE)
+        if _queue is not None and _queue.version == version:
+            return _queue
+        queue = ReviewQueue()
+        df = read_csv(KNOWLEDGE_NOTES_FILE, columns=["id", "review_date"])
+        if "id" in df.columns:
+            queue.positions = {str(note_id): i for i, note_id in enumerate(df["id"])}
+        if "review_date" in df.columns:
+            when = pd.to_datetime(df["review_date"], errors="coerce", format="ISO8601")
+            queue.heap = [(0 if pd.isna(w) else w.value, i) for i, w in enumerate(when)]
+        else:
+            queue.heap = [(0, i) for i in range(len(df))]
+        queue.due = {position: key for key, position in queue.heap}
+        heapq.heapify(queue.heap)
+        queue.version = version
+        _queue = queue
+        return _queue
+
+def queue_note(note_id: str, review_date, previous_version) -> None:
+    """Adds a just-saved note (the last row of the notes table) to the queue.
+
+    previous_version is the notes table_version() from before the save.
+    """
+    with _lock:
+        if _queue is None or _queue.version != previous_version:
+            return # Built (or rebuilt) from the table on next use
+        position = len(_queue.due)
+        _queue.positions[str(note_id)] = position
+        _queue.push(position, review_date)
+        _queue.version = table_version(KNOWLEDGE_NOTES_FILE)
+
+def _end_of_day(day: Optional[date] = None) -> datetime:
+    day = day or date.today()
+    return datetime.combine(day + timedelta(days=1), datetime.min.time())
+
+def get_due_notes(day: Optional[date] = None, limit: Optional[int] = None) -> List[Record]:
+    """Notes due for review by the end of day (today by default), most overdue first."""
+    positions = get_queue().due_before(_end_of_day(day), limit)
+    if not positions:
+        return []
+    df = take_rows(KNOWLEDGE_NOTES_FILE, positions)
+    schema = get_schema(KNOWLEDGE_NOTES_FILE)
+    return to_records(df, schema.model if schema else None)
+
+def count_due(day: Optional[date] = None) -> int:
+    return len(get_queue().due_before(_end_of_day(day)))
+
+def grade_note(note_id: str, grade: int, day: Optional[date] = None) -> Dict:
+    """Records a review of a note graded 0-5 and schedules its next one.
+
+    Returns the note's new review_date, repetitions, interval_days and ease_factor.
+    """
+    day = day or date.today()
+    with _lock, writer_lock(str(KNOWLEDGE_NOTES_FILE)):
+        queue = get_queue()
+        note = get_record(KNOWLEDGE_NOTES_FILE, "id", note_id)
+        if note is None:
+            raise ValueError(f"No note with id {note_id}.")
+        schedule = next_review(
+            int(grade),
+            int(_number(note.get("repetitions"), 0)),
+            int(_number(note.get("interval_days"), 0)),
+            float(_number(note.get("ease_factor"), DEFAULT_EASE)),
+        )
+        review_date = datetime.combine(day + timedelta(days=schedule["interval_days"]), datetime.min.time())
+        update_record(KNOWLEDGE_NOTES_FILE, note_id, {**schedule, "review_date": review_date.isoformat()})
+        # Only this note moves in the heap
+        queue.push(queue.positions[str(note_id)], review_date)
+        queue.version = table_version(KNOWLEDGE_NOTES_FILE)
+        return {"review_date": review_date.isoformat(), **schedule}
@@ -0,0 +1,255 @@
+"""Full-text search over knowledge notes: an inverted index ranked with BM25.
+
+Each note's title, tags and content are split into words; the index maps
+every word to the notes containing it and how often. A search only visits
+the notes that contain one of its words, and ranks them with BM25 (title and
+tags count double). The last word of the query also matches longer words it
+is the start of, so results show up while typing ("pyth" finds "python").
+
+add_note() adds each new note to the index. The index is saved beside the
+notes file (knowledge_notes.index.npz, compressed plain arrays, no
+pickles) so a restart doesn't re-index every note. It is only re-saved
+once SAVE_EVERY notes have been added since the last save; notes added
+since then (by this or another process) are indexed on the next search. Notes only ever get appended, so after editing
+the CSV by hand rebuild it, from the lifeos/ directory:
+    python -m src.knowledge.search
+"""
+import json
+import math
+import os
+import re
+import threading
+import zipfile
+from bisect import bisect_left, insort
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import KNOWLEDGE_NOTES_FILE
+from src.data.crud import read_csv, table_version
+from src.data.locking import atomic_write
+
+# BM25 parameters: term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = {"title": 2, "tags": 2, "content": 1}
+# Most words the last query word expands to as a prefix
+PREFIX_EXPANSION = 50
+# Save the index after this many notes were added since it was last saved
+SAVE_EVERY = 25
+# Layout of the saved arrays; a file with another one is rebuilt instead
+INDEX_FORMAT = 2
+
+_WORD = re.compile(r"\w+")
+
+def tokenize(text) -> List[str]:
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return []
+    return _WORD.findall(str(text).lower())
+
+def index_path() -> str:
+    return str(Path(KNOWLEDGE_NOTES_FILE).with_suffix(".index.npz"))
+
+class NoteIndex:
+    """word -> notes it occurs in (by row position) with term counts, plus note lengths."""
+
+    def __init__(self):
+        self.ids: List[str] = [] # note id per row position
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Tuple[List[int], List[int]]] = {} # word -> (positions, counts)
+        self.terms: List[str] = [] # sorted, for prefix lookups
+        self.version = None # notes table_version() the index matches
+        self.unsaved = 0
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lengths: Optional[np.ndarray] = None
+
+    def add(self, note_id, title, tags, content) -> None:
+        position = len(self.ids)
+        counts = Counter()
+        for field, text in (("title", title), ("tags", tags), ("content", content)):
+            for word in tokenize(text):
+                counts[word] += FIELD_WEIGHTS[field]
+        self.ids.append(str(note_id))
+        self.lengths.append(sum(counts.values()))
+        for word, n in counts.items():
+            entry = self.postings.get(word)
+            if entry is None:
+                entry = self.postings[word] = ([], [])
+                insort(self.terms, word)
+            entry[0].append(position)
+            entry[1].append(n)
+            self._arrays.pop(word, None)
+        self._lengths = None
+        self.unsaved += 1
+
+    def _posting_arrays(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(word)
+        if arrays is None:
+            positions, counts = self.postings[word]
+            arrays = self._arrays[word] = (np.array(positions, dtype=np.int64), np.array(counts, dtype=np.float64))
+        return arrays
+
+    def expand(self, prefix: str) -> List[str]:
+        """Indexed words starting with prefix (at most PREFIX_EXPANSION, the most common first)."""
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\U0010ffff")
+        words = self.terms[start:end]
+        if len(words) > PREFIX_EXPANSION:
+            words = sorted(words, key=lambda w: len(self.postings[w][0]), reverse=True)[:PREFIX_EXPANSION]
+        return words
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(row position, score) of matching notes, best first."""
+        words = tokenize(query)
+        if not words or not self.ids:
+            return []
+        # Whole words as typed, the last one also as a prefix
+        terms = {w for w in words[:-1] if w in self.postings}
+        terms.update(self.expand(words[-1]))
+        if not terms:
+            return []
+
+        if self._lengths is None:
+            self._lengths = np.array(self.lengths, dtype=np.float64)
+        n_docs = len(self.ids)
+        avg_length = max(self._lengths.mean(), 1.0)
+        scores = np.zeros(n_docs)
+        for term in terms:
+            positions, counts = self._posting_arrays(term)
+            idf = math.log(1 + (n_docs - len(positions) + 0.5) / (len(positions) + 0.5))
+            norm = K1 * (1 - B + B * self._lengths[positions] / avg_length)
+            scores[positions] += idf * counts * (K1 + 1) / (counts + norm)
+
+        hits = np.flatnonzero(scores)
+        if limit is not None and len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        # Best first; equal scores newest first
+        order = np.lexsort((-hits, -scores[hits]))
+        return [(int(hits[i]), float(scores[hits[i]])) for i in order]
+
+_index: Optional[NoteIndex] = None
+_lock = threading.RLock()
+
+def _notes() -> pd.DataFrame:
+    df = read_csv(KNOWLEDGE_NOTES_FILE, columns=["id", "title", "tags", "content"])
+    for column in ("id", "title", "tags", "content"):
+        if column not in df.columns:
+            df[column] = ""
+    return df
+
+def _tuples(value):
+    # JSON turns the version tuples into lists
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+def _narrow(values: np.ndarray) -> np.ndarray:
+    # The smallest unsigned type that holds every value - less to compress
+    return values.astype(np.min_scalar_type(int(values.max()) if len(values) else 0))
+
+def _save(index: NoteIndex) -> None:
+    """Writes the index as flat arrays: each term's postings are a slice of positions / counts."""
+    index.unsaved = 0
+    terms = index.terms
+    offsets = np.concatenate([[0], np.cumsum([len(index.postings[t][0]) for t in terms], dtype=np.int64)])
+    positions = np.fromiter((p for t in terms for p in index.postings[t][0]), dtype=np.int64, count=offsets[-1])
+    # Each term's positions go up, so store the gaps between them: small numbers compress well
+    gaps = np.diff(positions, prepend=0)
+    gaps[offsets[:-1]] = positions[offsets[:-1]]
+    arrays = {
+        "format": np.array(INDEX_FORMAT),
+        "ids": np.array(index.ids, dtype=str),
+        "lengths": np.array(index.lengths, dtype=np.int64),
+        # One string: a fixed-width array would pad every term to the longest
+        "terms": np.array("\n".join(terms)),
+        "offsets": offsets,
+        "positions": _narrow(gaps),
+        "counts": _narrow(np.fromiter((c for t in terms for c in index.postings[t][1]), dtype=np.int64, count=offsets[-1])),
+        "version": np.array(json.dumps(index.version)),
+    }
+    os.makedirs(os.path.dirname(index_path()), exist_ok=True)
+    atomic_write(index_path(), lambda f: np.savez_compressed(f, **arrays), binary=True)
+
+def _load() -> Optional[NoteIndex]:
+    try:
+        with np.load(index_path(), allow_pickle=False) as saved:
+            if int(saved["format"]) != INDEX_FORMAT:
+                return None
+            index = NoteIndex()
+            index.ids = saved["ids"].tolist()
+            index.lengths = saved["lengths"].tolist()
+            terms = str(saved["terms"])
+            index.terms = terms.split("\n") if terms else []
+            offsets = saved["offsets"]
+            gaps = saved["positions"].astype(np.int64)
+            counts = saved["counts"].tolist()
+            index.version = _tuples(json.loads(str(saved["version"])))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None # Missing, unreadable or an older layout: rebuilt from the notes
+    # Undo the gaps: a running total that restarts at each term's first posting
+    total = np.cumsum(gaps)
+    starts = offsets[:-1]
+    positions = (total - np.repeat(total[starts] - gaps[starts], np.diff(offsets))).tolist()
+    offsets = offsets.tolist()
+    for i, term in enumerate(index.terms):
+        index.postings[term] = (positions[offsets[i]:offsets[i + 1]], counts[offsets[i]:offsets[i + 1]])
+    index.unsaved = 0
+    return index
+
+def rebuild_index() -> int:
+    """Indexes every note from scratch and saves the index. Returns the number of notes."""
+    global _index
+    with _lock:
+        index = NoteIndex()
+        df = _notes()
+        for note_id, title, tags, content in zip(df["id"], df["title"], df["tags"], df["content"]):
+            index.add(note_id, title, tags, content)
+        index.version = table_version(KNOWLEDGE_NOTES_FILE)
+        _save(index)
+        _index = index
+        return len(index.ids)
+
+def get_index() -> NoteIndex:
+    """The index, caught up with notes added since it was built or saved."""
+    global _index
+    with _lock:
+        if _index is None:
+            _index = _load() or NoteIndex()
+        version = table_version(KNOWLEDGE_NOTES_FILE)
+        if _index.version == version:
+            return _index
+        df = _notes()
+        ids = df["id"].astype(str).tolist()
+        if ids[:len(_index.ids)] != _index.ids:
+            rebuild_index() # Not just appended to - start over
+            return _index
+        tail = df.iloc[len(_index.ids):]
+        for note_id, title, tags, content in zip(tail["id"], tail["title"], tail["tags"], tail["content"]):
+            _index.add(note_id, title, tags, content)
+        _index.version = version
+        if _index.unsaved >= SAVE_EVERY:
+            _save(_index)
+        return _index
+
+def index_note(note_id: str, title: str, tags: str, content: str, previous_version) -> None:
+    """Adds a just-saved note (the last row of the notes table) to the index.
+
+    previous_version is the notes table_version() from before the save.
+    """
+    with _lock:
+        if _index is None:
+            return # Loaded and caught up on the next search
+        if _index.version != previous_version:
+            return # Other changes since the index last saw the table; the next search catches up
+        _index.add(note_id, title, tags, content)
+        _index.version = table_version(KNOWLEDGE_NOTES_FILE)
+        if _index.unsaved >= SAVE_EVERY:
+            _save(_index)
+
+def search_notes(query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+    """(row position in the notes table, BM25 score) of notes matching query, best first."""
+    return get_index().search(query, limit)
+
+if __name__ == "__main__":
+    print(f"Indexed {rebuild_index()} notes into {index_path()}.")
@@ -1,6 +1,8 @@
 from datetime import datetime
 from src.finance.manager import add_transaction
+from src.finance.classifier import classify
 from src.gym.workouts import log_set
+from src.gym.library import resolve_exercise
 from src.knowledge.notes import add_note
 from src.core.planner import create_or_update_plan, get_daily_plan
 
@@ -30,45 +32,44 @@ def parse_and_execute(command: str) -> str:
                 except:
                     return "Invalid amount."
                 if len(parts) > 2:
-                    desc_check = parts[2].lower()
-                    # Simple heuristic for category mapping
-                    if desc_check in ["food", "lunch", "dinner", "burger", "coffee"]: cat = "Food"
-                    elif desc_check in ["uber", "taxi", "bus", "gas"]: cat = "Transport"
-                    elif desc_check in ["gym", "protein"]: cat = "Health" # Need to ensure cat exists
-                    
                     desc = " ".join(parts[2:])
+                    # Guessed from past transactions with similar descriptions
+                    cat = classify(desc, "Expense")
         elif cmd.isdigit():
              amount = float(cmd)
              if len(parts) > 1:
                  desc = " ".join(parts[1:])
-                 desc_check = parts[1].lower()
-                 if desc_check in ["food", "lunch", "dinner"]: cat = "Food"
+                 cat = classify(desc, "Expense")
                  
         add_transaction(datetime.now().strftime("%Y-%m-%d"), amount, "Expense", cat, desc)
         return f"💸 Logged ${amount} to {cat} ({desc})"
 
     # Gym Mode: "gym squat 100 5"
     elif cmd == "gym":
-        if len(parts) < 4:
+        # The exercise is every word before the first number: "gym bench press 60 8"
+        args = [p for p in parts[1:] if p]
+        first_number = next((i for i, a in enumerate(args) if a.replace(".", "", 1).isdigit()), len(args))
+        if first_number == 0 or len(args) - first_number < 2:
             return "Usage: gym [exercise] [weight] [reps] (e.g. gym squat 100 5)"
         
-        ex_name = parts[1] # fuzzy match needed? For now exact or simple
+        typed = " ".join(args[:first_number])
         try:
-            weight = float(parts[2])
-            reps = int(parts[3])
+            weight = float(args[first_number])
+            reps = int(args[first_number + 1])
         except:
             return "Invalid numbers. Usage: gym [ex] [weight] [reps]"
             
         rpe = 8 # Default
-        if len(parts) > 4:
-            rpe = int(parts[4])
+        if len(args) > first_number + 2:
+            rpe = int(args[first_number + 2])
             
-        # We need to ensure exercise exists or use closest match
-        # For prototype, we pass raw name. The underlying log_set might handle it or we should verify.
-        # Let's assume user knows exact name or we add simple correction.
+        # Library name for shorthand/typos ("bench", "sqaut"); unknown names are logged as typed
+        resolved = resolve_exercise(typed)
+        ex_name = resolved or typed
         
-        log_set(datetime.now().strftime("%Y-%m-%d"), ex_name, weight, reps, rpe)
-        return f"🏋️ Logged {ex_name}: {weight}kg x {reps}"
+        set_no = log_set(datetime.now().strftime("%Y-%m-%d"), ex_name, weight, reps, rpe)
+        note = "" if resolved else " - not in your library"
+        return f"🏋️ Logged {ex_name}: {weight}kg x {reps} (set {set_no}){note}"
         
     # Note Mode: "note buy milk"
     elif cmd == "note":
@@ -1,5 +1,5 @@
 from config import SYSTEMS_REVIEWS_FILE, SYSTEMS_OKRS_FILE, DAILY_EXECUTION_FILE, GYM_LOGS_FILE
-from src.data.crud import save_record, get_all_records, update_record
+from src.data.crud import save_record, get_all_records, update_record, read_range
 import pandas as pd
 from typing import List, Dict, Tuple
 from datetime import datetime, timedelta
@@ -11,24 +11,20 @@ def get_weekly_review_data() -> Dict:
     start_date = end_date - timedelta(days=7)
     
     # Execution Stats
-    exec_recs = get_all_records(DAILY_EXECUTION_FILE)
+    # Days after start_date up to today, like comparing midnight dates against start_date's time
+    week_df = read_range(DAILY_EXECUTION_FILE, (start_date + timedelta(days=1)).strftime("%Y-%m-%d"),
+                         end_date.strftime("%Y-%m-%d"), columns=["study_hours_actual", "gym_done", "mood_score"])
     study_hours = 0
     gym_count = 0
     avg_mood = 0
     mood_count = 0
     
-    if exec_recs:
-        df = pd.DataFrame(exec_recs)
-        df["date"] = pd.to_datetime(df["date"])
-        mask = (df["date"] >= start_date) & (df["date"] <= end_date)
-        week_df = df[mask]
-        
-        if not week_df.empty:
-            study_hours = week_df["study_hours_actual"].sum()
-            # gym_done stored as bool in csv, need to ensure correct parsing
-            # Assuming 'True'/'False' strings or booleans
-            gym_count = week_df["gym_done"].apply(lambda x: 1 if str(x).lower() == 'true' else 0).sum()
-            avg_mood = week_df["mood_score"].mean()
+    if not week_df.empty:
+        # Typed columns (see src/data/schema.py)
+        study_hours = float(week_df["study_hours_actual"].sum())
+        gym_count = week_df["gym_done"].sum()
+        mood = week_df["mood_score"].mean()
+        avg_mood = 0 if pd.isna(mood) else float(mood)
             
     return {
         "study_hours": round(study_hours, 1),
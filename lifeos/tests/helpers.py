@@ -0,0 +1,71 @@
+"""Shared setup for tests that point the app's modules at a scratch data dir.
+
+Every module imports its table paths from config at import time, so a test
+has to patch the path in each module that uses it, along with any
+module-level cache built from those tables. The lists below keep that in
+one place per area, so a new module only needs adding here.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.data import crud
+
+def use_data_dir(test: TestCase, data_dir: Path) -> None:
+    """Creates data_dir for one test and removes it once the test is done."""
+    os.makedirs(data_dir, exist_ok=True)
+    test.addCleanup(shutil.rmtree, data_dir, ignore_errors=True)
+
+def start_patches(test: TestCase, targets: Dict[str, Any]) -> None:
+    """Patches each "module.NAME" to its value until the test is done."""
+    for target, value in targets.items():
+        patcher = patch(target, value)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+def finance_tables(data_dir: Path) -> Dict[str, Any]:
+    transactions = data_dir / "finance_transactions.csv"
+    rollups = data_dir / "finance_monthly_rollups.csv"
+    crud.declare_key_column(rollups, "key")
+    return {
+        "src.finance.manager.FINANCE_TRANSACTIONS_FILE": transactions,
+        "src.finance.budgets.FINANCE_BUDGETS_FILE": data_dir / "finance_budgets.csv",
+        "src.finance.rollups.FINANCE_TRANSACTIONS_FILE": transactions,
+        "src.finance.rollups.FINANCE_ROLLUPS_FILE": rollups,
+        "src.finance.importer.FINANCE_TRANSACTIONS_FILE": transactions,
+        "src.finance.classifier.FINANCE_TRANSACTIONS_FILE": transactions,
+        "src.finance.classifier._index": None,
+        "src.finance.cashflow.FINANCE_TRANSACTIONS_FILE": transactions,
+    }
+
+def gym_tables(data_dir: Path) -> Dict[str, Any]:
+    logs = data_dir / "gym_logs.csv"
+    prs = data_dir / "gym_personal_records.csv"
+    exercises = data_dir / "exercises.csv"
+    crud.declare_key_column(prs, "key")
+    return {
+        "src.gym.workouts.GYM_LOGS_FILE": logs,
+        "src.gym.workouts._index": None,
+        "src.gym.records.GYM_LOGS_FILE": logs,
+        "src.gym.records.GYM_PRS_FILE": prs,
+        "src.gym.analytics.GYM_LOGS_FILE": logs,
+        "src.gym.analytics.EXERCISES_FILE": exercises,
+        "src.gym.library.EXERCISES_FILE": exercises,
+        "src.gym.sessions.GYM_LOGS_FILE": logs,
+        "src.gym.sessions.GYM_SESSIONS_FILE": data_dir / "gym_sessions.json",
+        "src.gym.sessions._sessions": {},
+        "src.gym.sessions._loaded": False,
+    }
+
+def knowledge_tables(data_dir: Path) -> Dict[str, Any]:
+    notes = data_dir / "knowledge_notes.csv"
+    return {
+        "src.knowledge.notes.KNOWLEDGE_NOTES_FILE": notes,
+        "src.knowledge.search.KNOWLEDGE_NOTES_FILE": notes,
+        "src.knowledge.search._index": None,
+        "src.knowledge.review.KNOWLEDGE_NOTES_FILE": notes,
+        "src.knowledge.review._queue": None,
+    }
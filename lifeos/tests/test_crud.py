@@ -0,0 +1,503 @@
+import unittest
+import sys
+import os
+import shutil
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.getcwd())
+
+from src.data import crud
+from src.data.cache import frame_bytes
+from src.data.csv_store import CSVBackend, _parse_csv
+from src.data.sqlite_store import SQLiteBackend
+from src.data.migrate import migrate_csv_to_sqlite
+from src.data.parquet_store import ParquetBackend
+from src.data.partitioned_store import PartitionedCSVBackend
+
+TEST_DATA_DIR = Path("tests/temp_crud")
+
+class TestCrud(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self.path = TEST_DATA_DIR / "records.csv"
+
+    def tearDown(self):
+        if os.path.exists(TEST_DATA_DIR):
+            shutil.rmtree(TEST_DATA_DIR)
+
+    def test_save_record_appends_rows(self):
+        crud.save_record(self.path, {"date": "2024-01-01", "amount": 10.0})
+        crud.save_record(self.path, {"date": "2024-01-02", "amount": 12.5})
+
+        records = crud.get_all_records(self.path)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1]["amount"], 12.5)
+        for r in records:
+            self.assertTrue(r["id"])
+            self.assertTrue(r["created_at"])
+            self.assertTrue(r["updated_at"])
+
+        # Second insert fit the header, so it must not have been rewritten
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "date,amount,id,created_at,updated_at")
+        self.assertEqual(len(lines), 3)
+
+    def test_save_record_missing_and_new_columns(self):
+        crud.save_record(self.path, {"date": "2024-01-01", "note": "a"})
+        crud.save_record(self.path, {"date": "2024-01-02"})
+        crud.save_record(self.path, {"date": "2024-01-03", "extra": 1})
+
+        df = crud.read_csv(self.path)
+        self.assertEqual(len(df), 3)
+        self.assertIn("extra", df.columns)
+        self.assertTrue(df["note"].isna().iloc[1])
+        self.assertEqual(df["extra"].iloc[2], 1)
+
+    def test_save_record_on_empty_file(self):
+        self.path.touch()
+        crud.save_record(self.path, {"name": "Food"})
+        self.assertEqual(crud.get_record(self.path, "name", "Food")["name"], "Food")
+
+    def test_table_cache_hits_and_invalidation(self):
+        crud.save_record(self.path, {"name": "Food"})
+        crud.get_all_records(self.path)
+        before = crud.get_cache_stats()
+        crud.get_record(self.path, "name", "Food")
+        crud.get_all_records(self.path)
+        after = crud.get_cache_stats()
+        self.assertEqual(after["hits"] - before["hits"], 2)
+        self.assertEqual(after["misses"], before["misses"])
+
+        # Writes through crud are visible immediately
+        crud.save_record(self.path, {"name": "Rent"})
+        self.assertEqual(len(crud.get_all_records(self.path)), 2)
+
+        # So are edits made outside the app
+        with open(self.path, "a") as f:
+            f.write("Fun,x,2024-01-01,2024-01-01\n")
+        self.assertEqual(len(crud.get_all_records(self.path)), 3)
+
+    def test_cache_stats_cover_routed_tables(self):
+        routed = TEST_DATA_DIR / "routed.csv"
+        with patch.dict(crud.TABLE_BACKENDS, {"routed.csv": "csv"}), patch.dict(crud._named_backends, clear=True):
+            crud.save_record(routed, {"name": "Food"})
+            crud.get_all_records(routed)
+            before = crud.get_cache_stats()["hits"]
+            crud.get_all_records(routed)
+            self.assertEqual(crud.get_cache_stats()["hits"] - before, 1)
+            crud.clear_cache()
+            self.assertEqual(crud._named_backends["csv"].cache_stats()["tables"], 0)
+
+    def test_cached_appends_join_on_next_full_read(self):
+        for day in range(1, 4):
+            crud.save_record(self.path, {"date": f"2024-01-0{day}", "mood_score": day})
+        crud.read_range(self.path, "2024-01-01", "2024-01-31")
+        crud.get_record(self.path, "date", "2024-01-01")
+        with patch("src.data.cache.concat_frames") as join:
+            crud.save_record(self.path, {"date": "2024-01-05", "mood_score": 5})
+            crud.save_record(self.path, {"date": "2024-01-04", "mood_score": 4})
+            self.assertEqual(crud.get_record(self.path, "date", "2024-01-04")["mood_score"], 4)
+            join.assert_not_called()
+        # The date order picks up the new rows too
+        self.assertEqual(crud.read_range(self.path, "2024-01-02", "2024-01-04")["mood_score"].tolist(), [2, 3, 4])
+        self.assertEqual(len(crud.read_csv(self.path)), 5)
+
+        file_path = crud.flatten_path(self.path)
+        with patch("src.data.cache.PENDING_ROWS_MAX", 2):
+            crud.save_record(self.path, {"date": "2024-01-06", "mood_score": 6})
+            self.assertEqual(crud.get_backend(file_path)._cache.peek(file_path).pending_rows, 1)
+            crud.save_record(self.path, {"date": "2024-01-07", "mood_score": 7})
+            self.assertEqual(crud.get_backend(file_path)._cache.peek(file_path).pending_rows, 0)
+        self.assertEqual(crud.get_record(self.path, "date", "2024-01-07")["mood_score"], 7)
+
+    def test_cache_size_tracks_writes(self):
+        backend = CSVBackend()
+        path = str(self.path)
+        backend.insert(path, [{"id": "a", "name": "Food"}])
+        backend.read(path)
+        with patch("src.data.cache.frame_bytes", wraps=frame_bytes) as measure:
+            backend.insert(path, [{"id": "b", "name": "Rent and utilities"}])
+            backend.update(path, "a", {"name": "Groceries"})
+        # Only the new and changed rows were measured, not the whole table
+        self.assertEqual([len(c.args[0]) for c in measure.call_args_list], [1, 1, 1])
+        self.assertEqual(backend.cache_stats()["bytes"], frame_bytes(backend.read(path)))
+
+    def test_read_csv_returns_private_copy(self):
+        crud.save_record(self.path, {"name": "Food"})
+        df = crud.read_csv(self.path)
+        df.loc[0, "name"] = "Changed"
+        self.assertEqual(crud.get_all_records(self.path)[0]["name"], "Food")
+
+    def test_indexed_lookups_follow_writes(self):
+        for day in range(1, 6):
+            crud.save_record(self.path, {"date": f"2024-01-0{day}", "mood_score": day})
+        # Build the indexes, then keep writing through the cache
+        first = crud.get_record(self.path, "date", "2024-01-01")
+        self.assertEqual(first["mood_score"], 1)
+        crud.save_record(self.path, {"date": "2024-01-06", "mood_score": 6})
+        self.assertEqual(crud.get_record(self.path, "date", "2024-01-06")["mood_score"], 6)
+
+        rec = crud.get_record(self.path, "date", "2024-01-03")
+        self.assertTrue(crud.update_record(self.path, rec["id"], {"date": "2024-02-03"}))
+        self.assertIsNone(crud.get_record(self.path, "date", "2024-01-03"))
+        self.assertEqual(crud.get_record(self.path, "id", rec["id"])["date"], "2024-02-03")
+        self.assertFalse(crud.update_record(self.path, "missing", {"mood_score": 1}))
+
+        # Non-key columns still work, by scanning
+        self.assertEqual(crud.get_record(self.path, "mood_score", 4)["date"], "2024-01-04")
+
+        # And the cached view matches a fresh parse of the file
+        crud.clear_cache()
+        self.assertEqual(crud.get_record(self.path, "date", "2024-01-06")["mood_score"], 6)
+        self.assertEqual(crud.get_record(self.path, "id", rec["id"])["date"], "2024-02-03")
+
+    def test_get_rows_compact_records(self):
+        crud.save_record(self.path, {"date": "2024-01-01", "amount": 10.0})
+        crud.save_record(self.path, {"date": "2024-01-02", "amount": 12.5})
+
+        rows = crud.get_rows(self.path)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(crud.count_records(self.path), 2)
+        self.assertEqual(rows[1].amount, 12.5)
+        self.assertEqual(rows[1]["amount"], 12.5)
+        self.assertIsNone(rows[0].get("missing"))
+        self.assertFalse(hasattr(rows[0], "__dict__"))
+        self.assertEqual([r.to_dict() for r in rows], crud.get_all_records(self.path))
+
+        # Columns that can't be attributes come back as dicts, names intact
+        for column in ("my col", "self", "_defaults", "class", "get"):
+            odd = TEST_DATA_DIR / "odd.csv"
+            pd.DataFrame({"date": ["2024-01-01"], column: [1]}).to_csv(odd, index=False)
+            row = crud.get_rows(odd)[0]
+            self.assertEqual((row.get(column), row["date"]), (1, "2024-01-01"), column)
+            odd.unlink()
+
+    def test_count_records_without_parsing(self):
+        crud.save_records(self.path, [{"date": "2024-01-01", "note": "two\nlines"}, {"date": "2024-01-02", "note": ""}])
+        crud.clear_cache()
+        with patch("src.data.csv_store._parse_csv") as parse:
+            self.assertEqual(crud.count_records(self.path), 2)
+            parse.assert_not_called()
+        with open(self.path, "a") as f:
+            f.write("2024-01-03,,x,y,z\n")
+        self.assertEqual(crud.count_records(self.path), 3)
+        self.assertEqual(crud.count_records(TEST_DATA_DIR / "missing.csv"), 0)
+
+    def test_iter_records_streams_filtered_chunks(self):
+        crud.save_records(self.path, [{"date": f"2024-01-{d:02d}", "kind": "a" if d % 2 else "b", "amount": d}
+                                      for d in range(1, 11)])
+        for cached in (False, True):
+            if not cached:
+                crud.clear_cache()
+            chunks = list(crud.iter_records(self.path, columns=["amount"], where={"kind": "a"}, chunksize=3))
+            self.assertTrue(all(list(c.columns) == ["amount"] for c in chunks))
+            self.assertEqual(sum(c["amount"].sum() for c in chunks), 1 + 3 + 5 + 7 + 9)
+            crud.read_csv(self.path)
+
+        late = crud.iter_records(self.path, where=lambda c: c["date"] >= "2024-01-09", chunksize=4)
+        self.assertEqual([len(c) for c in late], [2])
+
+class TestSchema(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+
+    def tearDown(self):
+        if os.path.exists(TEST_DATA_DIR):
+            shutil.rmtree(TEST_DATA_DIR)
+
+    def test_registered_tables_are_typed_at_parse_time(self):
+        path = TEST_DATA_DIR / "daily_execution.csv"
+        crud.save_record(path, {"date": "2024-01-01", "gym_done": True, "mood_score": 8, "study_hours_actual": 2.5})
+        crud.save_record(path, {"date": "2024-01-02", "gym_done": "false", "mood_score": None, "study_hours_actual": 2.3})
+        crud.clear_cache()
+
+        df = crud.read_csv(path)
+        self.assertEqual(str(df["gym_done"].dtype), "boolean")
+        self.assertEqual(str(df["mood_score"].dtype), "Int8")
+        self.assertEqual(str(df["study_hours_actual"].dtype), "float64")
+        self.assertEqual(df["study_hours_actual"].tolist(), [2.5, 2.3]) # Read back exactly as entered
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["created_at"]))
+        self.assertEqual(df["gym_done"].tolist(), [True, False])
+        self.assertEqual(int(df["gym_done"].sum()), 1)
+        self.assertIs(crud.get_record(path, "date", "2024-01-01")["gym_done"], True)
+
+        # Rewrites keep ISO timestamps
+        rec = crud.get_record(path, "date", "2024-01-02")
+        crud.update_record(path, rec["id"], {"mood_score": 7, "notes": "ok"})
+        with open(path) as f:
+            header, first = f.read().splitlines()[:2]
+        self.assertIn("T", first.split(",")[header.split(",").index("updated_at")])
+
+    def test_categories_survive_appends_and_updates(self):
+        path = TEST_DATA_DIR / "gym_logs.csv"
+        crud.save_record(path, {"date": "2024-01-01", "exercise_name": "Squat", "reps": 5})
+        crud.read_csv(path)
+        crud.save_record(path, {"date": "2024-01-02", "exercise_name": "Deadlift", "reps": 3})
+        df = crud.read_csv(path)
+        self.assertIsInstance(df["exercise_name"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["exercise_name"].tolist(), ["Squat", "Deadlift"])
+
+        crud.update_record(path, df["id"][0], {"exercise_name": "Front Squat", "reps": 200})
+        df = crud.read_csv(path)
+        self.assertEqual(df["exercise_name"][0], "Front Squat")
+        self.assertEqual(df["reps"][0], 200)
+
+class TestConcurrentWrites(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self.path = TEST_DATA_DIR / "gym_logs.csv"
+
+    def tearDown(self):
+        if os.path.exists(TEST_DATA_DIR):
+            shutil.rmtree(TEST_DATA_DIR)
+
+    def test_sessions_do_not_lose_rows(self):
+        crud.save_record(self.path, {"date": "2024-01-01", "reps": 0})
+        target = crud.get_record(self.path, "date", "2024-01-01")["id"]
+
+        def session(n):
+            # Separate backends stand in for separate processes with their own caches
+            backend = CSVBackend()
+            for i in range(10):
+                # A new column each time forces the read-modify-rewrite path
+                backend.insert(str(self.path), [{"date": f"s{n}-{i}", f"col{n}_{i}": i, "id": f"{n}-{i}"}])
+                backend.update(str(self.path), target, {f"seen{n}_{i}": 1})
+
+        threads = [threading.Thread(target=session, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        crud.clear_cache()
+        df = crud.read_csv(self.path)
+        self.assertEqual(len(df), 41)
+        row = df[df["id"] == target].iloc[0]
+        self.assertEqual(sum(row[f"seen{n}_{i}"] for n in range(4) for i in range(10)), 40)
+        self.assertFalse([f for f in os.listdir(TEST_DATA_DIR) if f.endswith(".tmp")])
+
+class TestBatchWrites(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self.path = TEST_DATA_DIR / "finance_categories.csv"
+        self.other = TEST_DATA_DIR / "finance_budgets.csv"
+
+    def tearDown(self):
+        if os.path.exists(TEST_DATA_DIR):
+            shutil.rmtree(TEST_DATA_DIR)
+
+    def test_save_records_writes_once(self):
+        crud.save_records(self.path, [{"name": "Food"}, {"name": "Rent"}, {"name": "Fun"}])
+        records = crud.get_all_records(self.path)
+        self.assertEqual([r["name"] for r in records], ["Food", "Rent", "Fun"])
+        self.assertEqual(len({r["id"] for r in records}), 3)
+
+    def test_batch_flushes_on_exit(self):
+        crud.save_record(self.other, {"category": "Food", "monthly_limit": 100})
+        food = crud.get_record(self.other, "category", "Food")
+
+        with crud.batch():
+            crud.save_record(self.path, {"name": "Food"})
+            crud.save_record(self.path, {"name": "Rent"})
+            rent = crud.get_all_records(self.path)
+            self.assertEqual(rent, []) # not written yet
+            self.assertTrue(crud.update_record(self.other, food["id"], {"monthly_limit": 200}))
+            self.assertFalse(crud.update_record(self.other, "missing", {"monthly_limit": 1}))
+            with crud.batch():
+                crud.save_record(self.path, {"name": "Fun"})
+
+        self.assertEqual([r["name"] for r in crud.get_all_records(self.path)], ["Food", "Rent", "Fun"])
+        self.assertEqual(crud.get_record(self.other, "id", food["id"])["monthly_limit"], 200)
+
+    def test_batch_discards_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with crud.batch():
+                crud.save_record(self.path, {"name": "Food"})
+                raise RuntimeError("boom")
+        self.assertEqual(crud.get_all_records(self.path), [])
+        crud.save_record(self.path, {"name": "Rent"})
+        self.assertEqual(len(crud.get_all_records(self.path)), 1)
+
+class TestSQLiteBackend(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self.path = TEST_DATA_DIR / "daily_execution.csv"
+        self.backend = SQLiteBackend()
+        crud.set_backend(self.backend)
+
+    def tearDown(self):
+        self.backend.close()
+        crud.set_backend(CSVBackend())
+        if os.path.exists(TEST_DATA_DIR):
+            shutil.rmtree(TEST_DATA_DIR)
+
+    def test_crud_round_trip(self):
+        crud.save_record(self.path, {"date": "2024-01-01", "gym_done": True, "study_hours_actual": 2.5})
+        crud.save_record(self.path, {"date": "2024-01-02", "gym_done": False, "mood_score": 7})
+
+        self.assertTrue((TEST_DATA_DIR / "lifeos.db").exists())
+        self.assertFalse(self.path.exists())
+
+        rec = crud.get_record(self.path, "date", "2024-01-02")
+        self.assertEqual(rec["mood_score"], 7)
+        self.assertEqual(str(rec["gym_done"]).lower(), "false")
+        self.assertEqual(crud.get_record(self.path, "mood_score", "7")["date"], "2024-01-02")
+        self.assertIsNone(crud.get_record(self.path, "date", "2030-01-01"))
+
+        self.assertTrue(crud.update_record(self.path, rec["id"], {"notes": "rest day"}))
+        self.assertFalse(crud.update_record(self.path, "missing", {"notes": "x"}))
+
+        records = crud.get_all_records(self.path)
+        self.assertEqual([r["date"] for r in records], ["2024-01-01", "2024-01-02"])
+        self.assertEqual(records[1]["notes"], "rest day")
+        self.assertEqual(records[0]["study_hours_actual"], 2.5)
+        self.assertEqual(crud.count_records(self.path), 2)
+
+    def test_iter_records_chunks(self):
+        crud.save_records(self.path, [{"date": f"2024-01-{d:02d}", "mood_score": d} for d in range(1, 8)])
+        chunks = list(crud.iter_records(self.path, columns=["mood_score"], where={"date": ["2024-01-02", "2024-01-07"]}, chunksize=2))
+        self.assertEqual([c["mood_score"].tolist() for c in chunks], [[2], [7]])
+
+    def test_migrate_csv_directory(self):
+        crud.set_backend(CSVBackend())
+        crud.save_record(self.path, {"date": "2024-01-01", "mood_score": 8})
+        crud.save_record(TEST_DATA_DIR / "gym_logs.csv", {"date": "2024-01-01", "exercise_name": "Squat"})
+
+        # A parquet table's tail of recent writes isn't a table
+        (TEST_DATA_DIR / "gym_logs.tail.csv").write_text("date,exercise_name\n2024-01-02,Bench Press\n")
+
+        imported = migrate_csv_to_sqlite(TEST_DATA_DIR)
+        self.assertEqual(imported, {"daily_execution": 1, "gym_logs": 1})
+        # Running it again doesn't duplicate rows
+        self.assertEqual(migrate_csv_to_sqlite(TEST_DATA_DIR), {})
+
+        crud.set_backend(self.backend)
+        self.assertEqual(crud.get_record(self.path, "date", "2024-01-01")["mood_score"], 8)
+        self.assertEqual(len(crud.get_all_records(TEST_DATA_DIR / "gym_logs.csv")), 1)
+        # Timestamps keep their ISO form
+        conn = self.backend.connect(str(TEST_DATA_DIR / "lifeos.db"))
+        created = conn.execute("SELECT created_at FROM daily_execution").fetchone()[0]
+        self.assertRegex(created, r"^\d{4}-\d{2}-\d{2}T")
+
+class TestParquetBackend(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self.path = TEST_DATA_DIR / "gym_logs.csv"
+        self.backend = ParquetBackend(tail_max_rows=3)
+        crud.set_backend(self.backend)
+
+    def tearDown(self):
+        crud.set_backend(CSVBackend())
+        if os.path.exists(TEST_DATA_DIR):
+            shutil.rmtree(TEST_DATA_DIR)
+
+    def test_tail_updates_and_compaction(self):
+        for i in range(3):
+            crud.save_record(self.path, {"date": f"2024-01-0{i + 1}", "exercise_name": "Squat", "weight_kg": 100.0 + i})
+        self.assertTrue((TEST_DATA_DIR / "gym_logs.tail.csv").exists())
+        self.assertFalse((TEST_DATA_DIR / "gym_logs.parquet").exists())
+
+        first = crud.get_record(self.path, "date", "2024-01-01")
+        self.assertTrue(crud.update_record(self.path, first["id"], {"weight_kg": 90.0}))
+        # Fourth tail row triggers compaction
+        self.assertTrue((TEST_DATA_DIR / "gym_logs.parquet").exists())
+        self.assertFalse((TEST_DATA_DIR / "gym_logs.tail.csv").exists())
+
+        crud.save_record(self.path, {"date": "2024-01-04", "exercise_name": "Bench Press", "weight_kg": 60.0})
+        df = crud.read_csv(self.path)
+        self.assertEqual(df["weight_kg"].tolist(), [90.0, 101.0, 102.0, 60.0])
+
+        projected = crud.read_csv(self.path, columns=["exercise_name", "weight_kg"])
+        self.assertEqual(list(projected.columns), ["exercise_name", "weight_kg"])
+        self.assertEqual(len(projected), 4)
+
+    def test_seeds_snapshot_from_existing_csv(self):
+        crud.set_backend(CSVBackend())
+        crud.save_record(self.path, {"date": "2024-01-01", "exercise_name": "Squat"})
+        crud.set_backend(self.backend)
+
+        self.assertEqual(len(crud.get_all_records(self.path)), 1)
+        self.assertTrue((TEST_DATA_DIR / "gym_logs.parquet").exists())
+        crud.save_record(self.path, {"date": "2024-01-02", "exercise_name": "Squat"})
+        self.assertEqual(crud.get_record(self.path, "date", "2024-01-02")["exercise_name"], "Squat")
+
+class TestPartitionedBackend(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self.path = TEST_DATA_DIR / "finance_transactions.csv"
+        self.dir = TEST_DATA_DIR / "finance_transactions"
+
+    def tearDown(self):
+        crud.set_backend(CSVBackend())
+        if os.path.exists(TEST_DATA_DIR):
+            shutil.rmtree(TEST_DATA_DIR)
+
+    def test_splits_legacy_csv_and_prunes_ranges(self):
+        crud.save_records(self.path, [
+            {"date": "2024-01-31", "amount": 10.0, "category": "Food"},
+            {"date": "2024-02-01", "amount": 20.0, "category": "Rent"},
+        ])
+        crud.set_backend(PartitionedCSVBackend())
+
+        # First use splits the old single file by month
+        self.assertEqual(len(crud.get_all_records(self.path)), 2)
+        self.assertEqual(sorted(os.listdir(self.dir)), ["2024-01.csv", "2024-02.csv"])
+
+        crud.save_record(self.path, {"date": "2024-02-15", "amount": 5.0, "category": "Food"})
+        self.assertEqual(crud.count_records(self.path), 3)
+        with open(self.dir / "2024-01.csv") as f:
+            self.assertEqual(len(f.read().splitlines()), 2) # Untouched by the February append
+
+        feb = crud.read_range(self.path, "2024-02-01", "2024-02-31", columns=["amount"])
+        self.assertEqual(feb["amount"].tolist(), [20.0, 5.0])
+        self.assertEqual(str(crud.read_csv(self.path)["category"].dtype), "category")
+
+        # Rows by position only load the months they're in
+        crud.clear_cache()
+        with patch("src.data.csv_store._parse_csv", wraps=_parse_csv) as parse:
+            self.assertEqual(crud.take_rows(self.path, [2, 1])["amount"].tolist(), [5.0, 20.0])
+        self.assertEqual([Path(c.args[0]).name for c in parse.call_args_list], ["2024-02.csv"])
+        self.assertRaises(IndexError, crud.take_rows, self.path, [3])
+
+        rent = crud.get_record(self.path, "date", "2024-02-01")
+        self.assertTrue(crud.update_record(self.path, rent["id"], {"amount": 25.0}))
+        self.assertEqual(crud.get_record(self.path, "id", rent["id"])["amount"], 25.0)
+
+    def test_date_change_moves_row(self):
+        crud.set_backend(PartitionedCSVBackend())
+        crud.save_records(self.path, [
+            {"date": "2024-01-31", "amount": 10.0, "category": "Food"},
+            {"date": "2024-02-01", "amount": 20.0, "category": "Rent"},
+        ])
+        food = crud.get_record(self.path, "date", "2024-01-31")
+        self.assertTrue(crud.update_record(self.path, food["id"], {"date": "2024-03-02", "amount": 12.0}))
+
+        moved = crud.get_record(self.path, "date", "2024-03-02")
+        self.assertEqual((moved["id"], moved["amount"]), (food["id"], 12.0))
+        self.assertIsNone(crud.get_record(self.path, "date", "2024-01-31"))
+        self.assertEqual(crud.read_range(self.path, "2024-03-01", "2024-03-31")["category"].tolist(), ["Food"])
+        self.assertTrue(crud.read_range(self.path, "2024-01-01", "2024-01-31").empty)
+        self.assertEqual(len(crud.read_csv(self.path)), 2)
+        with open(self.dir / "2024-03.csv") as f:
+            self.assertIn("T", f.read().splitlines()[1].split(",")[-1]) # created_at still ISO
+
+        # Batched updates move rows too
+        with crud.batch():
+            crud.update_record(self.path, food["id"], {"date": "2024-02-10"})
+        self.assertEqual(crud.read_range(self.path, "2024-02-01", "2024-02-28")["amount"].tolist(), [20.0, 12.0])
+
+if __name__ == "__main__":
+    unittest.main()
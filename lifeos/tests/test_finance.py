@@ -0,0 +1,167 @@
+import unittest
+import sys
+import os
+from pathlib import Path
+from io import StringIO
+
+# Add project root to path
+sys.path.insert(0, os.getcwd())
+
+from tests.helpers import finance_tables, start_patches, use_data_dir
+from src.data import crud
+from src.finance import cashflow, classifier, importer, manager, rollups
+from src.systems.command_parser import parse_and_execute
+
+TEST_DATA_DIR = Path("tests/temp_finance")
+
+class TestFinance(unittest.TestCase):
+
+    def setUp(self):
+        self.transactions = TEST_DATA_DIR / "finance_transactions.csv"
+        self.rollups = TEST_DATA_DIR / "finance_monthly_rollups.csv"
+        use_data_dir(self, TEST_DATA_DIR)
+        start_patches(self, finance_tables(TEST_DATA_DIR))
+
+    def test_rollups_follow_transactions(self):
+        # History from before rollups existed is picked up by the first add
+        crud.save_record(self.transactions, {"date": "2023-12-24", "amount": 40.0, "type": "Expense", "category": "Fun"})
+        manager.add_transaction("2024-01-05", 1000.0, "Income", "Salary", "")
+        manager.add_transaction("2024-01-06", 30.0, "Expense", "Food", "lunch")
+        manager.add_transaction("2024-01-20", 20.5, "Expense", "Food", "dinner")
+        manager.add_transaction("2024-01-21", 300.0, "Expense", "Rent", "")
+
+        self.assertEqual(manager.get_monthly_summary("2024-01"), {"income": 1000.0, "expense": 350.5, "savings": 649.5})
+        self.assertEqual(manager.get_monthly_summary("2023-12")["expense"], 40.0)
+        breakdown = manager.get_category_breakdown("2024-01")
+        self.assertEqual(breakdown["category"].tolist(), ["Rent", "Food"])
+        self.assertEqual(breakdown["amount"].tolist(), [300.0, 50.5])
+
+        manager.set_budget("Food", 100.0, effective_from="2024-01")
+        status = manager.get_budget_status("2024-01")
+        self.assertEqual(status.loc[0, "spent"], 50.5)
+
+        # Rebuilding from scratch gives the same answers
+        self.assertEqual(rollups.rebuild_rollups(), 4)
+        self.assertEqual(manager.get_monthly_summary("2024-01")["expense"], 350.5)
+
+    def test_rollups_reads_dont_write_and_batches_count_once(self):
+        crud.save_record(self.transactions, {"date": "2023-12-24", "amount": 40.0, "type": "Expense", "category": "Fun"})
+        self.assertEqual(manager.get_monthly_summary("2023-12")["expense"], 40.0)
+        self.assertFalse(self.rollups.exists()) # Summed in memory, not built by a read
+
+        with crud.batch():
+            manager.add_transaction("2024-01-06", 30.0, "Expense", "Food", "lunch")
+            manager.add_transaction("2024-01-20", 20.5, "Expense", "Food", "dinner")
+        self.assertEqual(manager.get_monthly_summary("2024-01")["expense"], 50.5)
+        self.assertEqual(manager.get_monthly_summary("2023-12")["expense"], 40.0)
+        with crud.batch():
+            manager.add_transaction("2024-01-21", 10.0, "Expense", "Food", "")
+            manager.add_transaction("2024-01-22", 5.0, "Expense", "Fun", "")
+            manager.add_transaction("2024-01-23", 5.0, "Expense", "Fun", "")
+        self.assertEqual(manager.get_category_breakdown("2024-01")["amount"].tolist(), [60.5, 10.0])
+
+        # A discarded batch adds nothing, now or later
+        with self.assertRaises(RuntimeError):
+            with crud.batch():
+                manager.add_transaction("2024-01-24", 99.0, "Expense", "Food", "")
+                raise RuntimeError
+        manager.add_transaction("2024-01-25", 1.0, "Expense", "Food", "")
+        self.assertEqual(manager.get_monthly_summary("2024-01")["expense"], 71.5)
+        self.assertEqual(len(crud.read_csv(self.rollups)), 3)
+
+    def test_date_ranges_and_month_matrix(self):
+        manager.add_transaction("2024-03-02", 12.0, "Expense", "Food", "")
+        manager.add_transaction("2024-01-15", 8.0, "Expense", "Food", "")
+        manager.add_transaction("2024-01-31", 50.0, "Expense", "Fun", "")
+        manager.add_transaction("2024-02-01", 500.0, "Income", "Salary", "")
+
+        jan = manager.get_transactions("2024-01-01", "2024-01-31")
+        self.assertEqual(jan["amount"].tolist(), [8.0, 50.0])
+        self.assertEqual(len(manager.get_transactions(start="2024-02-01")), 2)
+
+        matrix = manager.get_month_category_matrix("2023-12", "2024-03")
+        self.assertEqual(list(matrix.index), ["2023-12", "2024-01", "2024-02", "2024-03"])
+        self.assertEqual(matrix.loc["2024-01"].to_dict(), {"Food": 8.0, "Fun": 50.0})
+        self.assertEqual(matrix["Food"].tolist(), [0.0, 8.0, 0.0, 12.0])
+
+    def test_budget_grid_keeps_limit_history(self):
+        manager.add_transaction("2024-01-10", 80.0, "Expense", "Food", "")
+        manager.add_transaction("2024-03-10", 150.0, "Expense", "Food", "")
+        manager.add_transaction("2024-03-11", 20.0, "Expense", "Fun", "")
+        manager.set_budget("Food", 100.0, effective_from="2024-01")
+        manager.set_budget("Food", 120.0, effective_from="2024-03")
+        manager.set_budget("Fun", 50.0, effective_from="2024-02")
+        manager.set_budget("Fun", 40.0, effective_from="2024-02") # Same month: replaces
+
+        grid = manager.get_budget_grid("2024-01", "2024-03")
+        self.assertEqual(list(zip(grid["month"], grid["category"])), [
+            ("2024-01", "Food"), ("2024-02", "Food"), ("2024-02", "Fun"), ("2024-03", "Food"), ("2024-03", "Fun"),
+        ])
+        self.assertEqual(grid["limit"].tolist(), [100.0, 100.0, 40.0, 120.0, 40.0])
+        self.assertEqual(grid["spent"].tolist(), [80.0, 0.0, 0.0, 150.0, 20.0])
+        self.assertEqual(grid["percent"].tolist(), [0.8, 0.0, 0.0, 1.0, 0.5])
+        self.assertEqual(manager.get_budget_status("2024-01")["remaining"].tolist(), [20.0])
+
+    def test_import_statement_skips_duplicates(self):
+        manager.add_transaction("2024-01-02", 4.5, "Expense", "Food", "Coffee Shop")
+        statement = (
+            "Transaction Date,Details,Amount\n"
+            "2024-01-02,COFFEE SHOP,-4.50\n"   # already logged by hand
+            "2024-01-02,Coffee Shop,-4.50\n"   # a second coffee that day
+            "2024-01-03,Payroll,\"2,000.00\"\n"
+            "not a date,Junk,-1\n"
+        )
+        res = importer.import_statement(StringIO(statement), chunksize=2)
+        self.assertEqual(res, {"read": 4, "imported": 2, "duplicates": 1, "skipped": 1})
+        self.assertEqual(manager.get_monthly_summary("2024-01"), {"income": 2000.0, "expense": 9.0, "savings": 1991.0})
+
+        # Importing the same statement again adds nothing
+        res = importer.import_statement(StringIO(statement))
+        self.assertEqual((res["imported"], res["duplicates"]), (0, 3))
+
+        debit_credit = "Date,Description,Debit,Credit\n2024-02-01,Rent,800,\n2024-02-02,Refund,,20\n"
+        importer.import_statement(StringIO(debit_credit))
+        self.assertEqual(manager.get_monthly_summary("2024-02"), {"income": 20.0, "expense": 800.0, "savings": -780.0})
+
+    def test_classifier_learns_from_history(self):
+        # Seed keywords before there's any history
+        self.assertEqual(classifier.classify("Uber to airport", "Expense"), "Transport")
+        self.assertEqual(classifier.classify("something new", "Expense"), "Other")
+
+        manager.add_transaction("2024-01-02", 60.0, "Expense", "Fun", "Climbing wall pass")
+        manager.add_transaction("2024-01-03", 25.0, "Expense", "Subscriptions", "Protein powder")
+        self.assertEqual(classifier.classify("climbing", "Expense"), "Fun")
+        self.assertEqual(classifier.classify("CLIMB centre", "Expense"), "Fun") # Prefix of "climbing"
+        self.assertEqual(classifier.classify("payroll", "Expense"), "Other") # Salary is income-only
+
+        self.assertIn("to Subscriptions", parse_and_execute("$ 30 protein bars"))
+        self.assertIn("to Food", parse_and_execute("12 lunch with Sam"))
+
+        # Rows imported in bulk are picked up too
+        importer.import_statement(StringIO("Date,Description,Amount,Category\n2024-01-05,Vet visit,-80,Pets\n"))
+        res = importer.import_statement(StringIO("Date,Description,Amount\n2024-01-09,VET CLINIC,-45\n"))
+        self.assertEqual(res["imported"], 1)
+        self.assertEqual(manager.get_category_breakdown("2024-01").set_index("category")["amount"]["Pets"], 125.0)
+
+    def test_cashflow_series(self):
+        manager.add_transaction("2024-01-01", 1000.0, "Income", "Salary", "")
+        manager.add_transaction("2024-01-10", 100.0, "Expense", "Food", "")
+        manager.add_transaction("2024-03-05", 300.0, "Expense", "Rent", "")
+
+        monthly = cashflow.get_cashflow("M", window=2)
+        self.assertEqual([d.strftime("%Y-%m") for d in monthly.index], ["2024-01", "2024-02", "2024-03"])
+        self.assertEqual(monthly["net"].tolist(), [900.0, 0.0, -300.0])
+        self.assertEqual(monthly["net_avg"].tolist(), [900.0, 450.0, -150.0])
+        self.assertEqual(monthly["balance"].tolist(), [900.0, 900.0, 600.0])
+
+        # Trimming keeps the balance carried in from earlier
+        self.assertEqual(cashflow.get_cashflow("M", start="2024-03-20")["balance"].tolist(), [600.0])
+        weekly = cashflow.get_cashflow("W", end="2024-01-14")
+        self.assertEqual([str(d.date()) for d in weekly.index], ["2024-01-01", "2024-01-08"])
+
+        # The cache notices new transactions
+        manager.add_transaction("2024-03-06", 50.0, "Income", "Freelance", "")
+        self.assertEqual(cashflow.get_cashflow("M")["balance"].iloc[-1], 650.0)
+
+if __name__ == "__main__":
+    unittest.main()
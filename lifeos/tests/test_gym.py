@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.getcwd())
+
+from tests.helpers import gym_tables, start_patches, use_data_dir
+from src.data import crud
+from src.gym import analytics, library, records, sessions, workouts
+from src.systems.command_parser import parse_and_execute
+
+TEST_DATA_DIR = Path("tests/temp_gym")
+
+class TestGym(unittest.TestCase):
+
+    def setUp(self):
+        self.logs = TEST_DATA_DIR / "gym_logs.csv"
+        self.prs = TEST_DATA_DIR / "gym_personal_records.csv"
+        use_data_dir(self, TEST_DATA_DIR)
+        start_patches(self, gym_tables(TEST_DATA_DIR))
+
+    def test_history_index_follows_log(self):
+        workouts.log_set("2024-01-08", "Squat", 100.0, 5, 8)
+        workouts.log_set("2024-01-08", "Bench Press", 60.0, 8, 8)
+        workouts.log_set("2024-01-01", "Squat", 90.0, 5, 8) # Back-filled earlier session
+        workouts.log_set("2024-01-08", "Squat", 105.0, 3, 9)
+
+        hist = workouts.get_exercise_history("Squat")
+        self.assertEqual(hist["weight_kg"].tolist(), [105.0, 100.0, 90.0])
+        self.assertEqual(workouts.get_last_session_stats("Squat"), {"date": "2024-01-08", "weight": 105.0, "reps": 3})
+        self.assertTrue(workouts.get_exercise_history("Deadlift").empty)
+        self.assertEqual(analytics.check_progressive_overload("Bench Press", 62.5, 5), "🏆 All-time Weight PR!")
+
+        # Rows written behind the index's back are picked up too
+        crud.save_record(self.logs, {"date": "2024-01-15", "exercise_name": "Squat", "weight_kg": 110.0, "reps": 1})
+        self.assertEqual(workouts.get_last_session_stats("Squat")["weight"], 110.0)
+
+    def test_personal_records(self):
+        self.assertAlmostEqual(records.estimate_1rm(100.0, 10), 133.33, places=2)
+        self.assertAlmostEqual(records.estimate_1rm(100.0, 10, "brzycki"), 133.33, places=2)
+        self.assertEqual(records.estimate_1rm(140.0, 1), 140.0)
+
+        # History from before the PR table is picked up by the first set
+        crud.save_record(self.logs, {"date": "2024-01-01", "exercise_name": "Squat", "weight_kg": 100.0, "reps": 5})
+        workouts.log_set("2024-01-08", "Squat", 120.0, 1, 9)
+        workouts.log_set("2024-01-08", "Squat", 100.0, 8, 9)
+        workouts.log_set("2024-01-08", "Bench Press", 80.0, 3, 8)
+
+        prs = records.get_personal_records("Squat")
+        self.assertEqual((prs["weight"]["weight_kg"], prs["weight"]["reps"]), (120.0, 1))
+        self.assertEqual((prs["e1rm"]["weight_kg"], prs["e1rm"]["reps"]), (100.0, 8)) # 126.7 beats 120
+        self.assertEqual(prs["reps"][["weight_kg", "reps"]].values.tolist(), [[100.0, 8], [120.0, 1]])
+        self.assertEqual(records.get_leaderboard()["exercise_name"].astype(str).tolist(), ["Squat", "Bench Press"])
+
+        self.assertEqual(records.check_records("Squat", 100.0, 9), ["e1rm", "reps"])
+        self.assertEqual(records.check_records("Squat", 90.0, 3), [])
+        self.assertEqual(analytics.check_progressive_overload("Squat", 120.0, 2), "🏆 All-time Weight PR!")
+
+        # Repeating a record set ties it, also at weights float32 can't hold exactly
+        workouts.log_set("2024-01-15", "Overhead Press", 62.3, 5, 8)
+        self.assertEqual(records.check_records("Overhead Press", 62.3, 5), [])
+        self.assertEqual(analytics.check_progressive_overload("Overhead Press", 62.3, 5), "Maintenance")
+        self.assertEqual(records.check_records("Overhead Press", 62.4, 5), ["weight", "e1rm"])
+
+        # A full rebuild agrees with the incremental updates
+        before = crud.read_csv(self.prs).set_index("key")[["weight_kg", "reps", "e1rm", "date"]]
+        self.assertEqual(records.rebuild_records(), 10)
+        after = crud.read_csv(self.prs).set_index("key")[["weight_kg", "reps", "e1rm", "date"]]
+        self.assertEqual(before.sort_index().values.tolist(), after.sort_index().values.tolist())
+
+    def test_weekly_volume_per_muscle(self):
+        self.assertTrue(analytics.calculate_weekly_volume().empty)
+        workouts.log_set("2024-01-01", "Squat", 100.0, 5, 8) # Monday of 2024-W01
+        workouts.log_set("2024-01-07", "squat", 100.0, 5, 8) # Sunday, same week; names match loosely
+        workouts.log_set("2024-01-07", "Bench Press", 50.0, 10, 8)
+        workouts.log_set("2024-01-22", "Squat", 110.0, 3, 9) # W04, after a week off
+        workouts.log_set("2024-01-22", "Sled Push", 40.0, 10, 9) # Not in the library
+
+        vol = analytics.calculate_weekly_volume(window=2)
+        legs = vol[vol["muscle"] == "Legs"]
+        self.assertEqual(legs["week"].tolist(), ["2024-W01", "2024-W02", "2024-W03", "2024-W04"])
+        self.assertEqual(legs["sets"].tolist(), [2, 0, 0, 1])
+        self.assertEqual(legs["tonnage"].tolist(), [1000.0, 0.0, 0.0, 330.0])
+        self.assertEqual(legs["tonnage_avg"].tolist(), [1000.0, 500.0, 0.0, 165.0])
+        self.assertEqual(sorted(vol["muscle"].astype(str).unique()), ["Chest", "Legs", "Other"])
+
+        # The cached result is replaced once more sets are logged
+        workouts.log_set("2024-01-23", "Bench Press", 60.0, 5, 8)
+        vol = analytics.calculate_weekly_volume(window=2)
+        self.assertEqual(vol[vol["muscle"] == "Chest"]["tonnage"].tolist(), [500.0, 0.0, 0.0, 300.0])
+
+    def test_set_numbers_and_sessions(self):
+        numbers = [
+            workouts.log_set("2024-01-08", "Squat", 100.0, 5, 8),
+            workouts.log_set("2024-01-08", "Squat", 100.0, 5, 8),
+            workouts.log_set("2024-01-08", "Bench Press", 60.0, 8, 8),
+        ]
+        self.assertEqual(numbers, [1, 2, 1])
+        self.assertEqual(crud.read_csv(self.logs)["set_number"].tolist(), [1, 2, 1])
+        session = sessions.get_session("2024-01-08")
+        self.assertEqual((session["sets"], session["reps"], session["tonnage"]), (3, 18, 1480.0))
+        self.assertEqual(session["exercises"]["Squat"]["sets"], 2)
+        self.assertIsNone(sessions.get_session("2024-01-09"))
+
+        # A fresh process picks the counters up from the sidecar file
+        with patch("src.gym.sessions._sessions", {}), patch("src.gym.sessions._loaded", False):
+            self.assertEqual(workouts.log_set("2024-01-08", "Squat", 100.0, 5, 8), 3)
+
+        # Sets written around log_set are counted from the log
+        crud.save_record(self.logs, {"date": "2024-01-08", "exercise_name": "Squat", "weight_kg": 100.0, "reps": 5})
+        self.assertEqual(workouts.log_set("2024-01-08", "Squat", 100.0, 5, 8), 5)
+        self.assertEqual(workouts.log_set("2024-01-01", "Bench Press", 60.0, 8, 8), 1) # Back-filled day
+
+    def test_exercise_names_resolve(self):
+        for typed, name in [("squat", "Squat"), ("BENCH", "Bench Press"), ("bench-press", "Bench Press"),
+                            ("ohp", "Overhead Press"), ("dead", "Deadlift"), ("sqaut", "Squat"), ("raise", "Lateral Raise")]:
+            self.assertEqual(library.resolve_exercise(typed), name, typed)
+        self.assertIsNone(library.resolve_exercise("press")) # Bench or overhead?
+        self.assertIsNone(library.resolve_exercise("zumba"))
+
+        self.assertIn("Logged Bench Press: 60.0kg x 8 (set 1)", parse_and_execute("gym bench press 60 8"))
+        self.assertIn("Logged Bench Press: 62.5kg x 6 (set 2)", parse_and_execute("gym benchpress 62.5 6 9"))
+        self.assertIn("not in your library", parse_and_execute("gym sled push 40 10"))
+        self.assertEqual(parse_and_execute("gym 100 5").split(":")[0], "Usage")
+        self.assertEqual(workouts.get_exercise_history("Bench Press")["rpe"].tolist(), [9, 8])
+
+        # The index follows the library
+        library.add_exercise("Sled Push", "Legs", "Compound")
+        self.assertEqual(library.resolve_exercise("sled"), "Sled Push")
+
+if __name__ == "__main__":
+    unittest.main()
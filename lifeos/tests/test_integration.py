@@ -39,6 +39,10 @@ class TestLifeOSIntegration(unittest.TestCase):
              patch("src.core.execution.DAILY_PLAN_FILE", TEST_DATA_DIR / "daily_plan.csv"), \
              patch("src.core.execution.DAILY_EXECUTION_FILE", TEST_DATA_DIR / "daily_execution.csv"), \
              patch("src.gym.workouts.GYM_LOGS_FILE", TEST_DATA_DIR / "gym_logs.csv"), \
+             patch("src.gym.records.GYM_LOGS_FILE", TEST_DATA_DIR / "gym_logs.csv"), \
+             patch("src.gym.records.GYM_PRS_FILE", TEST_DATA_DIR / "gym_personal_records.csv"), \
+             patch("src.gym.sessions.GYM_LOGS_FILE", TEST_DATA_DIR / "gym_logs.csv"), \
+             patch("src.gym.sessions.GYM_SESSIONS_FILE", TEST_DATA_DIR / "gym_sessions.json"), \
              patch("src.gym.library.EXERCISES_FILE", TEST_DATA_DIR / "exercises.csv"), \
              patch("src.gym.library.save_record") as mock_save, \
              patch("src.gym.library.get_all_records") as mock_get_recs:
@@ -90,5 +94,36 @@ class TestLifeOSIntegration(unittest.TestCase):
 
             print("\nIntegration Test Passed: Logic Flow Verified ✅")
 
+    def test_init_step_seeds_once(self):
+        from src.core import bootstrap
+        from src.data import crud
+        from src.finance import manager
+        cats = TEST_DATA_DIR / "finance_categories.csv"
+        exercises = TEST_DATA_DIR / "exercises.csv"
+        transactions = TEST_DATA_DIR / "finance_transactions.csv"
+        rollups = TEST_DATA_DIR / "finance_monthly_rollups.csv"
+        with patch("src.core.bootstrap.FINANCE_CATEGORIES_FILE", cats), \
+             patch("src.core.bootstrap.EXERCISES_FILE", exercises), \
+             patch("src.core.bootstrap.FINANCE_TRANSACTIONS_FILE", transactions), \
+             patch("src.core.bootstrap.FINANCE_ROLLUPS_FILE", rollups), \
+             patch("src.finance.rollups.FINANCE_TRANSACTIONS_FILE", transactions), \
+             patch("src.finance.rollups.FINANCE_ROLLUPS_FILE", rollups), \
+             patch("src.finance.manager.FINANCE_CATEGORIES_FILE", cats), \
+             patch("src.gym.library.EXERCISES_FILE", exercises), \
+             patch("src.core.bootstrap.ensure_data_dir"):
+
+            # Reads fall back to the defaults without writing anything
+            self.assertEqual(manager.get_categories(), sorted(manager.DEFAULT_CATEGORIES))
+            self.assertFalse(cats.exists())
+
+            self.assertEqual(bootstrap.init_app(), ["finance_categories.csv", "exercises.csv"])
+            self.assertEqual(len(library.get_exercises()), len(library.DEFAULT_EXERCISES))
+            self.assertEqual(bootstrap.init_app(), [])
+
+            # Transactions from before rollups existed get them built at startup
+            crud.save_record(transactions, {"date": "2024-01-05", "amount": 20.0, "type": "Expense", "category": "Food"})
+            self.assertEqual(bootstrap.init_app(), ["finance_monthly_rollups.csv"])
+            self.assertEqual(crud.read_csv(rollups)["amount"].tolist(), [20.0])
+
 if __name__ == "__main__":
     unittest.main()
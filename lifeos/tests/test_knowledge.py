@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.getcwd())
+
+from tests.helpers import knowledge_tables, start_patches, use_data_dir
+from src.data import crud
+from src.knowledge import notes, review, search
+
+TEST_DATA_DIR = Path("tests/temp_knowledge")
+
+class TestKnowledge(unittest.TestCase):
+
+    def setUp(self):
+        self.notes = TEST_DATA_DIR / "knowledge_notes.csv"
+        use_data_dir(self, TEST_DATA_DIR)
+        start_patches(self, knowledge_tables(TEST_DATA_DIR))
+
+    def test_search_ranks_with_bm25(self):
+        self.assertEqual(notes.get_notes("python"), [])
+        notes.add_note("Shopping", "Milk, eggs and bread", "errands")
+        notes.add_note("Python tips", "List comprehensions beat loops", "python, coding")
+        notes.add_note("Reading list", "A book on python and a novel", "books")
+
+        titles = lambda q: [n["title"] for n in notes.get_notes(q)]
+        self.assertEqual(titles("python"), ["Python tips", "Reading list"]) # Title and tag hits count more
+        self.assertEqual(titles("PYTH"), ["Python tips", "Reading list"]) # Unfinished last word
+        self.assertEqual(titles("milk bread"), ["Shopping"])
+        self.assertEqual(titles("zebra"), [])
+        self.assertEqual(len(notes.get_notes("python", limit=1)), 1)
+        self.assertEqual(titles("")[0], "Reading list") # Newest first without a search
+
+        # Saved beside the notes, but only once SAVE_EVERY notes are unsaved
+        index_file = TEST_DATA_DIR / "knowledge_notes.index.npz"
+        self.assertFalse(os.path.exists(index_file))
+        index = search.get_index()
+        search._save(index)
+        loaded = search._load()
+        self.assertEqual((loaded.ids, loaded.terms, loaded.postings, loaded.version),
+                         (index.ids, index.terms, index.postings, index.version))
+
+        # A fresh process picks it up and catches up on newer notes
+        crud.save_record(self.notes, {"title": "Snake facts", "content": "Pythons are not venomous", "tags": ""})
+        with patch("src.knowledge.search._index", None), patch("src.knowledge.search._save") as save:
+            self.assertEqual(titles("pythons"), ["Snake facts"])
+            self.assertEqual(len(search.get_index().ids), 4)
+            save.assert_not_called()
+        with patch("src.knowledge.search.SAVE_EVERY", 2):
+            self.assertEqual(len(search.get_index().ids), 4)
+            self.assertEqual(len(search._load().ids), 3)
+            notes.add_note("Snake care", "Heat lamps", "")
+            self.assertEqual(len(search._load().ids), 5)
+
+        # Hand edits that aren't appends rebuild it
+        df = crud.read_csv(self.notes)
+        df[df["title"] != "Python tips"].to_csv(self.notes, index=False)
+        self.assertEqual(sorted(titles("python")), ["Reading list", "Snake facts"])
+
+    def test_review_queue(self):
+        # SM-2 intervals: 1 day, 6 days, then x ease; a miss starts over
+        first = review.next_review(4)
+        self.assertEqual((first["interval_days"], first["ease_factor"]), (1, 2.5))
+        third = review.next_review(5, 2, 6, 2.5)
+        self.assertEqual((third["repetitions"], third["interval_days"], third["ease_factor"]), (3, 15, 2.6))
+        self.assertEqual(review.next_review(1, 3, 15, 1.4), {"repetitions": 0, "interval_days": 1, "ease_factor": 1.3})
+
+        self.assertEqual(review.get_due_notes(), [])
+        notes.add_note("Alpha", "a", "")
+        notes.add_note("Beta", "b", "")
+        notes.add_note("Gamma", "c", "")
+        today = date.today()
+        due = review.get_due_notes()
+        self.assertEqual([n["title"] for n in due], ["Alpha", "Beta", "Gamma"]) # New notes are due at once
+
+        ids = {n["title"]: n["id"] for n in due}
+        self.assertEqual(review.grade_note(ids["Beta"], 4)["interval_days"], 1)
+        self.assertEqual([n["title"] for n in review.get_due_notes(limit=5)], ["Alpha", "Gamma"])
+        self.assertEqual(review.count_due(), 2)
+        self.assertEqual(review.count_due(date.fromordinal(today.toordinal() + 1)), 3)
+
+        # Only the graded note's row changed, and a fresh process rebuilds the same queue
+        row = crud.get_record(self.notes, "id", ids["Beta"])
+        self.assertEqual((int(row["repetitions"]), int(row["interval_days"])), (1, 1))
+        self.assertTrue(crud.read_csv(self.notes).set_index("title").loc[["Alpha", "Gamma"], "repetitions"].isna().all())
+        with patch("src.knowledge.review._queue", None):
+            self.assertEqual(review.count_due(), 2)
+        self.assertEqual(review.grade_note(ids["Beta"], 5, date.fromordinal(today.toordinal() + 1))["interval_days"], 6)
+        self.assertRaises(ValueError, review.grade_note, ids["Alpha"], 6)
+
+if __name__ == "__main__":
+    unittest.main()